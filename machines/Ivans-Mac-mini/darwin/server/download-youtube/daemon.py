@@ -3,22 +3,31 @@
 YouTube download daemon - Web UI for queuing video downloads.
 
 Uses giffer for actual downloads, providing a web interface for adding URLs
-and monitoring download status.
+and monitoring download status. Jobs live in a SQLite queue next to the
+downloads and are processed by a pool of workers with retry and backoff.
+Dropping URLs into .urls.txt imports them into the queue.
 """
 
 import argparse
 import logging
 import os
+import sqlite3
 import subprocess
 import threading
 import time
 from datetime import datetime
 from pathlib import Path
 
-downloads = []
-downloads_lock = threading.Lock()
-processing_lock = threading.Lock()
-process_event = threading.Event()
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_RETRY_BASE = 60
+MAX_RETRY_DELAY = 3600
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+MAX_LONG_POLL = 30
+HISTORY_LIMIT = 1000
+
+import_lock = threading.Lock()
 
 HTML_TEMPLATE = """
 <!DOCTYPE html>
@@ -82,6 +91,9 @@ HTML_TEMPLATE = """
         .status-downloading { background: #2a5298; color: #88c0ff; }
         .status-completed { background: #1b5e20; color: #81c784; }
         .status-failed { background: #b71c1c; color: #ef9a9a; }
+        .error { color: #ef9a9a; font-size: 0.8rem; margin-top: 0.25rem; word-break: break-all; }
+        #load-more { margin-top: 1rem; width: 100%; background: #333; }
+        #load-more:hover { background: #444; }
         .empty-state { text-align: center; color: #666; padding: 2rem; }
         .time { color: #666; font-size: 0.85rem; margin-top: 0.25rem; }
         .queue-info {
@@ -107,6 +119,7 @@ HTML_TEMPLATE = """
             <div id="downloads-list">
                 <div class="empty-state">No downloads yet</div>
             </div>
+            <button id="load-more" onclick="loadMore()" hidden>Load more</button>
         </div>
     </div>
     <script>
@@ -123,30 +136,70 @@ HTML_TEMPLATE = """
             .then(r => r.json())
             .then(() => {
                 document.getElementById('url').value = '';
-                refreshDownloads();
             })
             .finally(() => btn.disabled = false);
         }
+        let etag = null;
+        let firstPage = [];
+        let olderPages = [];
+        let nextBefore = null;
+        function renderItem(d) {
+            let meta = d.time;
+            if (d.attempts > 0 && d.status === 'pending') {
+                meta += ' · retry ' + (d.attempts + 1) + ' at ' + d.next_attempt;
+            }
+            const error = d.error && d.status !== 'completed'
+                ? `<div class="error">${escapeHtml(d.error)}</div>` : '';
+            return `
+                <div class="download-item">
+                    <div>
+                        <div class="download-url">${escapeHtml(d.url)}</div>
+                        <div class="time">${meta}</div>
+                        ${error}
+                    </div>
+                    <span class="status status-${d.status}">${d.status}</span>
+                </div>
+            `;
+        }
+        function render() {
+            const items = firstPage.concat(olderPages);
+            const list = document.getElementById('downloads-list');
+            list.innerHTML = items.length
+                ? items.map(renderItem).join('')
+                : '<div class="empty-state">No downloads yet</div>';
+            document.getElementById('load-more').hidden = nextBefore === null;
+        }
+        function applyFirstPage(data) {
+            const c = data.counts;
+            document.getElementById('queue-info').textContent =
+                'Queue: ' + data.queue_count + ' URLs pending' +
+                ' (' + (c.downloading || 0) + ' downloading, ' +
+                (c.completed || 0) + ' completed, ' + (c.failed || 0) + ' failed)';
+            firstPage = data.history;
+            if (olderPages.length === 0) nextBefore = data.next_before;
+            render();
+        }
         function refreshDownloads() {
-            fetch('/downloads')
+            const headers = etag ? { 'If-None-Match': etag } : {};
+            return fetch('/downloads?wait=25', { headers })
+                .then(r => {
+                    if (r.status === 304) return null;
+                    etag = r.headers.get('ETag');
+                    return r.json();
+                })
+                .then(data => { if (data) applyFirstPage(data); });
+        }
+        function poll() {
+            refreshDownloads()
+                .then(poll, () => setTimeout(poll, 3000));
+        }
+        function loadMore() {
+            fetch('/downloads?before=' + nextBefore)
                 .then(r => r.json())
                 .then(data => {
-                    document.getElementById('queue-info').textContent =
-                        'Queue: ' + data.queue_count + ' URLs pending';
-                    const list = document.getElementById('downloads-list');
-                    if (data.history.length === 0) {
-                        list.innerHTML = '<div class="empty-state">No downloads yet</div>';
-                        return;
-                    }
-                    list.innerHTML = data.history.map(d => `
-                        <div class="download-item">
-                            <div>
-                                <div class="download-url">${escapeHtml(d.url)}</div>
-                                <div class="time">${d.time}</div>
-                            </div>
-                            <span class="status status-${d.status}">${d.status}</span>
-                        </div>
-                    `).join('');
+                    olderPages = olderPages.concat(data.history);
+                    nextBefore = data.next_before;
+                    render();
                 });
         }
         function escapeHtml(text) {
@@ -157,109 +210,281 @@ HTML_TEMPLATE = """
         document.getElementById('url').addEventListener('keypress', e => {
             if (e.key === 'Enter') submitDownload();
         });
-        setInterval(refreshDownloads, 3000);
-        refreshDownloads();
+        poll();
     </script>
 </body>
 </html>
 """
 
 
-def get_urls_from_file(url_file):
-    """Read URLs from file, skipping comments and empty lines."""
-    if not os.path.exists(url_file):
-        return []
-    with open(url_file, "r") as f:
-        return [
-            line.strip()
-            for line in f
-            if line.strip() and not line.strip().startswith("#")
-        ]
-
-
-def add_url_to_file(url, url_file):
-    """Append a URL to the file if not already present."""
-    urls = get_urls_from_file(url_file)
-    if url not in urls:
-        with open(url_file, "a") as f:
-            f.write(url + "\n")
+def format_time(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class JobStore:
+    """Persistent download queue.
+
+    One row per URL. Status moves pending -> downloading -> completed, or
+    back to pending with an exponential backoff until max_attempts, then
+    failed. Every change bumps `version`, which backs the /downloads ETag and
+    wakes long-polls and idle workers through `changed`.
+    """
+
+    def __init__(
+        self, path, max_attempts=DEFAULT_MAX_ATTEMPTS, retry_base=DEFAULT_RETRY_BASE
+    ):
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.changed = threading.Condition(threading.RLock())
+        self.epoch = int(time.time())
+        self.version = 0
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self.changed, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    url TEXT NOT NULL UNIQUE,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL DEFAULT 0,
+                    error TEXT NOT NULL DEFAULT '',
+                    resubmitted INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )"""
+            )
+            columns = {
+                row["name"] for row in self.conn.execute("PRAGMA table_info(jobs)")
+            }
+            if "resubmitted" not in columns:
+                self.conn.execute(
+                    "ALTER TABLE jobs ADD COLUMN resubmitted INTEGER NOT NULL DEFAULT 0"
+                )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_due ON jobs (status, next_attempt_at)"
+            )
+            # Jobs interrupted by a restart go back to the queue
+            recovered = self.conn.execute(
+                "UPDATE jobs SET status = 'pending', updated_at = ?"
+                " WHERE status = 'downloading'",
+                (time.time(),),
+            ).rowcount
+        if recovered:
+            logging.info(f"Re-queued {recovered} interrupted download(s)")
+
+    def _bump(self):
+        self.version += 1
+        self.changed.notify_all()
+
+    @property
+    def etag(self):
+        return f'W/"{self.epoch}-{self.version}"'
+
+    def add(self, url):
+        """Queue a URL. Returns False if it is already pending or downloading.
+
+        Completed and failed URLs are queued again with a fresh attempt count
+        and marked resubmitted, so the download bypasses giffer's archive.
+        """
+        now = time.time()
+        with self.changed, self.conn:
+            row = self.conn.execute(
+                "SELECT status FROM jobs WHERE url = ?", (url,)
+            ).fetchone()
+            if row and row["status"] in ("pending", "downloading"):
+                return False
+            if row:
+                # Move to the top of the history like a new submission
+                self.conn.execute("DELETE FROM jobs WHERE url = ?", (url,))
+            self.conn.execute(
+                "INSERT INTO jobs (url, resubmitted, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?)",
+                (url, int(row is not None), now, now),
+            )
+            self._bump()
         return True
-    return False
-
 
-def remove_url_from_file(url_to_remove, url_file):
-    """Remove a specific URL from the file."""
-    try:
-        with open(url_file, "r") as f:
-            lines = f.readlines()
-        with open(url_file, "w") as f:
-            for line in lines:
-                if line.strip() != url_to_remove:
-                    f.write(line)
-    except Exception as e:
-        logging.warning(f"Could not remove URL from file: {e}")
-
-
-def download_video(url: str, output_dir: str):
-    """Download a video using giffer. Returns True on success."""
+    def claim(self):
+        """Mark the oldest due pending job as downloading and return it."""
+        now = time.time()
+        with self.changed, self.conn:
+            row = self.conn.execute(
+                "SELECT * FROM jobs WHERE status = 'pending' AND next_attempt_at <= ?"
+                " ORDER BY id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute(
+                "UPDATE jobs SET status = 'downloading', updated_at = ? WHERE id = ?",
+                (now, row["id"]),
+            )
+            self._bump()
+        return dict(row)
+
+    def finish(self, job, success, error=""):
+        """Record a download result, scheduling a retry on failure."""
+        now = time.time()
+        attempts = job["attempts"] + 1
+        with self.changed, self.conn:
+            if success:
+                status, next_attempt = "completed", 0
+            elif attempts < self.max_attempts:
+                delay = min(self.retry_base * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+                status, next_attempt = "pending", now + delay
+                logging.warning(
+                    f"Retrying {job['url']} in {delay}s"
+                    f" (attempt {attempts}/{self.max_attempts})"
+                )
+            else:
+                status, next_attempt = "failed", 0
+                logging.error(f"Giving up on {job['url']} after {attempts} attempts")
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, attempts = ?, next_attempt_at = ?,"
+                " error = ?, updated_at = ? WHERE id = ?",
+                (status, attempts, next_attempt, error[-2000:], now, job["id"]),
+            )
+            self._prune()
+            self._bump()
+
+    def _prune(self):
+        """Keep only the newest HISTORY_LIMIT finished jobs."""
+        self.conn.execute(
+            "DELETE FROM jobs WHERE status IN ('completed', 'failed') AND id NOT IN"
+            " (SELECT id FROM jobs WHERE status IN ('completed', 'failed')"
+            " ORDER BY id DESC LIMIT ?)",
+            (HISTORY_LIMIT,),
+        )
+
+    def next_due_in(self):
+        """Seconds until the next pending job becomes due, or None."""
+        with self.changed:
+            row = self.conn.execute(
+                "SELECT MIN(next_attempt_at) FROM jobs WHERE status = 'pending'"
+            ).fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - time.time())
+
+    def counts(self):
+        with self.changed:
+            rows = self.conn.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall()
+        return {status: count for status, count in rows}
+
+    def page(self, limit=DEFAULT_PAGE_SIZE, before=None):
+        """Return (jobs, next_before) newest first, keyset-paginated by id."""
+        query = "SELECT * FROM jobs"
+        params = []
+        if before is not None:
+            query += " WHERE id < ?"
+            params.append(before)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit + 1)
+        with self.changed:
+            rows = self.conn.execute(query, params).fetchall()
+        next_before = rows[limit - 1]["id"] if len(rows) > limit else None
+        history = [
+            {
+                "id": row["id"],
+                "url": row["url"],
+                "status": row["status"],
+                "attempts": row["attempts"],
+                "error": row["error"],
+                "time": format_time(row["created_at"]),
+                "next_attempt": (
+                    format_time(row["next_attempt_at"])
+                    if row["next_attempt_at"]
+                    else None
+                ),
+            }
+            for row in rows[:limit]
+        ]
+        return history, next_before
+
+    def wait_for_change(self, etag, timeout):
+        """Block until the ETag changes or the timeout passes."""
+        with self.changed:
+            self.changed.wait_for(lambda: self.etag != etag, timeout=timeout)
+
+
+def import_url_file(url_file, store):
+    """Move URLs from the drop file into the queue.
+
+    The file is renamed before reading so lines appended meanwhile land in a
+    fresh file (and trigger another import) instead of being lost.
+    """
+    importing = url_file + ".importing"
+    with import_lock:
+        # A leftover .importing file means a previous import was interrupted
+        if not os.path.exists(importing):
+            try:
+                os.replace(url_file, importing)
+            except FileNotFoundError:
+                return 0
+        with open(importing, "r") as f:
+            urls = [
+                line.strip()
+                for line in f
+                if line.strip() and not line.strip().startswith("#")
+            ]
+        added = sum(1 for url in urls if store.add(url))
+        os.unlink(importing)
+    if urls:
+        logging.info(f"Imported {added}/{len(urls)} URL(s) from {url_file}")
+    return added
+
+
+def download_video(url: str, output_dir: str, resubmitted: bool = False):
+    """Download a video using giffer. Returns (success, error output)."""
     try:
         cmd = ["giffer", url, "-o", f"{output_dir}/%(title)s.%(ext)s"]
+        if resubmitted:
+            # An explicit re-submission must download even if archived
+            cmd.insert(1, "--no-archive")
         result = subprocess.run(cmd, capture_output=True, text=True)
         if result.returncode == 0:
             logging.info(f"Downloaded: {url}")
-            return True
+            return True, ""
         else:
             logging.error(f"Failed to download {url}: {result.stderr}")
-            return False
+            return False, result.stderr.strip()
     except Exception as e:
         logging.error(f"Exception downloading {url}: {e}")
-        return False
+        return False, str(e)
 
 
-def process_queue(output_dir, url_file):
-    """Background thread that processes the URL queue on file changes."""
+def download_worker(store, output_dir):
+    """Worker thread: claim due jobs and download them until the process exits."""
     while True:
         try:
-            process_event.wait(timeout=60)
-            process_event.clear()
-
-            with processing_lock:
-                urls = get_urls_from_file(url_file)
-                if not urls:
+            # Holding the (reentrant) lock from claim to wait means an add()
+            # in between can't notify before this worker is waiting
+            with store.changed:
+                job = store.claim()
+                if job is None:
+                    # Sleep until a new job arrives or a retry becomes due
+                    timeout = store.next_due_in()
+                    store.changed.wait(
+                        timeout=60 if timeout is None else min(timeout, 60)
+                    )
                     continue
 
-                url = urls[0]
-                logging.info(f"Processing: {url}")
-
-                with downloads_lock:
-                    for d in downloads:
-                        if d["url"] == url:
-                            d["status"] = "downloading"
-                            break
-
-                success = download_video(url, output_dir)
-
-                with downloads_lock:
-                    for d in downloads:
-                        if d["url"] == url:
-                            d["status"] = "completed" if success else "failed"
-                            break
-
-                if success:
-                    remove_url_from_file(url, url_file)
-                    logging.info(f"Removed from queue: {url}")
-                    if get_urls_from_file(url_file):
-                        process_event.set()
-                else:
-                    logging.warning(f"Keeping failed URL in queue: {url}")
-
+            logging.info(f"Processing: {job['url']}")
+            success, error = download_video(
+                job["url"], output_dir, bool(job["resubmitted"])
+            )
+            store.finish(job, success, error)
         except Exception as e:
             logging.error(f"Queue processing error: {e}")
             time.sleep(10)
 
 
-def start_file_watcher(url_file, output_dir):
-    """Start watching the URL file for changes using watchdog."""
+def start_file_watcher(url_file, output_dir, store):
+    """Start watching the URL drop file for changes using watchdog."""
     from watchdog.events import FileSystemEventHandler
     from watchdog.observers import Observer
 
@@ -272,14 +497,14 @@ def start_file_watcher(url_file, output_dir):
                 return
             if os.path.basename(event.src_path) == self.target_file:
                 logging.debug(f"File change detected: {event.src_path}")
-                process_event.set()
+                import_url_file(url_file, store)
 
         def on_created(self, event):
             if event.is_directory:
                 return
             if os.path.basename(event.src_path) == self.target_file:
                 logging.debug(f"File created: {event.src_path}")
-                process_event.set()
+                import_url_file(url_file, store)
 
     handler = UrlFileHandler(url_file)
     observer = Observer()
@@ -300,12 +525,31 @@ def main():
         default="/Volumes/Storage/Data/Media/Youtube",
         help="Output directory for downloads",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Concurrent downloads (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=DEFAULT_MAX_ATTEMPTS,
+        help=f"Attempts per URL before marking it failed (default: {DEFAULT_MAX_ATTEMPTS})",
+    )
+    parser.add_argument(
+        "--retry-base",
+        type=int,
+        default=DEFAULT_RETRY_BASE,
+        help=f"First retry delay in seconds, doubled per attempt (default: {DEFAULT_RETRY_BASE})",
+    )
     parser.add_argument("--debug", action="store_true", help="Enable debug mode")
     args = parser.parse_args()
 
     app = Flask(__name__)
     output_dir = args.output_dir
     url_file = os.path.join(output_dir, ".urls.txt")
+    queue_db = os.path.join(output_dir, ".download-queue.sqlite3")
 
     Path(output_dir).mkdir(parents=True, exist_ok=True)
 
@@ -314,15 +558,14 @@ def main():
         format="%(asctime)s - %(levelname)s - %(message)s",
     )
 
-    observer = start_file_watcher(url_file, output_dir)
-
-    processor = threading.Thread(
-        target=process_queue, args=(output_dir, url_file), daemon=True
-    )
-    processor.start()
+    store = JobStore(queue_db, args.max_attempts, args.retry_base)
+    import_url_file(url_file, store)
+    observer = start_file_watcher(url_file, output_dir, store)
 
-    if get_urls_from_file(url_file):
-        process_event.set()
+    for _ in range(max(1, args.workers)):
+        threading.Thread(
+            target=download_worker, args=(store, output_dir), daemon=True
+        ).start()
 
     @app.route("/")
     def index():
@@ -336,27 +579,39 @@ def main():
         if not url:
             return jsonify({"error": "URL required"}), 400
 
-        added = add_url_to_file(url, url_file)
-
-        if added:
-            download_entry = {
-                "url": url,
-                "status": "pending",
-                "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            }
-            with downloads_lock:
-                downloads.insert(0, download_entry)
-                if len(downloads) > 50:
-                    downloads.pop()
-            process_event.set()
-
+        added = store.add(url)
         return jsonify({"status": "queued" if added else "already_queued"})
 
     @app.route("/downloads")
     def list_downloads():
-        queue_count = len(get_urls_from_file(url_file))
-        with downloads_lock:
-            return jsonify({"queue_count": queue_count, "history": downloads})
+        limit = min(
+            request.args.get("limit", DEFAULT_PAGE_SIZE, type=int), MAX_PAGE_SIZE
+        )
+        before = request.args.get("before", type=int)
+        wait = min(request.args.get("wait", 0, type=float), MAX_LONG_POLL)
+
+        # Only the first page is long-polled; older pages are fetched on demand
+        if before is None:
+            client_etag = request.headers.get("If-None-Match")
+            if client_etag == store.etag and wait > 0:
+                store.wait_for_change(client_etag, wait)
+            if client_etag == store.etag:
+                return "", 304, {"ETag": store.etag}
+
+        etag = store.etag
+        history, next_before = store.page(max(1, limit), before)
+        counts = store.counts()
+        response = jsonify(
+            {
+                "queue_count": counts.get("pending", 0) + counts.get("downloading", 0),
+                "counts": counts,
+                "history": history,
+                "next_before": next_before,
+            }
+        )
+        if before is None:
+            response.headers["ETag"] = etag
+        return response
 
     @app.route("/health")
     def health():
@@ -364,7 +619,9 @@ def main():
 
     logging.info(f"Starting YouTube Downloader on {args.host}:{args.port}")
     logging.info(f"Output directory: {output_dir}")
-    logging.info(f"URL queue file: {url_file}")
+    logging.info(f"Queue database: {queue_db}")
+    logging.info(f"URL import file: {url_file}")
+    logging.info(f"Workers: {args.workers}")
 
     try:
         app.run(host=args.host, port=args.port, debug=args.debug, threaded=True)
@@ -32,14 +32,61 @@ Do not add file logging or redirect stderr. bsdtar on macOS writes both the -v
 file listing and error messages (e.g. "Operation not permitted") to stderr.
 Redirecting it to a log file hides errors from the caller and breaks failure
 detection. Keep stderr going to the terminal for real-time visibility.
+
+---
+
+Incremental mode (--incremental) keeps a manifest of the last backup in
+$XDG_STATE_HOME/backup-home and archives only what changed since then:
+<user>.<chain>.L<level>.tar.gz plus a <archive>.deleted list. Level 0 is a
+full backup that starts a new chain; `backup-home restore` replays a chain.
+
+Streaming mode (--stream) skips the staging archive: the pigz output is cut
+into <archive>.NNNN volumes that are uploaded while tar is still running,
+with an <archive>.sha256 list (sha256sum format) uploaded last. Restore with
+`cat <archive>.* | tar -xz`, or `backup-home restore` for incremental chains.
+Streamed and incremental runs upload into their own <date>/<HHMMSS> directory,
+since miniserve renames rather than replaces files that already exist: a
+retried run never mixes with the partial files of the one that failed.
+
+Dedup mode (--dedup) splits the uncompressed tar stream into content-defined
+chunks and sends only chunks the store doesn't have yet (tracked in a local
+index), plus a per-run <date>/<user>.<HHMMSS>.chunks.json manifest. The store
+is the host's /Backup/Machines/<host>/<parent> on miniserve, or --dedup-store
+DIR. `backup-home verify` re-hashes the chunks of a day's newest manifest; the
+next run re-sends a corrupt chunk as a new copy, <sha256>.1, .2 and so on, since
+the store is append-only, and restore reads the first copy whose hash matches.
+
+Compression (--compress) is pigz by default; zstd -T0 and none are also
+available, and the archive extension follows (.tar.gz, .tar.zst, .tar). auto
+compresses a sample of the tar stream with each candidate and keeps the
+strongest one that still outruns the upload. Every run ends with per-stage
+throughput (tar, compressor, upload).
 """
 
 import argparse
+import fnmatch
+import functools
+import glob
+import hashlib
+import json
 import os
 import platform
+import queue
+import re
+import shutil
 import socket
+import sqlite3
+import stat
 import subprocess
 import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
@@ -154,6 +201,320 @@ DEFAULT_EXCLUDE_CATEGORIES = [
     "os_system",
 ]
 
+STATE_DIR = (
+    Path(os.environ.get("XDG_STATE_HOME", os.path.expanduser("~/.local/state")))
+    / "backup-home"
+)
+DEFAULT_MAX_LEVEL = 6
+# Matches incremental archives and their streamed volumes (.tar.gz.NNNN)
+ARCHIVE_NAME_RE = re.compile(
+    r"^(?P<user>.+)\.(?P<chain>\d{8}T\d{6})\.L(?P<level>\d+)"
+    r"(?P<ext>\.tar(?:\.gz|\.zst)?)(?:\.\d{4})?$"
+)
+DEFAULT_VOLUME_SIZE_MB = 1024
+STREAM_CHUNK = 1024 * 1024
+
+COMPRESSORS = ["pigz", "zstd", "none", "auto"]
+COMPRESSOR_EXTENSIONS = {"pigz": ".tar.gz", "zstd": ".tar.zst", "none": ".tar"}
+# tar flags to read each extension from a pipe (GNU tar only sniffs files)
+EXTENSION_TAR_FLAGS = {".tar.gz": ["-z"], ".tar.zst": ["--zstd"], ".tar": []}
+AUTO_LEVELS = {"zstd": [1, 3, 6, 9, 15], "pigz": [1, 6, 9]}
+DEFAULT_AUTO_SAMPLE_MB = 32
+DEFAULT_UPLOAD_MBPS = 100.0
+
+CDC_MIN_SIZE = 256 * 1024
+CDC_MAX_SIZE = 4 * 1024 * 1024
+CDC_RUN = 19  # ~1 MiB past the minimum on average
+CDC_SCAN_STEP = 256 * 1024
+DEDUP_UPLOAD_JOBS = 4
+
+
+def exclude_patterns(
+    no_excludes: bool = False, exclude_categories: list[str] | None = None
+) -> list[str]:
+    """Resolve the tar --exclude patterns for the selected categories."""
+    if no_excludes:
+        return []
+    categories = (
+        exclude_categories if exclude_categories else DEFAULT_EXCLUDE_CATEGORIES
+    )
+    return [pattern for cat in categories for pattern in EXCLUDE_PATTERNS[cat]]
+
+
+@dataclass
+class Compressor:
+    """Compression stage between tar and the archive (see COMPRESSORS)."""
+
+    name: str
+    level: int | None = None
+
+    @property
+    def extension(self) -> str:
+        return COMPRESSOR_EXTENSIONS[self.name]
+
+    def command(self) -> list[str]:
+        level = [f"-{self.level}"] if self.level else []
+        if self.name == "pigz":
+            return ["pigz", *level]
+        if self.name == "zstd":
+            return ["zstd", "-T0", "-q", "-c", *level]
+        return ["cat"]
+
+    def __str__(self) -> str:
+        return f"{self.name} -{self.level}" if self.level else self.name
+
+
+@dataclass
+class PipelineStats:
+    """Per-stage throughput of one backup run.
+
+    The relay between tar and the compressor records how long it waited on
+    each side, so tar and compressor rates are bytes over the time that stage
+    kept the other waiting. Upload is bytes over time spent in curl.
+    """
+
+    raw_bytes: int = 0
+    tar_wait: float = 0.0
+    compress_wait: float = 0.0
+    compressed_bytes: int = 0
+    upload_bytes: int = 0
+    upload_seconds: float = 0.0
+
+
+def throughput_path() -> Path:
+    return STATE_DIR / "throughput.json"
+
+
+def last_upload_mbps() -> float | None:
+    try:
+        return json.loads(throughput_path().read_text())["upload_mbps"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def report_throughput(stats: PipelineStats, compressor: Compressor) -> None:
+    """Print per-stage throughput and remember the upload rate for --compress auto."""
+
+    def rate(size: int, seconds: float) -> str:
+        return f"{size / seconds / 1e6:.1f} MB/s" if seconds > 0 else "n/a"
+
+    ratio = stats.raw_bytes / stats.compressed_bytes if stats.compressed_bytes else 0
+    print("Throughput:")
+    print(
+        f"  tar read:   {stats.raw_bytes / 1e6:.1f} MB at "
+        f"{rate(stats.raw_bytes, stats.tar_wait)}"
+    )
+    label = f"{compressor}:"
+    print(
+        f"  {label:<11} {stats.compressed_bytes / 1e6:.1f} MB "
+        f"({ratio:.2f}x) at {rate(stats.raw_bytes, stats.compress_wait)}"
+    )
+    if stats.upload_seconds > 0:
+        print(
+            f"  upload:     {stats.upload_bytes / 1e6:.1f} MB at "
+            f"{rate(stats.upload_bytes, stats.upload_seconds)}"
+        )
+        STATE_DIR.mkdir(parents=True, exist_ok=True)
+        throughput_path().write_text(
+            json.dumps({"upload_mbps": stats.upload_bytes / stats.upload_seconds / 1e6})
+        )
+
+
+def sample_tar(cmd: list[str], size: int) -> bytes:
+    """The first size bytes of the tar stream (tar is stopped afterwards)."""
+    proc = subprocess.Popen(
+        cmd,
+        cwd=Path.home().parent,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    sample = proc.stdout.read(size)
+    proc.kill()
+    proc.stdout.close()
+    proc.wait()
+    return sample
+
+
+def auto_compressor(
+    cmd: list[str], sample_size: int, upload_mbps: float, level: int | None = None
+) -> Compressor:
+    """Pick the strongest compressor that still keeps up with the upload.
+
+    Each candidate compresses the same sample of the tar stream and is scored
+    by the input rate the pipeline could sustain with it:
+    min(compressor MB/s, upload MB/s x ratio). Ties go to the better ratio.
+    With level, only that level of each tool is tried (a tool that rejects
+    it drops out).
+    """
+    sample = sample_tar(cmd, sample_size)
+    if not sample:
+        return Compressor("pigz")
+    candidates = [Compressor("none")] + [
+        Compressor(name, candidate_level)
+        for name, levels in AUTO_LEVELS.items()
+        if shutil.which(name)
+        for candidate_level in ([level] if level else levels)
+    ]
+    print(
+        f"Auto compression: {len(sample) / 1e6:.1f} MB sample, "
+        f"upload {upload_mbps:.1f} MB/s"
+    )
+    best, best_score = candidates[0], (0.0, 0.0)
+    for candidate in candidates:
+        start = time.monotonic()
+        result = subprocess.run(
+            candidate.command(), input=sample, capture_output=True, check=False
+        )
+        elapsed = max(time.monotonic() - start, 1e-6)
+        if result.returncode != 0 or not result.stdout:
+            continue
+        mbps = len(sample) / elapsed / 1e6
+        ratio = len(sample) / len(result.stdout)
+        score = (min(mbps, upload_mbps * ratio), ratio)
+        print(
+            f"  {str(candidate):<8} {mbps:8.1f} MB/s {ratio:6.2f}x "
+            f"-> {score[0]:.1f} MB/s"
+        )
+        if score > best_score:
+            best, best_score = candidate, score
+    print(f"Using {best}")
+    return best
+
+
+def relay_stream(src, dst, stats: PipelineStats) -> None:
+    """Copy tar output into the compressor, timing how long each side blocks."""
+    try:
+        while True:
+            start = time.monotonic()
+            chunk = src.read(STREAM_CHUNK)
+            read_done = time.monotonic()
+            stats.tar_wait += read_done - start
+            if not chunk:
+                break
+            dst.write(chunk)
+            stats.compress_wait += time.monotonic() - read_done
+            stats.raw_bytes += len(chunk)
+    except (BrokenPipeError, ValueError):
+        # Compressor exited (or was killed); its exit code reports the failure
+        pass
+    finally:
+        # Lets tar receive SIGPIPE if the compressor is gone
+        src.close()
+        try:
+            dst.close()
+        except BrokenPipeError:
+            pass
+
+
+class VolumeWriter:
+    """Cut a compressed stream into fixed-size volumes as it is produced.
+
+    Each finished volume is passed to upload on a background thread, at most
+    max_pending volumes behind the writer, so compression and transfer overlap.
+    With delete_uploaded, volumes are removed once sent and local disk use
+    stays at a few volumes. Memory use is one read chunk.
+    """
+
+    def __init__(
+        self,
+        archive_path: Path,
+        volume_size: int,
+        upload=None,
+        delete_uploaded: bool = False,
+        max_pending: int = 2,
+    ):
+        self.archive_path = archive_path
+        self.volume_size = volume_size
+        self.upload = upload
+        self.delete_uploaded = delete_uploaded
+        self.volumes: list[tuple[Path, str]] = []
+        self.bytes_written = 0
+        self.upload_bytes = 0
+        self.upload_seconds = 0.0
+        self.upload_failed = False
+        self.stop = threading.Event()
+        self.pending: queue.Queue[Path | None] = queue.Queue(maxsize=max_pending)
+        self.thread = None
+        if upload:
+            self.thread = threading.Thread(target=self._upload_loop, daemon=True)
+            self.thread.start()
+
+    @property
+    def checksum_path(self) -> Path:
+        return self.archive_path.with_name(self.archive_path.name + ".sha256")
+
+    def describe(self) -> str:
+        return f"{self.archive_path}.0001-{len(self.volumes):04d} ({len(self.volumes)} volumes)"
+
+    def _upload_loop(self):
+        # Keeps draining after a failure so the producer never blocks on put();
+        # an exception must not end the thread for the same reason
+        while (path := self.pending.get()) is not None:
+            if self.stop.is_set():
+                continue
+            try:
+                size = path.stat().st_size
+                start = time.monotonic()
+                ok = self.upload(path)
+                self.upload_seconds += time.monotonic() - start
+                if ok:
+                    self.upload_bytes += size
+                    if self.delete_uploaded:
+                        path.unlink()
+            except Exception as e:
+                print(f"Error uploading {path}: {e}", file=sys.stderr)
+                ok = False
+            if not ok:
+                print(f"Upload failed for {path}", file=sys.stderr)
+                self.upload_failed = True
+                self.stop.set()
+
+    def _submit(self, path: Path):
+        if self.thread:
+            self.pending.put(path)
+
+    def consume(self, stream) -> bool:
+        """Read stream to EOF into volumes; False as soon as an upload fails."""
+        while not self.stop.is_set():
+            n = len(self.volumes) + 1
+            path = self.archive_path.with_name(f"{self.archive_path.name}.{n:04d}")
+            digest = hashlib.sha256()
+            written = 0
+            with open(path, "wb") as f:
+                while written < self.volume_size:
+                    chunk = stream.read(min(STREAM_CHUNK, self.volume_size - written))
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    digest.update(chunk)
+                    written += len(chunk)
+            self.bytes_written += written
+            if written == 0 and self.volumes:
+                path.unlink()
+                return True
+            self.volumes.append((path, digest.hexdigest()))
+            self._submit(path)
+            if written < self.volume_size:
+                return not self.stop.is_set()
+        return False
+
+    def finish(self, ok: bool = True) -> bool:
+        """Write and queue the checksum list, then wait for pending uploads.
+
+        With ok=False (tar or compression failed) remaining uploads are dropped.
+        """
+        if ok:
+            self.checksum_path.write_text(
+                "".join(f"{digest}  {path.name}\n" for path, digest in self.volumes)
+            )
+            self._submit(self.checksum_path)
+        else:
+            self.stop.set()
+        if self.thread:
+            self.pending.put(None)
+            self.thread.join()
+        return ok and not self.upload_failed
+
 
 def create_backup(
     archive_path: Path,
@@ -161,84 +522,501 @@ def create_backup(
     ignore_tar_warnings: bool = False,
     no_excludes: bool = False,
     exclude_categories: list[str] | None = None,
+    file_list: Path | None = None,
+    volumes: VolumeWriter | None = None,
+    compressor: Compressor | None = None,
+    stats: PipelineStats | None = None,
 ) -> bool:
-    """Create tar.gz backup of home directory."""
-    home_parent = Path.home().parent
+    """Create compressed tar backup of home directory (pigz unless compressor).
 
-    # Build tar command with exclusions
-    cmd = ["tar"]
-    if not no_excludes:
-        categories = (
-            exclude_categories if exclude_categories else DEFAULT_EXCLUDE_CATEGORIES
-        )
-        for cat in categories:
-            for pattern in EXCLUDE_PATTERNS[cat]:
-                cmd.extend(["--exclude", pattern])
-    cmd.extend(["--no-xattrs", "-cv", user])
+    With file_list, archive exactly the NUL-separated paths it contains
+    (relative to the home parent) instead of walking the home directory.
+    With volumes, the compressed stream goes to the VolumeWriter instead of
+    archive_path.
+    """
+    home_parent = Path.home().parent
+    cmd = tar_command(user, no_excludes, exclude_categories, file_list)
+    compressor = compressor or Compressor("pigz")
+    stats = stats if stats is not None else PipelineStats()
 
     try:
-        # Run tar and pipe to pigz (stderr=None lets tar -v output show on terminal)
-        with open(archive_path, "wb") as archive_file:
+        # Run tar and pipe to the compressor through a counting relay
+        # (stderr=None lets tar -v output show on terminal)
+        with nullcontext() if volumes else open(archive_path, "wb") as archive_file:
             tar_proc = subprocess.Popen(
                 cmd, cwd=home_parent, stdout=subprocess.PIPE, stderr=None
             )
-            pigz_proc = subprocess.Popen(
-                ["pigz"],
-                stdin=tar_proc.stdout,
-                stdout=archive_file,
+            compress_proc = subprocess.Popen(
+                compressor.command(),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE if volumes else archive_file,
                 stderr=None,
             )
+            relay = threading.Thread(
+                target=relay_stream,
+                args=(tar_proc.stdout, compress_proc.stdin, stats),
+                daemon=True,
+            )
+            relay.start()
 
-            # Allow tar to receive SIGPIPE if pigz exits
-            if tar_proc.stdout:
-                tar_proc.stdout.close()
+            if volumes:
+                uploading = volumes.consume(compress_proc.stdout)
+                if not uploading:
+                    compress_proc.kill()
+                    tar_proc.kill()
+                compress_proc.stdout.close()
 
-            pigz_proc.wait()
+            compress_proc.wait()
+            relay.join()
             tar_proc.wait()
 
-        if pigz_proc.returncode != 0:
-            print("Backup compression failed", file=sys.stderr)
+        if volumes and not uploading:
+            print("Backup upload failed, stopped compression", file=sys.stderr)
             return False
 
-        # bsdtar exit 1 = non-fatal warnings (permission denied, file changed)
-        # GNU tar exit 2 = permission denied on some files
-        if tar_proc.returncode != 0:
-            if ignore_tar_warnings and tar_proc.returncode in (1, 2):
-                print(
-                    "Warning: tar completed with non-fatal errors (some files skipped)",
-                    file=sys.stderr,
-                )
-            else:
-                print("Backup creation failed", file=sys.stderr)
-                return False
+        stats.compressed_bytes = (
+            volumes.bytes_written if volumes else archive_path.stat().st_size
+        )
+        if compress_proc.returncode != 0:
+            print("Backup compression failed", file=sys.stderr)
+            return False
 
-        return True
+        return tar_exit_ok(tar_proc.returncode, ignore_tar_warnings)
     except Exception as e:
         print(f"Error creating backup: {e}", file=sys.stderr)
         return False
 
 
-def upload_miniserve(
-    archive_path: Path,
-    url: str,
-    hostname: str,
-    home_parent_dir: str,
+def tar_command(
     user: str,
-    password: str,
-) -> bool:
-    """Upload backup using curl to miniserve."""
+    no_excludes: bool = False,
+    exclude_categories: list[str] | None = None,
+    file_list: Path | None = None,
+) -> list[str]:
+    """tar command writing an uncompressed archive to stdout (run in home parent)."""
+    cmd = ["tar"]
+    if file_list:
+        cmd.extend(
+            ["--no-xattrs", "--no-recursion", "--null", "-cv", "-T", str(file_list)]
+        )
+    else:
+        for pattern in exclude_patterns(no_excludes, exclude_categories):
+            cmd.extend(["--exclude", pattern])
+        cmd.extend(["--no-xattrs", "-cv", user])
+    return cmd
+
+
+def tar_exit_ok(returncode: int, ignore_tar_warnings: bool) -> bool:
+    # bsdtar exit 1 = non-fatal warnings (permission denied, file changed)
+    # GNU tar exit 2 = permission denied on some files
+    if returncode != 0:
+        if ignore_tar_warnings and returncode in (1, 2):
+            print(
+                "Warning: tar completed with non-fatal errors (some files skipped)",
+                file=sys.stderr,
+            )
+        else:
+            print("Backup creation failed", file=sys.stderr)
+            return False
+    return True
+
+
+def file_digest(path: str) -> str | None:
+    """sha256 of a file's contents, or None if it can't be read."""
+    h = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(1024 * 1024):
+                h.update(chunk)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+def scan_home(home_parent: Path, user: str, patterns: list[str]):
+    """Yield (relative path, kind, lstat) for every entry tar would archive.
+
+    kind is "d", "f" or "l". Paths are relative to home_parent, matching tar
+    member names. Excludes follow tar: a matching path is skipped, and a
+    directory whose contents all match is kept as an empty entry.
+    """
+    exclude = (
+        re.compile("|".join(fnmatch.translate(p) for p in patterns))
+        if patterns
+        else None
+    )
+    root = home_parent / user
+    try:
+        yield user, "d", os.lstat(root)
+    except OSError:
+        return
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        descend = []
+        for name in dirnames + sorted(filenames):
+            full = os.path.join(dirpath, name)
+            rel = os.path.relpath(full, home_parent)
+            if exclude and exclude.match(rel):
+                continue
+            try:
+                st = os.lstat(full)
+            except OSError:
+                continue
+            if stat.S_ISDIR(st.st_mode):
+                yield rel, "d", st
+                if not (exclude and exclude.match(rel + "/")):
+                    descend.append(name)
+            elif stat.S_ISREG(st.st_mode):
+                yield rel, "f", st
+            elif stat.S_ISLNK(st.st_mode):
+                yield rel, "l", st
+        dirnames[:] = descend
+
+
+@dataclass
+class IncrementalPlan:
+    """What the next incremental backup archives and deletes."""
+
+    chain: str
+    level: int
+    file_list: Path
+    deleted: list[str]
+    changed: int
+    manifest: Path
+
+
+def manifest_path() -> Path:
+    return STATE_DIR / "manifest.sqlite3"
+
+
+def _open_manifest(path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE IF NOT EXISTS files (
+            path TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            inode INTEGER NOT NULL,
+            hash TEXT
+        );
+        """
+    )
+    return conn
+
+
+def read_manifest_meta(path: Path) -> dict[str, str]:
+    if not path.exists():
+        return {}
+    conn = sqlite3.connect(path)
+    try:
+        return dict(conn.execute("SELECT key, value FROM meta"))
+    except sqlite3.DatabaseError:
+        return {}
+    finally:
+        conn.close()
+
+
+def plan_incremental(
+    user: str,
+    patterns: list[str],
+    work_dir: Path,
+    force_full: bool = False,
+    max_level: int = DEFAULT_MAX_LEVEL,
+) -> IncrementalPlan:
+    """Scan home against the last manifest and write the next level's file list.
+
+    An entry is unchanged when kind, size, mtime and inode match the manifest.
+    Files whose stat changed are hashed, and skipped if the content hash still
+    matches. Level 0 stores no hashes, so the first run reads nothing twice.
+    The new manifest is written beside the old one and only replaces it in
+    commit_incremental, once the archive has been stored.
+    """
+    home_parent = Path.home().parent
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
+    prev_path = manifest_path()
+    meta = read_manifest_meta(prev_path)
+    excludes_key = json.dumps(patterns)
+
+    full = (
+        force_full
+        or not meta
+        or meta.get("excludes") != excludes_key
+        or int(meta.get("level", 0)) >= max_level
+    )
+    if full:
+        chain = datetime.now().strftime("%Y%m%dT%H%M%S")
+        level = 0
+    else:
+        chain = meta["chain"]
+        level = int(meta["level"]) + 1
+
+    new_path = prev_path.with_name(prev_path.name + ".new")
+    new_path.unlink(missing_ok=True)
+    conn = _open_manifest(new_path)
+    if not full:
+        conn.execute("ATTACH DATABASE ? AS prev", (str(prev_path),))
+
+    file_list = work_dir / f".{user}.{chain}.L{level}.files"
+    changed = 0
+    rows = []
+    with open(file_list, "wb") as out:
+        for rel, kind, st in scan_home(home_parent, user, patterns):
+            full_path = os.path.join(home_parent, rel)
+            digest = None
+            if kind == "l":
+                digest = hashlib.sha256(os.fsencode(os.readlink(full_path))).hexdigest()
+
+            include = full
+            if not full:
+                old = conn.execute(
+                    "SELECT kind, size, mtime_ns, inode, hash FROM prev.files WHERE path = ?",
+                    (rel,),
+                ).fetchone()
+                if old is None or old[0] != kind:
+                    include = True
+                    if kind == "f":
+                        digest = file_digest(full_path)
+                elif kind == "d":
+                    pass
+                elif old[1:4] == (st.st_size, st.st_mtime_ns, st.st_ino):
+                    digest = old[4]
+                else:
+                    if kind == "f":
+                        digest = file_digest(full_path)
+                    include = digest is None or digest != old[4]
+
+            if include:
+                out.write(os.fsencode(rel) + b"\0")
+                changed += 1
+            rows.append((rel, kind, st.st_size, st.st_mtime_ns, st.st_ino, digest))
+            if len(rows) >= 10000:
+                conn.executemany("INSERT INTO files VALUES (?, ?, ?, ?, ?, ?)", rows)
+                rows.clear()
+    conn.executemany("INSERT INTO files VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    deleted = []
+    if not full:
+        # Gone, or replaced by a different kind (e.g. a directory became a file).
+        # Children sort after their parent, so reverse order removes them first.
+        deleted = [
+            path
+            for (path,) in conn.execute(
+                "SELECT p.path FROM prev.files p LEFT JOIN main.files m ON m.path = p.path "
+                "WHERE m.path IS NULL OR m.kind != p.kind ORDER BY p.path DESC"
+            )
+        ]
+    conn.executemany(
+        "INSERT INTO meta VALUES (?, ?)",
+        [("chain", chain), ("level", str(level)), ("excludes", excludes_key)],
+    )
+    conn.commit()
+    conn.close()
+
+    return IncrementalPlan(
+        chain=chain,
+        level=level,
+        file_list=file_list,
+        deleted=deleted,
+        changed=changed,
+        manifest=new_path,
+    )
+
+
+def write_deleted_list(path: Path, deleted: list[str]) -> None:
+    with open(path, "wb") as f:
+        for rel in deleted:
+            f.write(os.fsencode(rel) + b"\0")
+
+
+def commit_incremental(plan: IncrementalPlan) -> None:
+    """Make the plan's manifest the baseline for the next level."""
+    os.replace(plan.manifest, manifest_path())
+    plan.file_list.unlink(missing_ok=True)
+
+
+def discard_incremental(plan: IncrementalPlan) -> None:
+    plan.manifest.unlink(missing_ok=True)
+    plan.file_list.unlink(missing_ok=True)
+
+
+def _archive_rank(base: Path) -> tuple[bool, float]:
+    """Sort key preferring complete copies of a level, then the newest.
+
+    The .deleted list is uploaded after the archive (and a streamed archive's
+    .sha256 after its volumes), so a copy without it is a partial upload.
+    """
+    sidecar = Path(str(base) + ".deleted")
+    checksums = Path(str(base) + ".sha256")
+    complete = sidecar.exists() and (base.exists() or checksums.exists())
+    files = [p for p in (base, sidecar, checksums) if p.exists()]
+    files += base.parent.glob(glob.escape(base.name) + ".[0-9][0-9][0-9][0-9]")
+    return complete, max((p.stat().st_mtime for p in files), default=0.0)
+
+
+def find_chain(
+    source: Path, chain: str | None = None, max_level: int | None = None
+) -> list[Path]:
+    """Locate the archives of one chain under source, ordered by level.
+
+    A level stored more than once (a retried run) resolves to its complete
+    copy, or the newest one if several are complete.
+    """
+    found: dict[str, dict[int, set[Path]]] = {}
+    for archive in source.rglob("*.tar*"):
+        m = ARCHIVE_NAME_RE.match(archive.name)
+        if m:
+            # Streamed volumes map to the archive they were cut from
+            base = archive.with_name(archive.name[: m.end("ext")])
+            found.setdefault(m["chain"], {}).setdefault(int(m["level"]), set()).add(
+                base
+            )
+    chains = {
+        name: {
+            level: max(copies, key=_archive_rank) for level, copies in levels.items()
+        }
+        for name, levels in found.items()
+    }
+    if not chains:
+        raise ValueError(f"no incremental archives found under {source}")
+    chain = chain or max(chains)
+    if chain not in chains:
+        raise ValueError(f"chain {chain} not found (have: {', '.join(sorted(chains))})")
+
+    levels = chains[chain]
+    last = max(levels) if max_level is None else max_level
+    missing = [n for n in range(last + 1) if n not in levels]
+    if missing:
+        raise ValueError(
+            f"chain {chain} is missing level(s) {', '.join(map(str, missing))}"
+        )
+    return [levels[n] for n in range(last + 1)]
+
+
+def apply_deletions(deleted_list: Path, target: Path) -> int:
+    """Remove the paths listed in a .deleted file from a restore target."""
+    if not deleted_list.exists():
+        return 0
+    removed = 0
+    for rel in deleted_list.read_bytes().split(b"\0"):
+        if not rel:
+            continue
+        path = target / os.fsdecode(rel)
+        try:
+            if path.is_dir() and not path.is_symlink():
+                path.rmdir()
+            else:
+                path.unlink()
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def extract_archive(archive: Path, target: Path) -> bool:
+    """Extract an archive, or its streamed volumes in order, into target.
+
+    Volumes are checked against <archive>.sha256 while they are piped to tar.
+    """
+    ext = next(e for e in (".tar.gz", ".tar.zst", ".tar") if archive.name.endswith(e))
+    flags = EXTENSION_TAR_FLAGS[ext]
+    if archive.exists():
+        result = subprocess.run(
+            ["tar", "-x", *flags, "-f", str(archive), "-C", str(target)], check=False
+        )
+        return result.returncode == 0
+
+    volumes = sorted(
+        archive.parent.glob(glob.escape(archive.name) + ".[0-9][0-9][0-9][0-9]")
+    )
+    expected = {}
+    checksum_path = archive.with_name(archive.name + ".sha256")
+    if checksum_path.exists():
+        for line in checksum_path.read_text().splitlines():
+            digest, _, name = line.partition("  ")
+            expected[name] = digest
+        # Ignore leftovers from an earlier, interrupted upload of the same level
+        volumes = [v for v in volumes if v.name in expected]
+    missing = sorted(set(expected) - {v.name for v in volumes})
+    if not volumes or missing:
+        print(
+            f"Missing volumes for {archive.name}: {', '.join(missing) or 'all'}",
+            file=sys.stderr,
+        )
+        return False
+
+    bad = []
+    tar_proc = subprocess.Popen(
+        ["tar", "-x", *flags, "-f", "-", "-C", str(target)], stdin=subprocess.PIPE
+    )
+    try:
+        for volume in volumes:
+            digest = hashlib.sha256()
+            with open(volume, "rb") as f:
+                while chunk := f.read(STREAM_CHUNK):
+                    digest.update(chunk)
+                    tar_proc.stdin.write(chunk)
+            if expected.get(volume.name, digest.hexdigest()) != digest.hexdigest():
+                bad.append(volume.name)
+    except BrokenPipeError:
+        pass
+    finally:
+        tar_proc.stdin.close()
+    tar_proc.wait()
+    if bad:
+        print(f"Checksum mismatch: {', '.join(bad)}", file=sys.stderr)
+    return tar_proc.returncode == 0 and not bad
+
+
+def restore_chain(archives: list[Path], target: Path) -> bool:
+    """Replay level 0..N into target: deletions first, then the level's files."""
+    target.mkdir(parents=True, exist_ok=True)
+    for archive in archives:
+        removed = apply_deletions(Path(str(archive) + ".deleted"), target)
+        print(f"Restoring {archive.name} ({removed} deletions)")
+        if not extract_archive(archive, target):
+            print(f"Extracting {archive} failed", file=sys.stderr)
+            return False
+    return True
+
+
+def miniserve_auth() -> str:
+    """curl -u credentials from the sops secrets; exits if they are missing."""
+    miniserve_user = _read_secret("MINISERVE_USER")
+    miniserve_pass = _read_secret("MINISERVE_PASS")
+    if not miniserve_user or not miniserve_pass:
+        print(
+            "Error: miniserve secrets not found in ~/.config/sops-nix/secrets/",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    return f"{miniserve_user}:{miniserve_pass}"
+
+
+def prepare_upload_dir(
+    url: str, hostname: str, home_parent_dir: str, auth: str, run: str | None = None
+) -> str:
+    """Create today's backup directory (and run's under it) on miniserve.
+
+    Returns the directory to upload into.
+    """
     date_dir = datetime.now().strftime("%Y-%m-%d")
     upload_path = f"/Backup/Machines/{hostname}/{home_parent_dir}/{date_dir}"
+    mkdirs = [
+        ("/Backup/Machines", hostname),
+        (f"/Backup/Machines/{hostname}", home_parent_dir),
+        (f"/Backup/Machines/{hostname}/{home_parent_dir}", date_dir),
+    ]
+    if run:
+        mkdirs.append((upload_path, run))
+        upload_path = f"{upload_path}/{run}"
 
     print(f"Creating directory: {upload_path}")
 
     # Create directories
-    auth = f"{user}:{password}"
-    for mkdir_path, mkdir_name in [
-        ("/Backup/Machines", hostname),
-        (f"/Backup/Machines/{hostname}", home_parent_dir),
-        (f"/Backup/Machines/{hostname}/{home_parent_dir}", date_dir),
-    ]:
+    for mkdir_path, mkdir_name in mkdirs:
         subprocess.run(
             [
                 "curl",
@@ -251,16 +1029,18 @@ def upload_miniserve(
             ],
             check=False,
         )
+    return upload_path
 
-    print(f"Uploading to miniserve: {url}{upload_path}")
 
+def upload_file(path: Path, url: str, upload_path: str, auth: str) -> bool:
     result = subprocess.run(
         [
             "curl",
+            "-f",
             "-u",
             auth,
             "-F",
-            f"path=@{archive_path}",
+            f"path=@{path}",
             "-o",
             "/dev/null",
             f"{url}/upload?path={upload_path}",
@@ -270,6 +1050,488 @@ def upload_miniserve(
     return result.returncode == 0
 
 
+def upload_miniserve(
+    archive_paths: list[Path],
+    url: str,
+    hostname: str,
+    home_parent_dir: str,
+    auth: str,
+    run: str | None = None,
+) -> bool:
+    """Upload backup using curl to miniserve."""
+    upload_path = prepare_upload_dir(url, hostname, home_parent_dir, auth, run)
+
+    print(f"Uploading to miniserve: {url}{upload_path}")
+
+    return all(upload_file(path, url, upload_path, auth) for path in archive_paths)
+
+
+def _byte_permutation(seed: bytes) -> bytes:
+    order = sorted(range(256), key=lambda i: hashlib.sha256(seed + bytes([i])).digest())
+    return bytes.maketrans(bytes(range(256)), bytes(order))
+
+
+# Fixed tables: changing them moves every chunk boundary and defeats dedup
+_CDC_T1 = _byte_permutation(b"backup-home-cdc-1")
+_CDC_T2 = _byte_permutation(b"backup-home-cdc-2")
+_CDC_MARK = bytes.maketrans(
+    bytes(range(256)), bytes(0x31 if i >= 128 else 0x30 for i in range(256))
+)
+_CDC_PATTERN = b"1" * CDC_RUN
+
+
+def find_chunk_cut(buf: bytes | bytearray) -> int:
+    """Length of the content-defined chunk at the start of buf.
+
+    Every byte pair hashes to one bit (two fixed permutations, XORed) and the
+    chunk ends after the first run of CDC_RUN set bits past CDC_MIN_SIZE. The
+    rule only looks at the last CDC_RUN + 1 bytes, so boundaries follow the
+    content and an insertion only changes the chunks around it. translate,
+    find and big-int XOR keep the scan out of the Python byte loop.
+    """
+    end = min(len(buf), CDC_MAX_SIZE)
+    start = CDC_MIN_SIZE
+    while start < end:
+        stop = min(start + CDC_SCAN_STEP, end)
+        window = buf[start - CDC_RUN : stop]
+        a = int.from_bytes(window.translate(_CDC_T1), "big")
+        b = int.from_bytes(window.translate(_CDC_T2), "big")
+        # Byte i is T1[w[i]] ^ T2[w[i - 1]]; byte 0 has no predecessor
+        pairs = (a ^ (b >> 8)).to_bytes(len(window), "big")[1:]
+        i = pairs.translate(_CDC_MARK).find(_CDC_PATTERN)
+        if i >= 0:
+            return start + 1 + i
+        start = stop
+    return end
+
+
+def cdc_chunks(stream):
+    """Split a byte stream into content-defined chunks (see find_chunk_cut)."""
+    buf = bytearray()
+    eof = False
+    while True:
+        while not eof and len(buf) < CDC_MAX_SIZE:
+            data = stream.read(CDC_MAX_SIZE)
+            if data:
+                buf += data
+            else:
+                eof = True
+        if not buf:
+            return
+        cut = find_chunk_cut(buf)
+        yield bytes(buf[:cut])
+        del buf[:cut]
+
+
+def chunk_path(digest: str, copy: int = 0) -> str:
+    """Where a chunk is stored; copy > 0 names a re-upload of a corrupt one."""
+    suffix = f".{copy}" if copy else ""
+    return f"chunks/{digest[:2]}/{digest}{suffix}"
+
+
+def dedup_manifest_path(date: str, user: str, run: str) -> str:
+    return f"{date}/{user}.{run}.chunks.json"
+
+
+def latest_dedup_manifest(store, date: str, user: str) -> str | None:
+    """The newest manifest stored for user on date (runs sort by time)."""
+    pattern = re.compile(rf"^{re.escape(user)}(?:\.(\d{{6}}))?\.chunks\.json$")
+    runs = {}
+    for name in store.list(date):
+        m = pattern.match(name)
+        if m:
+            # Manifests from before per-run names have no time and sort first
+            runs[m[1] or ""] = name
+    return f"{date}/{runs[max(runs)]}" if runs else None
+
+
+class DirChunkStore:
+    """Dedup store in a local directory (or mounted share).
+
+    Layout, same as on miniserve: chunks/<2 hex>/<sha256>[.<copy>] holding the
+    zlib-compressed chunk, and <date>/<user>.<HHMMSS>.chunks.json manifests.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.id = f"dir:{root.resolve()}"
+
+    def put(self, rel: str, data: bytes) -> bool:
+        path = self.root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        return True
+
+    def get(self, rel: str) -> bytes | None:
+        try:
+            return (self.root / rel).read_bytes()
+        except OSError:
+            return None
+
+    def list(self, rel_dir: str) -> list[str]:
+        try:
+            return os.listdir(self.root / rel_dir)
+        except OSError:
+            return []
+
+
+class MiniserveChunkStore:
+    """Dedup store rooted at a miniserve directory (see DirChunkStore)."""
+
+    def __init__(self, url: str, root_path: str, auth: str):
+        self.url = url
+        self.root_path = root_path
+        self.auth = auth
+        self.id = f"miniserve:{url}{root_path}"
+        self.made_dirs: set[str] = set()
+        self.lock = threading.Lock()
+
+    def _curl(self, *args: str) -> subprocess.CompletedProcess:
+        # -f: an HTTP error (401, 404, 5xx) must fail, not look like success
+        return subprocess.run(
+            ["curl", "-s", "-f", "-u", self.auth, *args],
+            capture_output=True,
+            check=False,
+        )
+
+    def _ensure_dir(self, rel_dir: str) -> bool:
+        parent = self.root_path
+        # Held across the mkdir so no upload races ahead of its directory
+        with self.lock:
+            for part in rel_dir.split("/"):
+                path = f"{parent}/{part}"
+                if path not in self.made_dirs:
+                    mkdir = self._curl(
+                        "-F", f"mkdir={part}", f"{self.url}/upload?path={parent}"
+                    )
+                    # mkdir of an existing directory may be refused
+                    if mkdir.returncode != 0 and (
+                        self._curl("-o", "/dev/null", f"{self.url}{path}/").returncode
+                        != 0
+                    ):
+                        print(
+                            f"Error creating {path}: "
+                            f"{mkdir.stderr.decode(errors='replace').strip()}",
+                            file=sys.stderr,
+                        )
+                        return False
+                    self.made_dirs.add(path)
+                parent = path
+        return True
+
+    def put(self, rel: str, data: bytes) -> bool:
+        rel_dir, _, name = rel.rpartition("/")
+        if not self._ensure_dir(rel_dir):
+            return False
+        with tempfile.NamedTemporaryFile(prefix="backup-home-") as tmp:
+            tmp.write(data)
+            tmp.flush()
+            result = subprocess.run(
+                [
+                    "curl",
+                    "-s",
+                    "-f",
+                    "-u",
+                    self.auth,
+                    "-F",
+                    f"path=@{tmp.name};filename={name}",
+                    "-o",
+                    "/dev/null",
+                    f"{self.url}/upload?path={self.root_path}/{rel_dir}",
+                ],
+                check=False,
+            )
+        return result.returncode == 0
+
+    def get(self, rel: str) -> bytes | None:
+        result = self._curl(f"{self.url}{self.root_path}/{rel}")
+        return result.stdout if result.returncode == 0 else None
+
+    def list(self, rel_dir: str) -> list[str]:
+        """File names in a directory, read from miniserve's listing page."""
+        result = self._curl(f"{self.url}{self.root_path}/{rel_dir}/")
+        if result.returncode != 0:
+            return []
+        hrefs = re.findall(r'href="([^"?]+)"', result.stdout.decode(errors="replace"))
+        return [urllib.parse.unquote(h.rstrip("/").rsplit("/", 1)[-1]) for h in hrefs]
+
+
+class ChunkIndex:
+    """Local record of the chunks a store already holds, so they aren't re-sent."""
+
+    def __init__(self, path: Path, store_id: str):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS chunks ("
+            "store TEXT NOT NULL, hash TEXT NOT NULL, PRIMARY KEY (store, hash))"
+        )
+        # Chunks verify found corrupt, and the copy to upload them as next
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS replacements ("
+            "store TEXT NOT NULL, hash TEXT NOT NULL, copy INTEGER NOT NULL, "
+            "PRIMARY KEY (store, hash))"
+        )
+        self.store_id = store_id
+
+    def has(self, digest: str) -> bool:
+        row = self.conn.execute(
+            "SELECT 1 FROM chunks WHERE store = ? AND hash = ?",
+            (self.store_id, digest),
+        ).fetchone()
+        return row is not None
+
+    def upload_copy(self, digest: str) -> int:
+        row = self.conn.execute(
+            "SELECT copy FROM replacements WHERE store = ? AND hash = ?",
+            (self.store_id, digest),
+        ).fetchone()
+        return row[0] if row else 0
+
+    def add(self, digest: str):
+        self.conn.execute(
+            "INSERT OR IGNORE INTO chunks VALUES (?, ?)", (self.store_id, digest)
+        )
+        self.conn.execute(
+            "DELETE FROM replacements WHERE store = ? AND hash = ?",
+            (self.store_id, digest),
+        )
+
+    def replace(self, copies: dict[str, int]):
+        """Forget chunks so the next backup re-sends each as the given copy."""
+        self.conn.executemany(
+            "DELETE FROM chunks WHERE store = ? AND hash = ?",
+            [(self.store_id, d) for d in copies],
+        )
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO replacements VALUES (?, ?, ?)",
+            [(self.store_id, d, copy) for d, copy in copies.items()],
+        )
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+def dedup_backup(
+    cmd: list[str],
+    store,
+    index: ChunkIndex,
+    user: str,
+    manifest_rel: str,
+    ignore_tar_warnings: bool = False,
+) -> bool:
+    """Chunk the uncompressed tar stream into store, sending only new chunks.
+
+    Uploads run on DEDUP_UPLOAD_JOBS threads with at most twice that many
+    chunks in flight. A chunk enters the index once its upload succeeded, and
+    the manifest is written last, so an interrupted run leaves no manifest
+    pointing at missing chunks.
+    """
+    home_parent = Path.home().parent
+    digests: list[str] = []
+    queued: set[str] = set()
+    pending = {}
+    total = sent_bytes = 0
+    failed = False
+
+    def collect(done):
+        nonlocal failed
+        for future in done:
+            digest = pending.pop(future)
+            try:
+                ok = future.result()
+            except OSError as e:
+                print(f"Error storing chunk {digest}: {e}", file=sys.stderr)
+                ok = False
+            if ok:
+                index.add(digest)
+            else:
+                failed = True
+
+    tar_proc = subprocess.Popen(
+        cmd, cwd=home_parent, stdout=subprocess.PIPE, stderr=None
+    )
+    with ThreadPoolExecutor(max_workers=DEDUP_UPLOAD_JOBS) as pool:
+        for chunk in cdc_chunks(tar_proc.stdout):
+            digest = hashlib.sha256(chunk).hexdigest()
+            digests.append(digest)
+            total += len(chunk)
+            if digest in queued or index.has(digest):
+                continue
+            queued.add(digest)
+            data = zlib.compress(chunk)
+            sent_bytes += len(data)
+            rel = chunk_path(digest, index.upload_copy(digest))
+            pending[pool.submit(store.put, rel, data)] = digest
+            if len(pending) >= DEDUP_UPLOAD_JOBS * 2:
+                collect(wait(pending, return_when=FIRST_COMPLETED).done)
+            if failed:
+                tar_proc.kill()
+                break
+        collect(wait(pending).done)
+    tar_proc.stdout.close()
+    tar_proc.wait()
+
+    if failed:
+        print("Chunk upload failed", file=sys.stderr)
+        return False
+    if not tar_exit_ok(tar_proc.returncode, ignore_tar_warnings):
+        return False
+
+    manifest = {
+        "version": 1,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "user": user,
+        "size": total,
+        "chunks": digests,
+    }
+    if not store.put(manifest_rel, json.dumps(manifest).encode()):
+        print(f"Writing manifest {manifest_rel} failed", file=sys.stderr)
+        return False
+    print(
+        f"Dedup: {len(digests)} chunks, {len(queued)} new, "
+        f"{sent_bytes / 1e6:.1f} MB sent for {total / 1e6:.1f} MB of tar"
+    )
+    return True
+
+
+def locate_chunk(store, digest: str) -> tuple[bytes | None, int]:
+    """The first stored copy of a chunk whose hash matches, and its number.
+
+    Copies are tried in order until one is missing; if none matches, the
+    chunk is None and the number is the first free copy.
+    """
+    copy = 0
+    while (data := store.get(chunk_path(digest, copy))) is not None:
+        try:
+            chunk = zlib.decompress(data)
+        except zlib.error:
+            chunk = None
+        if chunk is not None and hashlib.sha256(chunk).hexdigest() == digest:
+            return chunk, copy
+        copy += 1
+    return None, copy
+
+
+def read_chunk(store, digest: str) -> bytes | None:
+    """Fetch and decompress a chunk; None if no copy is intact."""
+    return locate_chunk(store, digest)[0]
+
+
+def load_dedup_manifest(store, manifest_rel: str) -> dict | None:
+    raw = store.get(manifest_rel)
+    if raw is None:
+        print(f"Error: manifest {manifest_rel} not found", file=sys.stderr)
+        return None
+    return json.loads(raw)
+
+
+def verify_dedup(store, index: ChunkIndex, manifest_rel: str) -> bool:
+    """Re-hash every chunk a manifest references.
+
+    The store is append-only, so a bad or missing chunk is dropped from the
+    local index along with the next free copy name; the next backup re-sends
+    it under that name and restore skips the corrupt copies before it.
+    """
+    manifest = load_dedup_manifest(store, manifest_rel)
+    if manifest is None:
+        return False
+    unique = list(dict.fromkeys(manifest["chunks"]))
+    with ThreadPoolExecutor(max_workers=DEDUP_UPLOAD_JOBS) as pool:
+        results = pool.map(lambda d: locate_chunk(store, d), unique)
+        bad = {
+            digest: copy
+            for digest, (chunk, copy) in zip(unique, results)
+            if chunk is None
+        }
+    for digest, copy in bad.items():
+        print(f"BAD {chunk_path(digest)} (re-sent as copy {copy})", file=sys.stderr)
+    index.replace(bad)
+    print(f"Verified {len(unique) - len(bad)}/{len(unique)} chunks of {manifest_rel}")
+    return not bad
+
+
+def restore_dedup(store, manifest_rel: str, target: Path) -> bool:
+    """Reassemble a dedup backup's tar stream and extract it into target."""
+    manifest = load_dedup_manifest(store, manifest_rel)
+    if manifest is None:
+        return False
+    target.mkdir(parents=True, exist_ok=True)
+    tar_proc = subprocess.Popen(
+        ["tar", "-xf", "-", "-C", str(target)], stdin=subprocess.PIPE
+    )
+    ok = True
+    try:
+        for digest in manifest["chunks"]:
+            chunk = read_chunk(store, digest)
+            if chunk is None:
+                print(f"Missing or corrupt chunk {digest}", file=sys.stderr)
+                ok = False
+                break
+            tar_proc.stdin.write(chunk)
+    except BrokenPipeError:
+        pass
+    finally:
+        tar_proc.stdin.close()
+    tar_proc.wait()
+    return ok and tar_proc.returncode == 0
+
+
+def dedup_store(args, hostname: str, home_parent_dir: str):
+    """The dedup store selected by --dedup-store/--store, else miniserve."""
+    store_dir = getattr(args, "store", None) or args.dedup_store
+    if store_dir:
+        return DirChunkStore(Path(store_dir))
+    url = args.miniserve if args.miniserve else DEFAULT_MINISERVE_URL
+    return MiniserveChunkStore(
+        url, f"/Backup/Machines/{hostname}/{home_parent_dir}", miniserve_auth()
+    )
+
+
+def chunk_index(store) -> ChunkIndex:
+    return ChunkIndex(STATE_DIR / "chunk-index.sqlite3", store.id)
+
+
+def verify_main(args) -> None:
+    store = dedup_store(args, socket.gethostname(), Path.home().parent.name)
+    user = args.user or os.environ.get("USER") or os.getlogin()
+    manifest_rel = latest_dedup_manifest(store, args.date, user)
+    if manifest_rel is None:
+        print(f"Error: no dedup manifest for {user} on {args.date}", file=sys.stderr)
+        sys.exit(1)
+    index = chunk_index(store)
+    try:
+        ok = verify_dedup(store, index, manifest_rel)
+    finally:
+        index.close()
+    if not ok:
+        sys.exit(1)
+
+
+def restore_main(args) -> None:
+    source = Path(args.source)
+    if source.name.endswith(".chunks.json"):
+        # <store>/<date>/<user>.<HHMMSS>.chunks.json
+        store = DirChunkStore(source.parent.parent)
+        if not restore_dedup(
+            store, f"{source.parent.name}/{source.name}", Path(args.target)
+        ):
+            sys.exit(1)
+        print(f"Restored {source} into {args.target}")
+        return
+    try:
+        archives = find_chain(Path(args.source), args.chain, args.level)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    if not restore_chain(archives, Path(args.target)):
+        sys.exit(1)
+    print(f"Restored {len(archives)} level(s) into {args.target}")
+
+
 def main():
     check_tar_on_darwin()
 
@@ -287,6 +1549,13 @@ Examples:
   backup-home --skip-upload                # Create backup locally only
   backup-home --miniserve http://host:8080 # Upload via miniserve (custom URL)
   backup-home --skip-backup --skip-upload  # Use existing backup, no upload
+  backup-home --incremental                # Upload only changes since the last run
+  backup-home --stream --delete-backup     # Upload 1 GiB volumes while compressing
+  backup-home restore /Backup/Machines/host/Users ~/restore
+                                           # Replay the newest incremental chain
+  backup-home --dedup                      # Send only new chunks to miniserve
+  backup-home --compress auto              # Pick the compression level per run
+  backup-home verify --date 2026-01-20     # Re-hash that day's dedup chunks
 """,
     )
 
@@ -324,7 +1593,7 @@ Examples:
     parser.add_argument(
         "--backup-path",
         type=str,
-        help="Custom path for backup archive",
+        help="Custom path for backup archive (not with --incremental)",
     )
     parser.add_argument(
         "--miniserve",
@@ -333,9 +1602,113 @@ Examples:
         metavar="URL",
         help=f"Custom miniserve URL (default: {DEFAULT_MINISERVE_URL})",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Archive only changes since the last incremental backup",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="With --incremental, start a new chain with a level 0 backup",
+    )
+    parser.add_argument(
+        "--max-level",
+        type=int,
+        default=DEFAULT_MAX_LEVEL,
+        help=f"Start a new chain after this many incremental levels (default: {DEFAULT_MAX_LEVEL})",
+    )
+
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Upload fixed-size volumes while compressing instead of staging one archive",
+    )
+    parser.add_argument(
+        "--volume-size",
+        type=int,
+        default=DEFAULT_VOLUME_SIZE_MB,
+        metavar="MB",
+        help=f"Volume size for --stream (default: {DEFAULT_VOLUME_SIZE_MB})",
+    )
+
+    parser.add_argument(
+        "--compress",
+        choices=COMPRESSORS,
+        default="pigz",
+        help="Compressor; auto samples the tar stream to pick one (default: pigz)",
+    )
+    parser.add_argument(
+        "--level",
+        type=int,
+        help="Compression level for pigz/zstd (default: the tool's own); with "
+        "--compress auto, the only level tried for each tool",
+    )
+    parser.add_argument(
+        "--auto-sample",
+        type=int,
+        default=DEFAULT_AUTO_SAMPLE_MB,
+        metavar="MB",
+        help=f"Size of the tar sample --compress auto measures (default: {DEFAULT_AUTO_SAMPLE_MB})",
+    )
+    parser.add_argument(
+        "--upload-mbps",
+        type=float,
+        help="Upload bandwidth assumed by --compress auto "
+        f"(default: last measured, else {DEFAULT_UPLOAD_MBPS:g})",
+    )
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Store content-defined chunks, sending only ones the store lacks",
+    )
+    parser.add_argument(
+        "--dedup-store",
+        metavar="DIR",
+        help="Use a local directory as the --dedup store instead of miniserve",
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+    restore_parser = subparsers.add_parser(
+        "restore", help="Restore an incremental chain into a directory"
+    )
+    restore_parser.add_argument(
+        "source",
+        help="Directory containing the chain's archives (searched recursively)",
+    )
+    restore_parser.add_argument("target", help="Directory to restore into")
+    restore_parser.add_argument("--chain", help="Chain id to restore (default: newest)")
+    restore_parser.add_argument(
+        "--level", type=int, help="Stop after this level (default: last)"
+    )
+
+    verify_parser = subparsers.add_parser(
+        "verify", help="Re-hash the chunks referenced by a day's newest dedup manifest"
+    )
+    verify_parser.add_argument(
+        "--date",
+        default=datetime.now().strftime("%Y-%m-%d"),
+        help="Backup date to verify (default: today)",
+    )
+    verify_parser.add_argument("--user", help="Backed-up user (default: $USER)")
+    verify_parser.add_argument(
+        "--store", metavar="DIR", help="Local dedup store (default: miniserve)"
+    )
 
     args = parser.parse_args()
 
+    if args.command == "restore":
+        restore_main(args)
+        return
+    if args.command == "verify":
+        verify_main(args)
+        return
+
+    if args.incremental and args.backup_path:
+        # Every level needs its own <user>.<chain>.L<n> name for restore to find it
+        print("Error: --backup-path cannot be used with --incremental", file=sys.stderr)
+        sys.exit(1)
+
     # Get environment info
     user = os.environ.get("USER", os.getlogin())
     hostname = socket.gethostname()
@@ -352,7 +1725,41 @@ Examples:
     else:
         archive_path = Path("/tmp") / f"{user}.tar.gz"
 
+    # auto is resolved once the tar command is known; the extension follows
+    compressor = Compressor(
+        "pigz" if args.compress == "auto" else args.compress, args.level
+    )
+    if not args.backup_path:
+        archive_path = archive_path.with_name(user + compressor.extension)
+
+    miniserve_url = args.miniserve if args.miniserve else DEFAULT_MINISERVE_URL
+    # Fixed archive and volume names would collide with a failed earlier run
+    run = datetime.now().strftime("%H%M%S") if args.incremental or args.stream else None
+    plan = None
+    volumes = None
+    upload = None
+    upload_paths = [archive_path]
+    stats = PipelineStats()
+
     # Create or skip backup
+    if args.skip_backup and (args.incremental or args.stream or args.dedup):
+        flag = next(
+            f"--{name}"
+            for name in ("incremental", "stream", "dedup")
+            if getattr(args, name)
+        )
+        print(f"Error: --skip-backup cannot be used with {flag}", file=sys.stderr)
+        sys.exit(1)
+    if args.dedup and (args.incremental or args.stream):
+        print(
+            "Error: --dedup already sends only new data; "
+            "it cannot be combined with --incremental or --stream",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    if args.dedup and args.skip_upload and not args.dedup_store:
+        print("Error: --dedup with --skip-upload needs --dedup-store", file=sys.stderr)
+        sys.exit(1)
     if args.skip_backup:
         if not archive_path.exists():
             print(
@@ -373,45 +1780,144 @@ Examples:
                     file=sys.stderr,
                 )
                 sys.exit(1)
-        if not create_backup(
-            archive_path, user, args.ignore_tar_warnings, args.no_excludes, exclude_cats
-        ):
+        if args.dedup:
+            store = dedup_store(args, hostname, home_parent_dir)
+            if isinstance(store, MiniserveChunkStore):
+                prepare_upload_dir(miniserve_url, hostname, home_parent_dir, store.auth)
+            print(f"Dedup store: {store.id}")
+            index = chunk_index(store)
+            try:
+                ok = dedup_backup(
+                    tar_command(user, args.no_excludes, exclude_cats),
+                    store,
+                    index,
+                    user,
+                    dedup_manifest_path(
+                        datetime.now().strftime("%Y-%m-%d"),
+                        user,
+                        datetime.now().strftime("%H%M%S"),
+                    ),
+                    args.ignore_tar_warnings,
+                )
+            finally:
+                index.close()
+            sys.exit(0 if ok else 1)
+        if args.incremental:
+            plan = plan_incremental(
+                user,
+                exclude_patterns(args.no_excludes, exclude_cats),
+                archive_path.parent,
+                args.full,
+                args.max_level,
+            )
+            print(
+                f"Incremental level {plan.level} of chain {plan.chain}: "
+                f"{plan.changed} changed, {len(plan.deleted)} deleted"
+            )
+        if args.compress == "auto":
+            upload_mbps = args.upload_mbps or last_upload_mbps() or DEFAULT_UPLOAD_MBPS
+            compressor = auto_compressor(
+                tar_command(
+                    user,
+                    args.no_excludes,
+                    exclude_cats,
+                    plan.file_list if plan else None,
+                ),
+                args.auto_sample * 1024 * 1024,
+                upload_mbps,
+                args.level,
+            )
+        if not args.backup_path:
+            stem = f"{user}.{plan.chain}.L{plan.level}" if plan else user
+            archive_path = archive_path.with_name(stem + compressor.extension)
+        upload_paths = [archive_path]
+        if plan:
+            deleted_path = Path(str(archive_path) + ".deleted")
+            write_deleted_list(deleted_path, plan.deleted)
+            upload_paths.append(deleted_path)
+        if args.stream:
+            if not args.skip_upload:
+                auth = miniserve_auth()
+                upload_path = prepare_upload_dir(
+                    miniserve_url, hostname, home_parent_dir, auth, run
+                )
+                print(f"Streaming to miniserve: {miniserve_url}{upload_path}")
+                upload = functools.partial(
+                    upload_file, url=miniserve_url, upload_path=upload_path, auth=auth
+                )
+            volumes = VolumeWriter(
+                archive_path,
+                args.volume_size * 1024 * 1024,
+                upload,
+                delete_uploaded=args.delete_backup,
+            )
+        ok = create_backup(
+            archive_path,
+            user,
+            args.ignore_tar_warnings,
+            args.no_excludes,
+            exclude_cats,
+            plan.file_list if plan else None,
+            volumes,
+            compressor,
+            stats,
+        )
+        if volumes:
+            ok = volumes.finish(ok)
+        if not ok:
+            if plan:
+                discard_incremental(plan)
             sys.exit(1)
 
+    saved_at = archive_path
+    if volumes:
+        # Volumes and their checksum list are already uploaded; only sidecars remain
+        saved_at = volumes.describe()
+        upload_paths.remove(archive_path)
+        stats.upload_bytes = volumes.upload_bytes
+        stats.upload_seconds = volumes.upload_seconds
+
     # Upload or skip
     if args.skip_upload:
-        print(f"Skipping upload, backup saved at: {archive_path}")
+        if plan:
+            commit_incremental(plan)
+        if stats.raw_bytes:
+            report_throughput(stats, compressor)
+        print(f"Skipping upload, backup saved at: {saved_at}")
         sys.exit(0)
 
-    miniserve_url = args.miniserve if args.miniserve else DEFAULT_MINISERVE_URL
-    miniserve_user = _read_secret("MINISERVE_USER")
-    miniserve_pass = _read_secret("MINISERVE_PASS")
-    if not miniserve_user or not miniserve_pass:
-        print(
-            "Error: miniserve secrets not found in ~/.config/sops-nix/secrets/",
-            file=sys.stderr,
+    start = time.monotonic()
+    if upload:
+        success = all(upload(path) for path in upload_paths)
+    else:
+        success = upload_miniserve(
+            upload_paths,
+            miniserve_url,
+            hostname,
+            home_parent_dir,
+            miniserve_auth(),
+            run,
         )
-        sys.exit(1)
-    success = upload_miniserve(
-        archive_path,
-        miniserve_url,
-        hostname,
-        home_parent_dir,
-        miniserve_user,
-        miniserve_pass,
-    )
+    if success:
+        stats.upload_bytes += sum(path.stat().st_size for path in upload_paths)
+        stats.upload_seconds += time.monotonic() - start
 
     if success:
         print("Upload successful")
+        if stats.raw_bytes:
+            report_throughput(stats, compressor)
+        if plan:
+            commit_incremental(plan)
         if args.delete_backup:
-            archive_path.unlink()
+            for path in upload_paths:
+                path.unlink()
             print("Local backup deleted")
         else:
-            print(f"Backup kept at: {archive_path}")
+            print(f"Backup kept at: {saved_at}")
     else:
-        print(
-            f"Upload failed, keeping local backup at: {archive_path}", file=sys.stderr
-        )
+        if plan:
+            discard_incremental(plan)
+        print(f"Upload failed, keeping local backup at: {saved_at}", file=sys.stderr)
         sys.exit(1)
 
 
@@ -5,26 +5,49 @@
 Companion to backup-home: while backup-home excludes patterns from archives,
 this tool actually removes them from disk.
 
-Targets:
+Targets (default):
   - .venv/        Python virtual environments
   - node_modules/ Node.js dependencies
 
+Other known-regenerable directories can be selected with --target:
+__pycache__, .terragrunt-cache and target (only next to a Cargo.toml,
+pyproject.toml or setup.py). Any other name is rejected.
+
 Dry-run by default. Use --delete to actually remove files.
 
 2026-02-19: Initial implementation with .venv and node_modules.
+2026-10-18: Parallel single-pass scanner with a persistent size cache,
+            --target and --json.
 """
 
 import argparse
+import json
 import os
 import shutil
+import sqlite3
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 
 TARGET_DIRS = [".venv", "node_modules"]
 
+# Every directory name --target accepts, with the files one of which must sit
+# next to it (empty: none needed). Generic names only count as targets next to
+# a file that proves they are build output.
+REGENERABLE_DIRS = {
+    ".venv": (),
+    "node_modules": (),
+    "__pycache__": (),
+    ".terragrunt-cache": (),
+    "target": ("Cargo.toml", "pyproject.toml", "setup.py"),
+}
+
 SKIP_DIRS = {".git", ".Trash", "Library"}
 
+DEFAULT_JOBS = 16
+
 
 @dataclass
 class Finding:
@@ -57,43 +80,247 @@ def format_size(size_bytes: int) -> str:
     return f"{size_bytes:.1f}P"
 
 
-def dir_size(path: Path) -> tuple[int, int]:
-    """Return (total_bytes, file_count) for a directory tree."""
-    total = 0
-    count = 0
-    try:
-        with os.scandir(path) as entries:
-            for entry in entries:
-                try:
-                    if entry.is_file(follow_symlinks=False):
-                        total += entry.stat(follow_symlinks=False).st_size
-                        count += 1
-                    elif entry.is_dir(follow_symlinks=False):
-                        sub_total, sub_count = dir_size(Path(entry.path))
-                        total += sub_total
-                        count += sub_count
-                except (PermissionError, OSError):
-                    pass
-    except (PermissionError, OSError):
-        pass
-    return total, count
-
-
-def scan(home: Path) -> list[TargetResult]:
-    results = {name: TargetResult(name=name) for name in TARGET_DIRS}
-
-    for root, dirs, _ in os.walk(home, followlinks=False):
-        for target_name in TARGET_DIRS:
-            if target_name in dirs:
-                target_path = Path(root) / target_name
-                size, count = dir_size(target_path)
-                results[target_name].findings.append(
-                    Finding(path=target_path, size=size, count=count)
+def get_cache_path() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    return Path(cache_home) / "cleanup-home" / "sizes.sqlite3"
+
+
+@dataclass
+class TreeScan:
+    """Totals for one target tree, filled in by the scanner or the cache.
+
+    size excludes files with more than one link; those are kept in links
+    keyed by (st_dev, st_ino) so scan() can count each inode once.
+    """
+
+    name: str
+    path: Path
+    size: int = 0
+    count: int = 0
+    dirs: dict[str, int] = field(default_factory=dict)
+    links: dict[tuple[int, int], int] = field(default_factory=dict)
+    cached: bool = False
+    lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+
+class SizeCache:
+    """Persistent tree sizes, reused while no directory in the tree changed.
+
+    Each tree stores the mtime of every directory in it. Adding, removing or
+    renaming an entry changes its parent's mtime, so a tree whose directories
+    all stat the same is reused without listing or stat-ing its files. Files
+    rewritten in place (same entries) are not noticed until something else in
+    their directory changes.
+    """
+
+    def __init__(self, path: Path | None):
+        self.lock = threading.Lock()
+        self.conn = None
+        if path:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS trees (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    count INTEGER NOT NULL,
+                    dirs TEXT NOT NULL,
+                    links TEXT NOT NULL
                 )
-                dirs.remove(target_name)
+                """
+            )
+
+    def load(self, name: str, path: Path) -> TreeScan | None:
+        if not self.conn:
+            return None
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT size, count, dirs, links FROM trees WHERE path = ?",
+                (str(path),),
+            ).fetchone()
+        if row is None:
+            return None
+        dirs = json.loads(row[2])
+        for rel, mtime in dirs.items():
+            try:
+                if os.stat(os.path.join(path, rel)).st_mtime_ns != mtime:
+                    return None
+            except OSError:
+                return None
+        return TreeScan(
+            name=name,
+            path=path,
+            size=row[0],
+            count=row[1],
+            dirs=dirs,
+            links={(dev, ino): size for dev, ino, size in json.loads(row[3])},
+            cached=True,
+        )
 
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+    def store(self, trees: list[TreeScan], targets: list[str]):
+        """Save rescanned trees and drop rows for trees of these targets that are gone."""
+        if not self.conn:
+            return
+        found = {str(t.path) for t in trees}
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO trees VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        str(t.path),
+                        t.size,
+                        t.count,
+                        json.dumps(t.dirs),
+                        json.dumps(
+                            [[dev, ino, size] for (dev, ino), size in t.links.items()]
+                        ),
+                    )
+                    for t in trees
+                    if not t.cached
+                ],
+            )
+            stale = [
+                (path,)
+                for (path,) in self.conn.execute("SELECT path FROM trees")
+                if path not in found and os.path.basename(path) in targets
+            ]
+            self.conn.executemany("DELETE FROM trees WHERE path = ?", stale)
+            self.conn.commit()
+
+
+class Scanner:
+    """Walk home once on a thread pool, sizing target trees as they are found.
+
+    Every directory is one task on a shared queue, so idle workers pick up
+    whatever is pending (a large node_modules is spread over all of them).
+    os.scandir and stat release the GIL, which is where the time goes.
+    """
+
+    def __init__(self, targets: list[str], cache: SizeCache, jobs: int):
+        self.targets = set(targets)
+        self.cache = cache
+        self.pool = ThreadPoolExecutor(max_workers=jobs)
+        self.cond = threading.Condition()
+        self.pending = 0
+        self.trees: list[TreeScan] = []
+        self.errors: list[BaseException] = []
+
+    def submit(self, fn, *args):
+        with self.cond:
+            self.pending += 1
+        self.pool.submit(self._run, fn, *args)
+
+    def _run(self, fn, *args):
+        try:
+            fn(*args)
+        except Exception as e:
+            self.errors.append(e)
+        finally:
+            with self.cond:
+                self.pending -= 1
+                if self.pending == 0:
+                    self.cond.notify_all()
+
+    def scan(self, home: Path) -> list[TreeScan]:
+        self.submit(self._walk, str(home))
+        with self.cond:
+            while self.pending:
+                self.cond.wait()
+        self.pool.shutdown()
+        if self.errors:
+            raise self.errors[0]
+        return self.trees
+
+    def _is_target(self, parent: str, name: str) -> bool:
+        if name not in self.targets:
+            return False
+        markers = REGENERABLE_DIRS[name]
+        return not markers or any(
+            os.path.exists(os.path.join(parent, marker)) for marker in markers
+        )
+
+    def _walk(self, dir_path: str):
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError:
+            return
+        for entry in entries:
+            try:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+            except OSError:
+                continue
+            if self._is_target(dir_path, entry.name):
+                self.submit(self._start_tree, entry.name, Path(entry.path))
+            elif entry.name not in SKIP_DIRS:
+                self.submit(self._walk, entry.path)
+
+    def _start_tree(self, name: str, path: Path):
+        tree = self.cache.load(name, path)
+        if tree is None:
+            tree = TreeScan(name=name, path=path)
+            self.submit(self._walk_tree, tree, str(path))
+        with self.cond:
+            self.trees.append(tree)
+
+    def _walk_tree(self, tree: TreeScan, dir_path: str):
+        try:
+            mtime = os.stat(dir_path).st_mtime_ns
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError:
+            return
+        size = 0
+        count = 0
+        links = {}
+        for entry in entries:
+            try:
+                if entry.is_file(follow_symlinks=False):
+                    st = entry.stat(follow_symlinks=False)
+                    if st.st_nlink > 1:
+                        links[(st.st_dev, st.st_ino)] = st.st_size
+                    else:
+                        size += st.st_size
+                    count += 1
+                elif entry.is_dir(follow_symlinks=False):
+                    self.submit(self._walk_tree, tree, entry.path)
+            except OSError:
+                pass
+        with tree.lock:
+            tree.size += size
+            tree.count += count
+            tree.dirs[os.path.relpath(dir_path, tree.path)] = mtime
+            tree.links.update(links)
+
+
+def scan(
+    home: Path,
+    targets: list[str] | None = None,
+    cache: SizeCache | None = None,
+    jobs: int = DEFAULT_JOBS,
+) -> list[TargetResult]:
+    targets = targets or TARGET_DIRS
+    cache = cache or SizeCache(None)
+    trees = Scanner(targets, cache, jobs).scan(home)
+    results = {name: TargetResult(name=name) for name in targets}
+
+    # Hard-linked files (e.g. pnpm's store) count once, for the first tree by path
+    seen_inodes = set()
+    for tree in sorted(trees, key=lambda t: str(t.path)):
+        size = tree.size
+        for inode, link_size in tree.links.items():
+            if inode not in seen_inodes:
+                seen_inodes.add(inode)
+                size += link_size
+        results[tree.name].findings.append(
+            Finding(path=tree.path, size=size, count=tree.count)
+        )
 
+    cache.store(trees, targets)
     return list(results.values())
 
 
@@ -123,7 +350,30 @@ def print_report(results: list[TargetResult], home: Path) -> int:
     return grand_total
 
 
-def delete_targets(results: list[TargetResult]) -> tuple[int, int]:
+def json_report(results: list[TargetResult], home: Path) -> dict:
+    return {
+        "home": str(home),
+        "total_size": sum(r.total_size for r in results),
+        "targets": [
+            {
+                "name": result.name,
+                "total_size": result.total_size,
+                "total_count": result.total_count,
+                "findings": [
+                    {
+                        "path": str(f.path.relative_to(home)),
+                        "size": f.size,
+                        "count": f.count,
+                    }
+                    for f in sorted(result.findings, key=lambda f: f.size, reverse=True)
+                ],
+            }
+            for result in results
+        ],
+    }
+
+
+def delete_targets(results: list[TargetResult], out=sys.stdout) -> tuple[int, int]:
     deleted = 0
     errors = 0
 
@@ -132,7 +382,7 @@ def delete_targets(results: list[TargetResult]) -> tuple[int, int]:
             try:
                 shutil.rmtree(finding.path)
                 deleted += finding.size
-                print(f"  Removed: {finding.path}")
+                print(f"  Removed: {finding.path}", file=out)
             except (PermissionError, OSError) as e:
                 errors += 1
                 print(f"  Error removing {finding.path}: {e}", file=sys.stderr)
@@ -151,11 +401,15 @@ carefully before using --delete.
 
 Safety:
   Dry-run by default. Use --delete to actually remove files.
-  Only targets known-regenerable directories (.venv, node_modules).
+  Only targets known-regenerable directories: .venv and node_modules, or
+  those chosen with --target from a fixed list ("target" only counts next
+  to a Cargo.toml, pyproject.toml or setup.py).
 
 Examples:
   cleanup-home                 # Scan and show what can be cleaned
   cleanup-home --delete        # Actually delete artifacts
+  cleanup-home --target __pycache__ --target .terragrunt-cache
+  cleanup-home --json          # Machine-readable report
 """,
     )
     parser.add_argument(
@@ -163,26 +417,62 @@ Examples:
         action="store_true",
         help="Actually delete files (default is dry-run)",
     )
+    parser.add_argument(
+        "--target",
+        action="append",
+        dest="targets",
+        metavar="NAME",
+        choices=list(REGENERABLE_DIRS),
+        help=(
+            f"Directory name to clean, repeatable: {', '.join(REGENERABLE_DIRS)} "
+            f"(default: {', '.join(TARGET_DIRS)})"
+        ),
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Parallel scan threads (default: {DEFAULT_JOBS})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Rescan every tree instead of reusing cached sizes",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the report as JSON (progress goes to stderr)",
+    )
 
     args = parser.parse_args()
     home = Path.home()
+    out = sys.stderr if args.json else sys.stdout
 
-    print(f"Scanning {home} ...")
-    results = scan(home)
+    print(f"Scanning {home} ...", file=out)
+    cache = SizeCache(None if args.no_cache else get_cache_path())
+    results = scan(home, args.targets, cache, args.jobs)
 
-    grand_total = print_report(results, home)
+    if args.json:
+        report = json_report(results, home)
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        grand_total = report["total_size"]
+    else:
+        grand_total = print_report(results, home)
 
     if grand_total == 0:
-        print("Nothing to clean.")
+        print("Nothing to clean.", file=out)
         return 0
 
     if not args.delete:
-        print("\nDry-run mode. Use --delete to remove.")
+        print("\nDry-run mode. Use --delete to remove.", file=out)
         return 0
 
-    print("\nDeleting...")
-    deleted, errors = delete_targets(results)
-    print(f"\nDeleted: {format_size(deleted)}")
+    print("\nDeleting...", file=out)
+    deleted, errors = delete_targets(results, out)
+    print(f"\nDeleted: {format_size(deleted)}", file=out)
     if errors:
         print(f"Errors: {errors}", file=sys.stderr)
         return 1
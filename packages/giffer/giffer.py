@@ -6,13 +6,23 @@ By default, this tool passes all arguments directly to yt-dlp or gallery-dl.
 Use subcommands for additional functionality like splitting.
 """
 
+import atexit
+import csv
+import functools
 import json
+import os
+import queue
 import re
 import shutil
+import sqlite3
 import subprocess
 import sys
+import tempfile
+import threading
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 import click
 
@@ -21,6 +31,39 @@ DEFAULT_FAILED_FILE = ".list.failed.txt"
 DEFAULT_MAX_HEIGHT = 1080
 DEFAULT_SUB_LANGS = "en"
 DEFAULT_SEGMENT_DURATION = 10
+DEFAULT_PROBE_BATCH = 25
+DEFAULT_ARCHIVE = Path(
+    os.environ.get("GIFFER_ARCHIVE")
+    or Path(os.environ.get("XDG_STATE_HOME", os.path.expanduser("~/.local/state")))
+    / "giffer"
+    / "archive.sqlite3"
+)
+
+# Printed by yt-dlp after each file is moved into place
+ARCHIVE_PRINT_TEMPLATE = (
+    "after_move:%(webpage_url)s\t%(extractor_key)s\t%(id)s\t%(filepath)s"
+)
+
+# Passthrough flags that don't download; the archive is neither checked nor updated
+NON_DOWNLOAD_FLAGS = {
+    "-F",
+    "--list-formats",
+    "-s",
+    "--simulate",
+    "--skip-download",
+    "-j",
+    "--dump-json",
+    "-J",
+    "--dump-single-json",
+    "-g",
+    "--get-url",
+    "--print",
+    "-O",
+    "--list-subs",
+    "--update",
+    "-U",
+    "--version",
+}
 
 SITE_CONFIGS = {
     "3": {
@@ -30,6 +73,257 @@ SITE_CONFIGS = {
 }
 
 
+def canonical_url(url: str) -> str:
+    """Normalize a URL for archive lookups.
+
+    Lowercases scheme and host, drops the fragment, tracking parameters
+    and trailing slash so the same page scraped twice maps to one key.
+    """
+    parts = urlsplit(url.strip())
+    query = [
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.startswith("utm_")
+    ]
+    return urlunsplit(
+        (
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path.rstrip("/") or "/",
+            urlencode(query),
+            "",
+        )
+    )
+
+
+class DownloadArchive:
+    """Persistent record of downloaded URLs shared by batch, scrape and passthrough.
+
+    Keyed by canonical URL, with the yt-dlp extractor and video ID when
+    known. Lookups happen before any yt-dlp/gallery-dl probe; each successful
+    download is committed in its own transaction. WAL mode lets the daemon
+    and interactive runs use the same file concurrently.
+    """
+
+    def __init__(self, path=DEFAULT_ARCHIVE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                """CREATE TABLE IF NOT EXISTS downloads (
+                    url TEXT PRIMARY KEY,
+                    extractor TEXT NOT NULL DEFAULT '',
+                    video_id TEXT NOT NULL DEFAULT '',
+                    path TEXT NOT NULL DEFAULT '',
+                    size INTEGER,
+                    mtime REAL,
+                    downloaded_at REAL NOT NULL
+                )"""
+            )
+            # yt-dlp archive files lowercase the extractor, extractor_key doesn't
+            self.conn.execute("DROP INDEX IF EXISTS downloads_id")
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS downloads_video_id"
+                " ON downloads (video_id, extractor COLLATE NOCASE)"
+            )
+        self.ytdlp_file = None
+
+    def get(self, url):
+        """Return the archive row for a URL, or None."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT * FROM downloads WHERE url = ?", (canonical_url(url),)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def get_by_id(self, extractor, video_id):
+        """Return archive rows for a yt-dlp extractor and video ID."""
+        if not extractor or not video_id:
+            return []
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT * FROM downloads"
+                " WHERE video_id = ? AND extractor = ? COLLATE NOCASE",
+                (video_id, extractor),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    @staticmethod
+    def _is_present(row, out_dir=None):
+        if not row["path"]:
+            # gallery-dl downloads and imported yt-dlp entries have no file to check
+            return True
+        path = Path(row["path"])
+        if not path.is_file():
+            return False
+        return out_dir is None or path.resolve().is_relative_to(Path(out_dir).resolve())
+
+    def is_downloaded(self, url, out_dir=None, extractor="", video_id=""):
+        """Whether a URL (or its extractor ID) should be skipped.
+
+        A row with a recorded file only counts while that file exists and,
+        when out_dir is given, lies under it; rows without a file count as-is.
+        """
+        row = self.get(url)
+        rows = ([row] if row else []) + self.get_by_id(extractor, video_id)
+        return any(self._is_present(r, out_dir) for r in rows)
+
+    def existing_path(self, url):
+        """Return the recorded file for a URL if it is still on disk."""
+        row = self.get(url)
+        if row and row["path"]:
+            path = Path(row["path"])
+            if path.is_file():
+                return path
+        return None
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM downloads").fetchone()[0]
+
+    def record(self, url, path=None, extractor="", video_id=""):
+        """Record a successful download (or a file found on disk)."""
+        size = mtime = None
+        if path:
+            try:
+                st = Path(path).stat()
+                size, mtime = st.st_size, st.st_mtime
+            except OSError:
+                pass
+        with self.lock, self.conn:
+            self.conn.execute(
+                """INSERT INTO downloads
+                    (url, extractor, video_id, path, size, mtime, downloaded_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    extractor = COALESCE(NULLIF(excluded.extractor, ''), extractor),
+                    video_id = COALESCE(NULLIF(excluded.video_id, ''), video_id),
+                    path = COALESCE(NULLIF(excluded.path, ''), path),
+                    size = COALESCE(excluded.size, size),
+                    mtime = COALESCE(excluded.mtime, mtime)""",
+                (
+                    canonical_url(url),
+                    extractor or "",
+                    video_id or "",
+                    os.path.abspath(path) if path else "",
+                    size,
+                    mtime,
+                    time.time(),
+                ),
+            )
+
+    def record_printed(self, lines, source_urls=()):
+        """Record downloads from ARCHIVE_PRINT_TEMPLATE output lines.
+
+        When a single source URL produced a single file, the source URL is
+        recorded too so it matches even if yt-dlp reports a different
+        webpage_url (redirects, short links).
+        """
+        entries = []
+        for line in lines:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) != 4 or not fields[3]:
+                continue
+            webpage_url, extractor, video_id, filepath = fields
+            entries.append((webpage_url, extractor, video_id, filepath))
+            self.record(webpage_url, filepath, extractor, video_id)
+        if len(source_urls) == 1 and len(entries) == 1:
+            _, extractor, video_id, filepath = entries[0]
+            self.record(source_urls[0], filepath, extractor, video_id)
+        return entries
+
+    def export_ytdlp(self, file):
+        """Write entries with an extractor ID in yt-dlp --download-archive format."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT DISTINCT lower(extractor), video_id FROM downloads"
+                " WHERE extractor != '' AND video_id != ''"
+                " ORDER BY downloaded_at"
+            ).fetchall()
+        with open(file, "w") as f:
+            for extractor, video_id in rows:
+                f.write(f"{extractor} {video_id}\n")
+        return len(rows)
+
+    def ytdlp_archive_file(self):
+        """Path to a yt-dlp --download-archive file of the file-less ID entries.
+
+        Lets yt-dlp skip imported entries by ID before downloading, however
+        the URL is spelled. Written once per process and removed at exit.
+        """
+        with self.lock:
+            if self.ytdlp_file is None:
+                rows = self.conn.execute(
+                    "SELECT DISTINCT lower(extractor), video_id FROM downloads"
+                    " WHERE path = '' AND extractor != '' AND video_id != ''"
+                ).fetchall()
+                fd, self.ytdlp_file = tempfile.mkstemp(
+                    prefix="giffer-archive-", suffix=".txt"
+                )
+                with os.fdopen(fd, "w") as f:
+                    for extractor, video_id in rows:
+                        f.write(f"{extractor} {video_id}\n")
+                atexit.register(os.unlink, self.ytdlp_file)
+            return self.ytdlp_file
+
+    def import_ytdlp(self, file):
+        """Add entries from a yt-dlp --download-archive file, returning the new count."""
+        count = 0
+        with open(file) as f, self.lock, self.conn:
+            for line in f:
+                fields = line.split(None, 1)
+                if len(fields) != 2:
+                    continue
+                extractor, video_id = fields[0], fields[1].strip()
+                # No URL is known; key the row by its archive ID
+                count += self.conn.execute(
+                    "INSERT OR IGNORE INTO downloads"
+                    " (url, extractor, video_id, downloaded_at) VALUES (?, ?, ?, ?)",
+                    (f"ytdl-archive:{extractor}:{video_id}", extractor, video_id, 0),
+                ).rowcount
+        return count
+
+
+def open_archive(path=DEFAULT_ARCHIVE):
+    """Open the download archive, or return None (with a warning) if unusable."""
+    try:
+        return DownloadArchive(path)
+    except (OSError, sqlite3.Error) as e:
+        click.echo(f"Warning: download archive unavailable ({path}): {e}", err=True)
+        return None
+
+
+def run_yt_dlp_recorded(args, archive, source_urls=()):
+    """Run yt-dlp, recording every moved file in the archive.
+
+    Uses --print-to-file so yt-dlp's normal output is unchanged.
+    """
+    if archive is None:
+        return run_yt_dlp(args)
+    fd, print_file = tempfile.mkstemp(prefix="giffer-", suffix=".tsv")
+    os.close(fd)
+    try:
+        result = run_yt_dlp(
+            [
+                "--download-archive",
+                archive.ytdlp_archive_file(),
+                "--print-to-file",
+                ARCHIVE_PRINT_TEMPLATE,
+                print_file,
+            ]
+            + list(args)
+        )
+        with open(print_file) as f:
+            archive.record_printed(f.readlines(), source_urls)
+    finally:
+        os.unlink(print_file)
+    return result
+
+
 def get_output_dir(output_dir: str | None, create: bool = True) -> Path:
     """Get output directory path, creating it if needed."""
     if output_dir:
@@ -139,6 +433,138 @@ def get_video_duration(file_path):
     return float(result.stdout.strip())
 
 
+def default_split_jobs():
+    return os.cpu_count() or 1
+
+
+def run_ffmpeg(cmd, slots=None):
+    """Run an ffmpeg command, holding one of the CPU budget slots if given."""
+    if slots is None:
+        return subprocess.run(cmd, capture_output=True, text=True)
+    with slots:
+        return subprocess.run(cmd, capture_output=True, text=True)
+
+
+def segment_with_muxer(
+    input_path, out_dir, segment_duration, skip_start, skip_end, total_duration, slots
+):
+    """Stream-copy all segments in one ffmpeg pass with the segment muxer.
+
+    Returns [(path, start, duration)] relative to the source, or None on failure.
+    """
+    # The muxer expands % anywhere in the path, not just in the file name
+    prefix = str(out_dir / input_path.stem).replace("%", "%%")
+    suffix = input_path.suffix.replace("%", "%%")
+    pattern = f"{prefix}_part%03d{suffix}"
+    fd, segment_list = tempfile.mkstemp(prefix="giffer-segments-", suffix=".csv")
+    os.close(fd)
+
+    cmd = ["ffmpeg", "-y"]
+    if skip_start:
+        cmd.extend(["-ss", str(skip_start)])
+    cmd.extend(["-i", str(input_path)])
+    if total_duration is not None:
+        cmd.extend(["-t", str(total_duration - skip_end - skip_start)])
+    cmd.extend(
+        [
+            "-c",
+            "copy",
+            "-avoid_negative_ts",
+            "1",
+            "-f",
+            "segment",
+            "-segment_time",
+            str(segment_duration),
+            "-segment_start_number",
+            "1",
+            "-reset_timestamps",
+            "1",
+            "-segment_list",
+            segment_list,
+            "-segment_list_type",
+            "csv",
+            pattern,
+        ]
+    )
+
+    try:
+        result = run_ffmpeg(cmd, slots)
+        if result.returncode != 0:
+            click.echo(f"Segment muxer failed: {result.stderr.strip()}", err=True)
+            return None
+        segments = []
+        with open(segment_list) as f:
+            for row in csv.reader(f):
+                if len(row) < 3:
+                    continue
+                seg_start, seg_end = float(row[1]), float(row[2])
+                segments.append(
+                    (out_dir / row[0], skip_start + seg_start, seg_end - seg_start)
+                )
+        return segments
+    finally:
+        os.unlink(segment_list)
+
+
+def segment_in_parallel(
+    input_path,
+    out_dir,
+    segment_duration,
+    effective_start,
+    effective_end,
+    reencode,
+    slots,
+):
+    """Cut each segment with its own ffmpeg process, several at a time.
+
+    Used when re-encoding (exact cuts) or when the segment muxer fails.
+    Returns [(path, start, duration)], or None if any segment failed.
+    """
+    jobs = []
+    start_time = effective_start
+    index = 1
+    while start_time < effective_end:
+        duration = min(segment_duration, effective_end - start_time)
+        output_file = out_dir / f"{input_path.stem}_part{index:03d}{input_path.suffix}"
+        jobs.append((output_file, start_time, duration))
+        start_time += segment_duration
+        index += 1
+
+    workers = max(1, min(len(jobs), default_split_jobs()))
+    if reencode:
+        # Share the cores between the encoders running side by side
+        threads = max(1, default_split_jobs() // workers)
+        codec = ["-c:v", "libx264", "-c:a", "aac", "-threads", str(threads)]
+    else:
+        codec = ["-c", "copy", "-avoid_negative_ts", "1"]
+
+    def cut(job):
+        output_file, start, duration = job
+        cmd = [
+            "ffmpeg",
+            "-y",
+            "-ss",
+            str(start),
+            "-i",
+            str(input_path),
+            "-t",
+            str(duration),
+            *codec,
+            str(output_file),
+        ]
+        result = run_ffmpeg(cmd, slots)
+        if result.returncode != 0:
+            click.echo(
+                f"Error creating segment {output_file.name}: {result.stderr}", err=True
+            )
+        return result.returncode == 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(cut, jobs))
+
+    return jobs if all(results) else None
+
+
 def split_single_video(
     input_file,
     segment_duration,
@@ -146,28 +572,36 @@ def split_single_video(
     skip_end=0,
     output_dir=None,
     cleanup=False,
+    reencode=False,
+    slots=None,
 ):
-    """Split a video file into segments"""
+    """Split a video file into segments.
+
+    Stream copies go through one ffmpeg segment-muxer pass (cuts land on
+    keyframes); --reencode cuts each segment exactly in parallel workers.
+    ffprobe is only needed to validate skip values against the total
+    duration, or for the per-segment path.
+    """
     input_path = Path(input_file)
 
     if not input_path.exists():
         click.echo(f"Error: File not found: {input_file}", err=True)
         return False
 
-    total_duration = get_video_duration(input_path)
-    if total_duration is None:
-        return False
-
-    effective_start = skip_start
-    effective_end = total_duration - skip_end
-    effective_duration = effective_end - effective_start
+    if slots is None:
+        slots = threading.BoundedSemaphore(default_split_jobs())
 
-    if effective_duration <= 0:
-        click.echo(
-            f"Error: Skip values exceed video duration ({format_duration(total_duration)})",
-            err=True,
-        )
-        return False
+    total_duration = None
+    if skip_start or skip_end or reencode:
+        total_duration = get_video_duration(input_path)
+        if total_duration is None:
+            return False
+        if total_duration - skip_end - skip_start <= 0:
+            click.echo(
+                f"Error: Skip values exceed video duration ({format_duration(total_duration)})",
+                err=True,
+            )
+            return False
 
     if output_dir:
         out_dir = Path(output_dir)
@@ -175,56 +609,68 @@ def split_single_video(
     else:
         out_dir = input_path.parent
 
-    num_segments = int(effective_duration // segment_duration)
-    if effective_duration % segment_duration > 0:
-        num_segments += 1
-
     click.echo(
-        f"Splitting {input_path.name} into {num_segments} segments of {format_duration(segment_duration)} each"
+        f"Splitting {input_path.name} into segments of {format_duration(segment_duration)} each"
+        f" ({'re-encode' if reencode else 'stream copy'})"
     )
-    click.echo(f"  Total duration: {format_duration(total_duration)}")
+    if total_duration is not None:
+        click.echo(f"  Total duration: {format_duration(total_duration)}")
     click.echo(
         f"  Skip start: {format_duration(skip_start)}, Skip end: {format_duration(skip_end)}"
     )
-    click.echo(f"  Effective duration: {format_duration(effective_duration)}")
-
-    stem = input_path.stem
-    suffix = input_path.suffix
-
-    for i in range(num_segments):
-        start_time = effective_start + (i * segment_duration)
-        if i == num_segments - 1:
-            duration = effective_end - start_time
-        else:
-            duration = segment_duration
-
-        output_file = out_dir / f"{stem}_part{i + 1:03d}{suffix}"
-
-        cmd = [
-            "ffmpeg",
-            "-y",
-            "-ss",
-            str(start_time),
-            "-i",
-            str(input_path),
-            "-t",
-            str(duration),
-            "-c",
-            "copy",
-            "-avoid_negative_ts",
-            "1",
-            str(output_file),
-        ]
-
-        click.echo(
-            f"  Creating {output_file.name} (start: {format_duration(start_time)}, duration: {format_duration(duration)})"
+    if total_duration is not None:
+        effective_duration = total_duration - skip_start - skip_end
+        click.echo(f"  Effective duration: {format_duration(effective_duration)}")
+
+    segments = None
+    if not reencode:
+        segments = segment_with_muxer(
+            input_path,
+            out_dir,
+            segment_duration,
+            skip_start,
+            skip_end,
+            total_duration,
+            slots,
         )
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            click.echo(f"Error creating segment: {result.stderr}", err=True)
+        if segments is not None and not segments:
+            click.echo(
+                "Error: No segments created (skip values may exceed video duration)",
+                err=True,
+            )
+            return False
+        if segments is None:
+            click.echo("Falling back to per-segment ffmpeg processes", err=True)
+
+    if segments is None:
+        if total_duration is None:
+            total_duration = get_video_duration(input_path)
+            if total_duration is None:
+                return False
+        effective_end = total_duration - skip_end
+        if effective_end - skip_start <= 0:
+            click.echo(
+                f"Error: Skip values exceed video duration ({format_duration(total_duration)})",
+                err=True,
+            )
+            return False
+        segments = segment_in_parallel(
+            input_path,
+            out_dir,
+            segment_duration,
+            skip_start,
+            effective_end,
+            reencode,
+            slots,
+        )
+        if segments is None:
             return False
 
-    click.echo(f"Successfully created {num_segments} segments")
+    for output_file, start_time, duration in segments:
+        click.echo(
+            f"  Created {output_file.name} (start: {format_duration(start_time)}, duration: {format_duration(duration)})"
+        )
+    click.echo(f"Successfully created {len(segments)} segments")
 
     if cleanup:
         input_path.unlink()
@@ -242,17 +688,33 @@ def split_path(
     cleanup=False,
     recursive=True,
     extensions=None,
+    reencode=False,
+    jobs=None,
 ):
-    """Split video file(s) - handles both single files and directories"""
+    """Split video file(s) - handles both single files and directories.
+
+    Directories are split several files at a time; `jobs` (default: CPU
+    count) caps the ffmpeg processes running at once across all files.
+    """
     input_path = Path(path)
 
     if not input_path.exists():
         click.echo(f"Error: Path not found: {path}", err=True)
         return False
 
+    jobs = jobs or default_split_jobs()
+    slots = threading.BoundedSemaphore(jobs)
+
     if input_path.is_file():
         return split_single_video(
-            input_path, segment_duration, skip_start, skip_end, output_dir, cleanup
+            input_path,
+            segment_duration,
+            skip_start,
+            skip_end,
+            output_dir,
+            cleanup,
+            reencode,
+            slots,
         )
 
     if extensions is None:
@@ -274,17 +736,24 @@ def split_path(
         click.echo(f"No video files found in {path}")
         return True
 
-    click.echo(f"Found {len(files)} video file(s) to process")
+    click.echo(f"Found {len(files)} video file(s) to process with {jobs} job(s)")
 
-    success = True
-    for video_file in sorted(files):
+    def process_one(video_file):
         click.echo(f"\nProcessing: {video_file}")
-        if not split_single_video(
-            video_file, segment_duration, skip_start, skip_end, cleanup=cleanup
-        ):
-            success = False
+        return split_single_video(
+            video_file,
+            segment_duration,
+            skip_start,
+            skip_end,
+            cleanup=cleanup,
+            reencode=reencode,
+            slots=slots,
+        )
 
-    return success
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        results = list(executor.map(process_one, sorted(files)))
+
+    return all(results)
 
 
 def detect_extension(file_path):
@@ -342,7 +811,13 @@ def run_gallery_dl(args):
 
 
 def download_with_split(
-    url, segment_duration, skip_start=0, skip_end=0, output_dir=None, extra_args=None
+    url,
+    segment_duration,
+    skip_start=0,
+    skip_end=0,
+    output_dir=None,
+    extra_args=None,
+    reencode=False,
 ):
     """Download video using yt-dlp and split into segments"""
     out_dir = get_output_dir(output_dir)
@@ -391,6 +866,7 @@ def download_with_split(
             skip_end,
             output_dir,
             cleanup=True,
+            reencode=reencode,
         ):
             success = False
 
@@ -421,7 +897,7 @@ def remove_url_from_file(url_to_remove, url_file):
 
 
 def batch_download_single(
-    url, output_dir, embed_subs=True, max_height=DEFAULT_MAX_HEIGHT
+    url, output_dir, embed_subs=True, max_height=DEFAULT_MAX_HEIGHT, archive=None
 ):
     """Download a single URL with yt-dlp, falling back to gallery-dl. Returns (url, success)."""
     out_dir = get_output_dir(output_dir)
@@ -445,13 +921,15 @@ def batch_download_single(
         ]
     )
 
-    result = run_yt_dlp(cmd_args)
+    result = run_yt_dlp_recorded(cmd_args, archive, [url])
     if result.returncode == 0:
         fix_unknown_extensions(out_dir, existing_files)
         return (url, True)
 
     gallery_args = ["-d", str(out_dir), url]
     gallery_result = run_gallery_dl(gallery_args)
+    if gallery_result.returncode == 0 and archive is not None:
+        archive.record(url)
     return (url, gallery_result.returncode == 0)
 
 
@@ -462,6 +940,7 @@ def batch_download_impl(
     max_height=DEFAULT_MAX_HEIGHT,
     workers=1,
     clean_list=False,
+    archive=None,
 ):
     """Download videos from a list file"""
     if url_file is None:
@@ -484,16 +963,36 @@ def batch_download_impl(
         return True
 
     total_count = len(urls)
-    click.echo(f"Processing {total_count} URLs with {workers} worker(s)")
+    archived = 0
+    if archive is not None:
+        pending = []
+        out_dir = get_output_dir(output_dir, create=False)
+        for url in urls:
+            if archive.is_downloaded(url, out_dir):
+                archived += 1
+                if clean_list:
+                    remove_url_from_file(url, url_file)
+            else:
+                pending.append(url)
+        if archived:
+            click.echo(f"Skipping {archived} URL(s) already in the download archive")
+        urls = pending
+
+    click.echo(f"Processing {len(urls)} URLs with {workers} worker(s)")
 
     if workers > 1:
-        success_count = 0
+        success_count = archived
         failed_urls = []
 
         with ThreadPoolExecutor(max_workers=workers) as executor:
             futures = {
                 executor.submit(
-                    batch_download_single, url, output_dir, embed_subs, max_height
+                    batch_download_single,
+                    url,
+                    output_dir,
+                    embed_subs,
+                    max_height,
+                    archive,
                 ): url
                 for url in urls
             }
@@ -515,10 +1014,12 @@ def batch_download_impl(
         )
         return len(failed_urls) == 0
     else:
-        success_count = 0
+        success_count = archived
         for url in urls:
             click.echo(f"Downloading: {url}")
-            _, success = batch_download_single(url, output_dir, embed_subs, max_height)
+            _, success = batch_download_single(
+                url, output_dir, embed_subs, max_height, archive
+            )
             if success:
                 click.echo(f"Successfully downloaded: {url}")
                 if clean_list:
@@ -574,21 +1075,103 @@ def extract_urls_from_page(page_url, pattern):
 
 
 def get_playlist_urls(url):
-    """Extract individual video URLs from a playlist using yt-dlp"""
-    cmd = ["yt-dlp", "--flat-playlist", "--print", "url", url]
+    """Extract (url, extractor, video id) of each playlist entry using yt-dlp"""
+    cmd = ["yt-dlp", "--flat-playlist", "--print", "%(url)s\t%(ie_key)s\t%(id)s", url]
     result = subprocess.run(cmd, capture_output=True, text=True)
     if result.returncode != 0:
         return None
-    urls = [line.strip() for line in result.stdout.strip().split("\n") if line.strip()]
-    return urls if urls else None
+    entries = []
+    for line in result.stdout.strip().split("\n"):
+        fields = line.strip().split("\t")
+        if fields[0]:
+            fields += [""] * (3 - len(fields))
+            entries.append(tuple("" if f == "NA" else f for f in fields[:3]))
+    return entries if entries else None
+
+
+class MetadataProbe:
+    """Batched yt-dlp metadata lookups, cached by URL.
+
+    One `yt-dlp --dump-json --no-download` process handles up to batch_size
+    URLs; entries are parsed as they stream in and matched back to the
+    requested URL via original_url. URLs yt-dlp can't handle are cached as
+    None so callers fall back to gallery-dl without re-probing yt-dlp.
+    """
+
+    def __init__(self, batch_size=DEFAULT_PROBE_BATCH):
+        self.batch_size = batch_size
+        self.cache = {}
+        self.lock = threading.Lock()
+
+    def _run_batch(self, urls):
+        cmd = [
+            "yt-dlp",
+            "--dump-json",
+            "--no-download",
+            "--ignore-errors",
+            "--no-warnings",
+            "-o",
+            "%(title)s.%(ext)s",
+            *urls,
+        ]
+        proc = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        )
+        wanted = set(urls)
+        for line in proc.stdout:
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            url = data.get("original_url")
+            if url not in wanted:
+                url = data.get("webpage_url")
+            if url not in wanted:
+                continue
+            info = {
+                "title": data.get("title") or "",
+                "filename": data.get("filename") or data.get("_filename"),
+                "id": data.get("id") or "",
+                "extractor": data.get("extractor_key") or "",
+            }
+            with self.lock:
+                # Playlists yield several entries; keep the first like --print did
+                self.cache.setdefault(url, info)
+        proc.wait()
+        with self.lock:
+            for url in urls:
+                self.cache.setdefault(url, None)
+
+    def probe(self, urls, workers=1):
+        """Fetch metadata for every uncached URL, batch_size URLs per process."""
+        with self.lock:
+            pending = list(dict.fromkeys(u for u in urls if u not in self.cache))
+        if pending:
+            batches = [
+                pending[i : i + self.batch_size]
+                for i in range(0, len(pending), self.batch_size)
+            ]
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+                list(executor.map(self._run_batch, batches))
+        with self.lock:
+            return {url: self.cache.get(url) for url in urls}
+
+    def get(self, url):
+        """Return cached metadata for a URL, probing it alone on a miss."""
+        with self.lock:
+            if url in self.cache:
+                return self.cache[url]
+        return self.probe([url])[url]
+
+
+_probe = MetadataProbe()
 
 
 def get_title(url):
     """Get media title using yt-dlp, fallback to gallery-dl"""
-    cmd = ["yt-dlp", "--print", "title", "--no-download", url]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode == 0 and result.stdout.strip():
-        return result.stdout.strip()
+    info = _probe.get(url)
+    if info and info["title"]:
+        return info["title"]
 
     cmd = ["gallery-dl", "--dump-json", url]
     result = subprocess.run(cmd, capture_output=True, text=True)
@@ -613,18 +1196,9 @@ def get_title(url):
 def find_existing_file_by_url(url, search_dirs):
     """Find an existing downloaded file by checking yt-dlp or gallery-dl's expected filename"""
     # Try yt-dlp first
-    cmd = [
-        "yt-dlp",
-        "--print",
-        "filename",
-        "-o",
-        "%(title)s.%(ext)s",
-        "--no-download",
-        url,
-    ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode == 0 and result.stdout.strip():
-        expected_filename = result.stdout.strip()
+    info = _probe.get(url)
+    if info and info["filename"]:
+        expected_filename = info["filename"]
         for search_dir in search_dirs:
             candidate = Path(search_dir) / expected_filename
             if candidate.exists():
@@ -669,18 +1243,9 @@ def build_filename_index(search_dirs):
 
 def get_expected_filename(url):
     """Get expected filename for a URL without downloading."""
-    cmd = [
-        "yt-dlp",
-        "--print",
-        "filename",
-        "-o",
-        "%(title)s.%(ext)s",
-        "--no-download",
-        url,
-    ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode == 0 and result.stdout.strip():
-        return result.stdout.strip()
+    info = _probe.get(url)
+    if info and info["filename"]:
+        return info["filename"]
     return None
 
 
@@ -695,6 +1260,7 @@ def move_or_download_for_page(
     skip_start=0,
     skip_end=0,
     page_width=1,
+    archive=None,
 ):
     """Move existing file to correct page dir or download if not found. Returns (url, success)"""
     base_dir = get_output_dir(base_output_dir, create=False)
@@ -703,22 +1269,35 @@ def move_or_download_for_page(
     page_dir = base_dir / page_name
     page_dir.mkdir(parents=True, exist_ok=True)
 
-    existing_file = find_existing_file_by_url(url, all_page_dirs + [base_dir])
+    existing_file = archive.existing_path(url) if archive is not None else None
+    if existing_file is None:
+        existing_file = find_existing_file_by_url(url, all_page_dirs + [base_dir])
 
     if existing_file:
         target_path = page_dir / existing_file.name
-        if existing_file.parent == page_dir:
+        if existing_file.parent.resolve() == page_dir.resolve():
             click.echo(f"[SKIP] Already in correct location: {existing_file.name}")
+            if archive is not None:
+                archive.record(url, existing_file)
             return (url, True)
         else:
             shutil.move(str(existing_file), str(target_path))
             click.echo(
                 f"[MOVE] {existing_file.parent.name}/{existing_file.name} -> {page_name}/"
             )
+            if archive is not None:
+                archive.record(url, target_path)
             return (url, True)
 
     return download_single_video(
-        url, str(page_dir), max_height, split, segment_duration, skip_start, skip_end
+        url,
+        str(page_dir),
+        max_height,
+        split,
+        segment_duration,
+        skip_start,
+        skip_end,
+        archive,
     )
 
 
@@ -730,6 +1309,7 @@ def download_single_video(
     segment_duration=DEFAULT_SEGMENT_DURATION,
     skip_start=0,
     skip_end=0,
+    archive=None,
 ):
     """Download a single video and optionally split it, returns (url, success)"""
     out_dir = get_output_dir(output_dir)
@@ -741,7 +1321,7 @@ def download_single_video(
         "-o",
         output_template,
         "--print",
-        "after_move:filepath",
+        ARCHIVE_PRINT_TEMPLATE,
         url,
     ]
 
@@ -749,15 +1329,20 @@ def download_single_video(
     downloaded_file = None
 
     if result.returncode == 0:
-        downloaded_file = result.stdout.strip().split("\n")[-1]
+        printed = result.stdout.strip().split("\n")[-1]
+        downloaded_file = printed.split("\t")[-1]
         if downloaded_file and not Path(downloaded_file).exists():
             downloaded_file = None
+        elif downloaded_file and archive is not None:
+            archive.record_printed([printed], [url])
 
     # Fallback to gallery-dl if yt-dlp failed
     if downloaded_file is None:
         gallery_args = ["-d", str(out_dir), url]
         gallery_result = run_gallery_dl(gallery_args)
         if gallery_result.returncode == 0:
+            if archive is not None:
+                archive.record(url)
             return (url, True)
         return (url, False)
 
@@ -795,18 +1380,22 @@ def scrape_and_download_impl(
     url_exclude=None,
     split_pages=False,
     search_dirs=None,
+    archive=None,
+    prefetch_pages=2,
 ):
-    """Scrape and download page by page"""
+    """Scrape and download as a pipeline.
+
+    A crawler thread fetches pages into a bounded queue (at most
+    prefetch_pages ahead), the metadata stage filters each page's URLs and
+    a shared pool of `workers` downloads them, so slow videos on one page
+    don't hold up the next.
+    """
     if pattern is None:
         pattern = SITE_CONFIGS["3"]["pattern"]
     if pagination is None:
         pagination = SITE_CONFIGS["3"]["pagination"]
 
     seen = set()
-    page = start_page
-    total_success = 0
-    total_failed = 0
-
     base_dir = get_output_dir(output_dir, create=False)
 
     # Disable split_pages if only 1 page requested
@@ -863,10 +1452,16 @@ def scrape_and_download_impl(
         if cleaned:
             click.echo(f"Cleaned up {cleaned} duplicate(s)")
 
-        # Build filename index after cleanup
-        click.echo(f"Building filename index from {len(search_dirs)} search dir(s)...")
-        filename_index = build_filename_index(search_dirs)
-        click.echo(f"Indexed {len(filename_index)} existing files")
+    def get_filename_index():
+        # Built lazily: runs where every URL is in the archive never walk search dirs
+        nonlocal filename_index
+        if filename_index is None:
+            click.echo(
+                f"Building filename index from {len(search_dirs)} search dir(s)..."
+            )
+            filename_index = build_filename_index(search_dirs)
+            click.echo(f"Indexed {len(filename_index)} existing files")
+        return filename_index
 
     click.echo(f"Scraping and downloading from {base_url}")
     page_range = f"{start_page}-{end_page}" if end_page else f"{start_page}-∞"
@@ -875,34 +1470,99 @@ def scrape_and_download_impl(
     if split:
         click.echo(f"  Segment duration: {format_duration(segment_duration)}")
     click.echo(f"Split by pages: {'enabled' if split_pages else 'disabled'}")
-    click.echo(f"Workers: {workers}\n")
-
-    while True:
+    click.echo(f"Workers: {workers}, prefetch pages: {prefetch_pages}\n")
+
+    pages = queue.Queue(maxsize=max(1, prefetch_pages))
+    lock = threading.Lock()
+    stats = {
+        "pages": 0,
+        "found": 0,
+        "new": 0,
+        "archived": 0,
+        "filtered": 0,
+        "skipped": 0,
+        "queued": 0,
+        "success": 0,
+        "failed": 0,
+    }
+    # page -> [remaining, successful, total]
+    page_progress = {}
+
+    def page_url_for(page):
         if page == 1:
-            page_url = base_url.rstrip("/")
-        else:
-            page_url = base_url.rstrip("/") + pagination.format(page=page)
-
-        click.echo(f"=== Page {page}: {page_url} ===")
-        urls, redirected = extract_urls_from_page(page_url, pattern)
+            return base_url.rstrip("/")
+        return base_url.rstrip("/") + pagination.format(page=page)
 
-        if redirected:
-            click.echo("Page redirected (page doesn't exist), stopping\n")
-            break
-
-        if not urls:
-            click.echo("No URLs found, stopping\n")
-            break
-
-        new_urls = [url for url in urls if url not in seen]
-        for url in new_urls:
-            seen.add(url)
+    def crawl():
+        """Crawler stage: fetch pages ahead of the downloads, dedup against `seen`."""
+        page = start_page
+        try:
+            while True:
+                page_url = page_url_for(page)
+                click.echo(f"[crawl] Page {page}: {page_url}")
+                urls, redirected = extract_urls_from_page(page_url, pattern)
 
-        click.echo(f"Found {len(urls)} URLs, {len(new_urls)} new")
+                if redirected:
+                    click.echo(
+                        f"[crawl] Page {page} redirected (page doesn't exist), stopping"
+                    )
+                    break
+
+                if not urls:
+                    click.echo(f"[crawl] Page {page}: no URLs found, stopping")
+                    break
+
+                new_urls = []
+                for url in urls:
+                    if url not in seen:
+                        seen.add(url)
+                        new_urls.append(url)
+
+                with lock:
+                    stats["pages"] += 1
+                    stats["found"] += len(urls)
+                    stats["new"] += len(new_urls)
+                click.echo(
+                    f"[crawl] Page {page}: found {len(urls)} URLs, {len(new_urls)} new"
+                )
+                pages.put((page, new_urls))
+
+                if end_page and page >= end_page:
+                    break
+                page += 1
+        finally:
+            pages.put(None)
+
+    def select(page, new_urls):
+        """Metadata stage: drop archived, filtered and already-present URLs."""
+        if archive is not None and new_urls:
+            pending = []
+            archived = 0
+            for url in new_urls:
+                if not archive.is_downloaded(url, base_dir):
+                    pending.append(url)
+                    continue
+                # Known files outside their page dir still go through the move path
+                existing = archive.existing_path(url) if split_pages else None
+                page_dir = (base_dir / f"page-{page:0{page_width}d}").resolve()
+                if existing is not None and existing.parent.resolve() != page_dir:
+                    pending.append(url)
+                else:
+                    archived += 1
+            if archived:
+                click.echo(
+                    f"[meta] Page {page}: skipped {archived} URL(s) already in the"
+                    " download archive"
+                )
+                with lock:
+                    stats["archived"] += archived
+            new_urls = pending
 
         if (url_filter or url_exclude) and new_urls:
-            click.echo("Fetching titles for filtering...")
+            click.echo(f"[meta] Page {page}: fetching titles for filtering...")
+            _probe.probe(new_urls, workers)
             url_titles = {}
+            # Only URLs yt-dlp couldn't resolve still spawn (gallery-dl) here
             with ThreadPoolExecutor(max_workers=workers) as executor:
                 futures = {executor.submit(get_title, url): url for url in new_urls}
                 for future in as_completed(futures):
@@ -910,6 +1570,7 @@ def scrape_and_download_impl(
                     title = future.result()
                     url_titles[url] = title or ""
 
+            before_filter = len(new_urls)
             if url_filter:
                 filter_re = re.compile(url_filter, re.IGNORECASE)
                 before_count = len(new_urls)
@@ -917,7 +1578,8 @@ def scrape_and_download_impl(
                     url for url in new_urls if filter_re.search(url_titles.get(url, ""))
                 ]
                 click.echo(
-                    f"Filter '{url_filter}': {before_count} -> {len(new_urls)} URLs"
+                    f"[meta] Page {page}: filter '{url_filter}':"
+                    f" {before_count} -> {len(new_urls)} URLs"
                 )
 
             if url_exclude:
@@ -929,109 +1591,185 @@ def scrape_and_download_impl(
                     if not exclude_re.search(url_titles.get(url, ""))
                 ]
                 click.echo(
-                    f"Exclude '{url_exclude}': {before_count} -> {len(new_urls)} URLs"
+                    f"[meta] Page {page}: exclude '{url_exclude}':"
+                    f" {before_count} -> {len(new_urls)} URLs"
                 )
-
-        click.echo(f"Processing {len(new_urls)} URLs\n")
-
-        if filename_index and new_urls:
-            urls_to_download = []
+            with lock:
+                stats["filtered"] += before_filter - len(new_urls)
+
+        to_probe = new_urls
+        if archive is not None:
+            to_probe = [
+                url for url in new_urls if not archive.is_downloaded(url, base_dir)
+            ]
+        if search_dirs and to_probe and get_filename_index():
+            urls_to_download = [url for url in new_urls if url not in to_probe]
             skipped = 0
-            with ThreadPoolExecutor(max_workers=workers) as executor:
-                futures = {
-                    executor.submit(get_expected_filename, url): url for url in new_urls
-                }
-                for future in as_completed(futures):
-                    url = futures[future]
-                    expected = future.result()
-                    if expected and expected in filename_index:
-                        click.echo(f"[SKIP] Already exists: {filename_index[expected]}")
-                        skipped += 1
-                    else:
-                        urls_to_download.append(url)
+            _probe.probe(to_probe, workers)
+            for url in to_probe:
+                expected = get_expected_filename(url)
+                if expected and expected in filename_index:
+                    click.echo(f"[SKIP] Already exists: {filename_index[expected]}")
+                    if archive is not None:
+                        archive.record(url, filename_index[expected])
+                    skipped += 1
+                else:
+                    urls_to_download.append(url)
             if skipped:
                 click.echo(
-                    f"Skipped {skipped} existing, downloading {len(urls_to_download)}\n"
+                    f"[meta] Page {page}: skipped {skipped} existing,"
+                    f" downloading {len(urls_to_download)}"
                 )
+                with lock:
+                    stats["skipped"] += skipped
             new_urls = urls_to_download
 
-        if new_urls:
-            page_success = 0
-            page_failed = []
+        if archive is not None and new_urls:
+            # Probed URLs can also match by extractor ID (e.g. imported entries)
+            with _probe.lock:
+                probed = {url: _probe.cache.get(url) for url in new_urls}
+            known = [
+                url
+                for url, info in probed.items()
+                if info
+                and archive.is_downloaded(url, base_dir, info["extractor"], info["id"])
+            ]
+            if known:
+                click.echo(
+                    f"[meta] Page {page}: skipped {len(known)} URL(s) whose video"
+                    " ID is in the download archive"
+                )
+                with lock:
+                    stats["archived"] += len(known)
+                new_urls = [url for url in new_urls if url not in known]
+
+        if split_pages and new_urls:
+            # move_or_download_for_page looks for an earlier copy by filename
+            _probe.probe(
+                [
+                    url
+                    for url in new_urls
+                    if archive is None or archive.existing_path(url) is None
+                ],
+                workers,
+            )
+
+        return new_urls
+
+    # Bounds queued downloads so the crawler can't run arbitrarily far ahead
+    slots = threading.BoundedSemaphore(workers * 2)
+
+    def finished(page, url, future):
+        """Download stage: report each result and each page as it completes."""
+        slots.release()
+        try:
+            _, success = future.result()
+        except Exception as e:
+            click.echo(f"[download] Error downloading {url}: {e}", err=True)
+            success = False
+        with lock:
+            progress = page_progress[page]
+            progress[0] -= 1
+            if success:
+                progress[1] += 1
+                stats["success"] += 1
+                done = stats["success"] + stats["failed"]
+                click.echo(f"[download] [{done}/{stats['queued']}] Completed: {url}")
+            else:
+                stats["failed"] += 1
+                click.echo(f"[download] [FAILED] {url}")
+            if progress[0] == 0:
+                click.echo(
+                    f"[download] Page {page} done: {progress[1]}/{progress[2]} successful"
+                )
+
+    crawler = threading.Thread(target=crawl, daemon=True)
+    crawler.start()
+
+    with ThreadPoolExecutor(max_workers=workers) as downloads:
+        while True:
+            item = pages.get()
+            if item is None:
+                break
+            page, new_urls = item
+            new_urls = select(page, new_urls)
+            click.echo(f"[meta] Page {page}: queueing {len(new_urls)} URLs")
+            if not new_urls:
+                continue
+
+            with lock:
+                page_progress[page] = [len(new_urls), 0, len(new_urls)]
+                stats["queued"] += len(new_urls)
 
             if split_pages:
                 page_dir = base_dir / f"page-{page:0{page_width}d}"
                 if page_dir not in all_page_dirs:
                     all_page_dirs.append(page_dir)
 
-                with ThreadPoolExecutor(max_workers=workers) as executor:
-                    futures = {
-                        executor.submit(
-                            move_or_download_for_page,
-                            url,
-                            page,
-                            output_dir,
-                            [str(d) for d in all_page_dirs],
-                            max_height,
-                            split,
-                            segment_duration,
-                            skip_start,
-                            skip_end,
-                            page_width,
-                        ): url
-                        for url in new_urls
-                    }
-
-                    for future in as_completed(futures):
-                        url, success = future.result()
-                        if success:
-                            page_success += 1
-                            click.echo(
-                                f"[{page_success}/{len(new_urls)}] Completed: {url}"
-                            )
-                        else:
-                            page_failed.append(url)
-                            click.echo(f"[FAILED] {url}")
-            else:
-                with ThreadPoolExecutor(max_workers=workers) as executor:
-                    futures = {
-                        executor.submit(
-                            download_single_video,
-                            url,
-                            output_dir,
-                            max_height,
-                            split,
-                            segment_duration,
-                            skip_start,
-                            skip_end,
-                        ): url
-                        for url in new_urls
-                    }
-
-                    for future in as_completed(futures):
-                        url, success = future.result()
-                        if success:
-                            page_success += 1
-                            click.echo(
-                                f"[{page_success}/{len(new_urls)}] Completed: {url}"
-                            )
-                        else:
-                            page_failed.append(url)
-                            click.echo(f"[FAILED] {url}")
-
-            total_success += page_success
-            total_failed += len(page_failed)
-            click.echo(
-                f"\nPage {page} done: {page_success}/{len(new_urls)} successful\n"
-            )
-
-        if end_page and page >= end_page:
-            break
+            for url in new_urls:
+                slots.acquire()
+                if split_pages:
+                    future = downloads.submit(
+                        move_or_download_for_page,
+                        url,
+                        page,
+                        output_dir,
+                        [str(d) for d in all_page_dirs],
+                        max_height,
+                        split,
+                        segment_duration,
+                        skip_start,
+                        skip_end,
+                        page_width,
+                        archive,
+                    )
+                else:
+                    future = downloads.submit(
+                        download_single_video,
+                        url,
+                        output_dir,
+                        max_height,
+                        split,
+                        segment_duration,
+                        skip_start,
+                        skip_end,
+                        archive,
+                    )
+                future.add_done_callback(functools.partial(finished, page, url))
 
-        page += 1
+    crawler.join()
 
-    click.echo(f"=== All done: {total_success} successful, {total_failed} failed ===")
-    return total_failed == 0
+    click.echo(
+        f"\n=== Crawl: {stats['pages']} page(s), {stats['found']} URLs,"
+        f" {stats['new']} new ==="
+    )
+    click.echo(
+        f"=== Metadata: {stats['archived']} archived, {stats['filtered']} filtered,"
+        f" {stats['skipped']} existing, {stats['queued']} queued ==="
+    )
+    click.echo(
+        f"=== All done: {stats['success']} successful, {stats['failed']} failed ==="
+    )
+    return stats["failed"] == 0
+
+
+def passthrough_output_dir(args):
+    """Directory a passthrough yt-dlp run writes into, from -P/--paths and -o."""
+    paths = template = None
+    for i, arg in enumerate(args):
+        flag, _, value = arg.partition("=")
+        if not value and i + 1 < len(args):
+            value = args[i + 1]
+        if flag in ("-P", "--paths") and not value.startswith("temp:"):
+            paths = value.removeprefix("home:")
+        elif flag in ("-o", "--output"):
+            template = value
+    out_dir = Path(paths) if paths else Path.cwd()
+    if template:
+        # Only the literal part before the first field can be resolved
+        static = template.split("%(", 1)[0]
+        out_dir = out_dir / os.path.dirname(static)
+    return out_dir
 
 
 class GifferGroup(click.Group):
@@ -1064,6 +1802,7 @@ class GifferGroup(click.Group):
             # Parse our flags manually
             gallery = False
             ytdlp = False
+            use_archive = True
             remaining = []
             i = 0
             while i < len(args):
@@ -1071,6 +1810,8 @@ class GifferGroup(click.Group):
                     gallery = True
                 elif args[i] == "--yt-dlp":
                     ytdlp = True
+                elif args[i] == "--no-archive":
+                    use_archive = False
                 elif args[i] in ("-h", "--help") and not remaining:
                     return super().invoke(ctx)
                 else:
@@ -1085,19 +1826,34 @@ class GifferGroup(click.Group):
                 click.echo("Error: Cannot use both --gallery and --yt-dlp", err=True)
                 ctx.exit(1)
 
+            urls = [arg for arg in remaining if re.match(r"^https?://", arg)]
+            archive = None
+            if use_archive and urls and not NON_DOWNLOAD_FLAGS.intersection(remaining):
+                archive = open_archive()
+            out_dir = passthrough_output_dir(remaining)
+            if archive is not None and all(
+                archive.is_downloaded(url, out_dir) for url in urls
+            ):
+                for url in urls:
+                    click.echo(f"[SKIP] Already in download archive: {url}")
+                ctx.exit(0)
+
             if gallery:
                 result = run_gallery_dl(remaining)
-            elif ytdlp:
-                # Prepend defaults, user args can override
-                result = run_yt_dlp(get_default_ytdlp_args() + remaining)
             else:
                 # Prepend defaults, user args can override
-                result = run_yt_dlp(get_default_ytdlp_args() + remaining)
-                if result.returncode != 0:
+                result = run_yt_dlp_recorded(
+                    get_default_ytdlp_args() + remaining, archive, urls
+                )
+                if result.returncode != 0 and not ytdlp:
                     click.echo(
                         "\nyt-dlp failed, trying gallery-dl as fallback...\n", err=True
                     )
                     result = run_gallery_dl(remaining)
+                    gallery = True
+            if gallery and result.returncode == 0 and archive is not None:
+                for url in urls:
+                    archive.record(url)
 
             ctx.exit(result.returncode)
         else:
@@ -1107,13 +1863,19 @@ class GifferGroup(click.Group):
 @click.group(cls=GifferGroup, invoke_without_command=True)
 @click.option("--gallery", is_flag=True, help="Force using gallery-dl")
 @click.option("--yt-dlp", "ytdlp", is_flag=True, help="Force using yt-dlp")
+@click.option(
+    "--no-archive", is_flag=True, help="Ignore and don't update the download archive"
+)
 @click.pass_context
-def cli(ctx, gallery, ytdlp):
+def cli(ctx, gallery, ytdlp, no_archive):
     """Wrapper for yt-dlp and gallery-dl with optional video splitting.
 
     By default, passes all arguments to yt-dlp.
     If yt-dlp fails, automatically tries gallery-dl as fallback.
     Use --gallery or --yt-dlp to force a specific tool (disables fallback).
+    URLs already in the download archive are skipped while their recorded
+    file is still under the output directory; use --no-archive to download
+    anyway.
 
     \b
     Default usage (passthrough):
@@ -1121,6 +1883,7 @@ def cli(ctx, gallery, ytdlp):
       giffer "https://youtube.com/watch?v=xxx" -f best
       giffer --gallery "https://example.com"
       giffer --yt-dlp "https://reddit.com/..."
+      giffer --no-archive "https://youtube.com/watch?v=xxx"
 
     \b
     Duration formats: 30 (seconds), 30s, 2m, 1m30s, 1h, 1h30m, 1h2m3s
@@ -1144,9 +1907,16 @@ def cli(ctx, gallery, ytdlp):
     "--skip-start", type=DURATION, default=0, help="Skip from start (default: 0)"
 )
 @click.option("--skip-end", type=DURATION, default=0, help="Skip from end (default: 0)")
-def split(url, output_dir, duration, skip_start, skip_end):
+@click.option(
+    "--reencode",
+    is_flag=True,
+    help="Re-encode for exact cut points (default: stream copy, keyframe cuts)",
+)
+def split(url, output_dir, duration, skip_start, skip_end, reencode):
     """Download video and split into segments."""
-    success = download_with_split(url, duration, skip_start, skip_end, output_dir)
+    success = download_with_split(
+        url, duration, skip_start, skip_end, output_dir, reencode=reencode
+    )
     sys.exit(0 if success else 1)
 
 
@@ -1191,6 +1961,9 @@ def split(url, output_dir, duration, skip_start, skip_end):
     is_flag=True,
     help="Use gallery-dl as primary downloader (fall back to yt-dlp)",
 )
+@click.option(
+    "--no-archive", is_flag=True, help="Ignore and don't update the download archive"
+)
 def download(
     url,
     output_dir,
@@ -1201,6 +1974,7 @@ def download(
     skip_end,
     max_height,
     gallery,
+    no_archive,
 ):
     """Download video(s) from URL or playlist.
 
@@ -1209,6 +1983,7 @@ def download(
     Use --gallery to prefer gallery-dl over yt-dlp.
     """
     split = do_split
+    archive = None if no_archive else open_archive()
 
     if gallery:
         gallery_args = []
@@ -1221,9 +1996,9 @@ def download(
 
     if workers > 1:
         click.echo("Extracting video URLs from playlist...")
-        urls = get_playlist_urls(url)
+        entries = get_playlist_urls(url)
 
-        if not urls:
+        if not entries:
             click.echo("No videos found or not a playlist, downloading as single video")
             if split:
                 success = download_with_split(
@@ -1234,9 +2009,22 @@ def download(
                 args = [url]
                 if output_dir:
                     args.extend(["-o", f"{output_dir}/%(title)s.%(ext)s"])
-                result = run_yt_dlp(args)
+                result = run_yt_dlp_recorded(args, archive, [url])
                 sys.exit(result.returncode)
 
+        urls = [video_url for video_url, _, _ in entries]
+        if archive is not None:
+            out_dir = get_output_dir(output_dir, create=False)
+            urls = [
+                video_url
+                for video_url, extractor, video_id in entries
+                if not archive.is_downloaded(video_url, out_dir, extractor, video_id)
+            ]
+            if len(urls) < len(entries):
+                click.echo(
+                    f"Skipping {len(entries) - len(urls)} video(s) already in the archive"
+                )
+
         click.echo(f"Found {len(urls)} videos, downloading with {workers} workers")
         click.echo(f"Split: {'enabled' if split else 'disabled'}\n")
 
@@ -1254,6 +2042,7 @@ def download(
                     duration,
                     skip_start,
                     skip_end,
+                    archive,
                 ): video_url
                 for video_url in urls
             }
@@ -1279,7 +2068,7 @@ def download(
             args = [url]
             if output_dir:
                 args.extend(["-o", f"{output_dir}/%(title)s.%(ext)s"])
-            result = run_yt_dlp(args)
+            result = run_yt_dlp_recorded(args, archive, [url])
             sys.exit(result.returncode)
 
 
@@ -1302,15 +2091,47 @@ def download(
     "--skip-start", type=DURATION, default=0, help="Skip from start (default: 0)"
 )
 @click.option("--skip-end", type=DURATION, default=0, help="Skip from end (default: 0)")
+@click.option(
+    "--reencode",
+    is_flag=True,
+    help="Re-encode for exact cut points (default: stream copy, keyframe cuts)",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    help="Max concurrent ffmpeg processes (default: CPU count)",
+)
 def process(
-    path, output_dir, cleanup, recursive, extensions, duration, skip_start, skip_end
+    path,
+    output_dir,
+    cleanup,
+    recursive,
+    extensions,
+    duration,
+    skip_start,
+    skip_end,
+    reencode,
+    jobs,
 ):
-    """Split local video file(s)."""
+    """Split local video file(s).
+
+    Directories are processed several files at a time, within --jobs.
+    """
     exts = None
     if extensions:
         exts = [f".{e.lstrip('.')}" for e in extensions]
     success = split_path(
-        path, duration, skip_start, skip_end, output_dir, cleanup, recursive, exts
+        path,
+        duration,
+        skip_start,
+        skip_end,
+        output_dir,
+        cleanup,
+        recursive,
+        exts,
+        reencode,
+        jobs,
     )
     sys.exit(0 if success else 1)
 
@@ -1339,10 +2160,24 @@ def process(
     is_flag=True,
     help="Remove successfully downloaded URLs from the list file",
 )
-def batch(url_file, output_dir, workers, embed_subs, max_height, clean_list):
-    """Download videos from a URL list file."""
+@click.option(
+    "--no-archive", is_flag=True, help="Ignore and don't update the download archive"
+)
+def batch(
+    url_file, output_dir, workers, embed_subs, max_height, clean_list, no_archive
+):
+    """Download videos from a URL list file.
+
+    URLs already in the download archive are skipped without probing.
+    """
     success = batch_download_impl(
-        url_file, output_dir, embed_subs, max_height, workers, clean_list
+        url_file,
+        output_dir,
+        embed_subs,
+        max_height,
+        workers,
+        clean_list,
+        archive=None if no_archive else open_archive(),
     )
     sys.exit(0 if success else 1)
 
@@ -1405,6 +2240,15 @@ def batch(url_file, output_dir, workers, embed_subs, max_height, clean_list):
     multiple=True,
     help="Search directory for existing files to skip (recursive, repeatable)",
 )
+@click.option(
+    "--no-archive", is_flag=True, help="Ignore and don't update the download archive"
+)
+@click.option(
+    "--prefetch-pages",
+    type=click.IntRange(min=1),
+    default=2,
+    help="Pages to crawl ahead of the downloads (default: 2)",
+)
 def scrape(
     url,
     output_dir,
@@ -1422,6 +2266,8 @@ def scrape(
     skip_start,
     skip_end,
     search_dirs,
+    no_archive,
+    prefetch_pages,
 ):
     """Scrape paginated pages and download videos.
 
@@ -1431,6 +2277,9 @@ def scrape(
     Use --split-pages to organize downloads into page-N directories. Re-running
     with --split-pages will move existing files to their correct page directories.
     Use --search-dir to skip downloading files that already exist in another directory.
+    URLs in the download archive are skipped before any title or filename probe.
+    Pages are crawled while earlier pages download; --prefetch-pages bounds how far
+    ahead the crawler runs.
     """
     pagination = None
     if site:
@@ -1455,9 +2304,46 @@ def scrape(
         url_exclude=url_exclude,
         split_pages=split_pages,
         search_dirs=search_dirs if search_dirs else None,
+        archive=None if no_archive else open_archive(),
+        prefetch_pages=prefetch_pages,
     )
     sys.exit(0 if success else 1)
 
 
+@cli.group("archive")
+def archive_group():
+    """Manage the download archive.
+
+    \b
+    The archive records every URL giffer has downloaded (batch, scrape,
+    download and passthrough) with its file path, size and mtime.
+    Location: $GIFFER_ARCHIVE or $XDG_STATE_HOME/giffer/archive.sqlite3
+    """
+
+
+@archive_group.command("export")
+@click.argument("file", type=click.Path(dir_okay=False))
+def archive_export(file):
+    """Write a yt-dlp --download-archive file."""
+    count = DownloadArchive().export_ytdlp(file)
+    click.echo(f"Exported {count} entries to {file}")
+
+
+@archive_group.command("import")
+@click.argument("file", type=click.Path(exists=True, dir_okay=False))
+def archive_import(file):
+    """Add entries from a yt-dlp --download-archive file."""
+    count = DownloadArchive().import_ytdlp(file)
+    click.echo(f"Imported {count} entries from {file}")
+
+
+@archive_group.command("stats")
+def archive_stats():
+    """Show archive location and size."""
+    db = DownloadArchive()
+    click.echo(f"Archive: {db.path}")
+    click.echo(f"Entries: {db.count()}")
+
+
 if __name__ == "__main__":
     cli()
@@ -1,14 +1,29 @@
 #!/usr/bin/env python3
-"""Recursively pull all git repositories under a directory."""
+"""Recursively pull all git repositories under a directory.
+
+Repository discovery and default branches are cached under
+$XDG_CACHE_HOME/git-pull-all; see RepoCache.
+
+Each repo goes through two stages: a network-bound fetch (--jobs wide) and a
+local stage (dirty check, checkout, merge --ff-only; --local-jobs wide). A
+repo enters the local stage as soon as its fetch finishes.
+"""
 
 import argparse
+import json
 import os
+import queue
 import subprocess
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
+CACHE_VERSION = 1
+
 
 @dataclass
 class PullResult:
@@ -19,18 +34,125 @@ class PullResult:
     message: str
     skipped: bool = False
     branch: str | None = None
-
-
-def find_git_repos(base_dir: Path) -> list[Path]:
-    """Recursively find all git repositories under base_dir."""
+    fetch_seconds: float | None = None
+    local_seconds: float | None = None
+
+    @property
+    def status(self) -> str:
+        if self.skipped:
+            return "skipped"
+        return "ok" if self.success else "error"
+
+
+def get_cache_path() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    return Path(cache_home) / "git-pull-all" / "cache.json"
+
+
+class RepoCache:
+    """Persistent discovery and default-branch cache.
+
+    discovery: per base dir, the repo list plus the mtime of every directory
+    the walk listed. Adding or removing a repo changes its parent's mtime, so
+    the list is reused while all recorded mtimes match and every repo still
+    has a .git.
+
+    branches: per repo, the default branch and the contents of
+    .git/refs/remotes/origin/HEAD it was resolved against; a changed or new
+    origin/HEAD invalidates the entry.
+    """
+
+    def __init__(self, path: Path | None, enabled: bool = True):
+        self.path = path
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.data = {"version": CACHE_VERSION, "discovery": {}, "branches": {}}
+        if enabled and path and path.exists():
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+                if data.get("version") == CACHE_VERSION:
+                    self.data = data
+            except (OSError, ValueError):
+                pass
+
+    def get_repos(self, base_dir: Path) -> list[Path] | None:
+        entry = self.data["discovery"].get(str(base_dir))
+        if not entry:
+            return None
+        for dir_path, mtime in entry["dirs"].items():
+            try:
+                if os.stat(dir_path).st_mtime_ns != mtime:
+                    return None
+            except OSError:
+                return None
+        repos = [Path(p) for p in entry["repos"]]
+        if not all((repo / ".git").exists() for repo in repos):
+            return None
+        return repos
+
+    def set_repos(self, base_dir: Path, repos: list[Path], dirs: dict[str, int]):
+        self.data["discovery"][str(base_dir)] = {
+            "dirs": dirs,
+            "repos": [str(r) for r in repos],
+        }
+        self.dirty = True
+
+    def get_branch(self, repo_path: Path, origin_head: str) -> str | None:
+        with self.lock:
+            entry = self.data["branches"].get(str(repo_path))
+        if entry and entry["origin_head"] == origin_head:
+            return entry["branch"]
+        return None
+
+    def set_branch(self, repo_path: Path, origin_head: str, branch: str):
+        with self.lock:
+            self.data["branches"][str(repo_path)] = {
+                "origin_head": origin_head,
+                "branch": branch,
+            }
+            self.dirty = True
+
+    def save(self):
+        if not self.dirty or not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".cache-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self.data, f)
+        os.replace(tmp, self.path)
+
+
+# Replaced in main(); a disabled in-memory cache keeps library use side-effect free
+_cache = RepoCache(None, enabled=False)
+
+
+def walk_git_repos(base_dir: Path) -> tuple[list[Path], dict[str, int]]:
+    """Walk base_dir for repositories, recording the mtime of each listed dir."""
     repos = []
+    dirs_seen = {}
     for root, dirs, _ in os.walk(base_dir):
         if ".git" in dirs:
             repos.append(Path(root))
             # Don't descend into git repo subdirectories
             dirs.clear()
+            continue
+        try:
+            dirs_seen[root] = os.stat(root).st_mtime_ns
+        except OSError:
+            pass
         # Skip hidden directories (except we already handled .git)
         dirs[:] = [d for d in dirs if not d.startswith(".")]
+    return repos, dirs_seen
+
+
+def find_git_repos(base_dir: Path) -> list[Path]:
+    """Recursively find all git repositories under base_dir (cached)."""
+    repos = _cache.get_repos(base_dir)
+    if repos is not None:
+        return repos
+    repos, dirs_seen = walk_git_repos(base_dir)
+    _cache.set_repos(base_dir, repos, dirs_seen)
     return repos
 
 
@@ -93,12 +215,49 @@ def get_default_branch_git(repo_path: Path) -> str | None:
     return None
 
 
+def read_origin_head(repo_path: Path) -> str | None:
+    """Contents of refs/remotes/origin/HEAD ("" if absent), or None if unreadable.
+
+    Symbolic refs are never packed, so the loose file is authoritative.
+    """
+    git_dir = repo_path / ".git"
+    if git_dir.is_file():
+        # Worktree or submodule: ".git" points at the real git dir
+        try:
+            gitdir = git_dir.read_text().strip().removeprefix("gitdir: ")
+        except OSError:
+            return None
+        git_dir = (repo_path / gitdir).resolve()
+        common = git_dir / "commondir"
+        if common.exists():
+            git_dir = (git_dir / common.read_text().strip()).resolve()
+    try:
+        return (git_dir / "refs" / "remotes" / "origin" / "HEAD").read_text().strip()
+    except FileNotFoundError:
+        return ""
+    except OSError:
+        return None
+
+
 def get_default_branch(repo_path: Path) -> str | None:
-    """Get the default branch, trying gh CLI first, then git."""
-    branch = get_default_branch_gh(repo_path)
-    if branch:
-        return branch
-    return get_default_branch_git(repo_path)
+    """Get the default branch.
+
+    Prefers the local origin/HEAD symbolic ref, then the cache, and only then
+    asks GitHub via gh (falling back to probing common branch names).
+    """
+    origin_head = read_origin_head(repo_path)
+    if origin_head and origin_head.startswith("ref: refs/remotes/origin/"):
+        return origin_head.removeprefix("ref: refs/remotes/origin/")
+
+    if origin_head is not None:
+        branch = _cache.get_branch(repo_path, origin_head)
+        if branch:
+            return branch
+
+    branch = get_default_branch_gh(repo_path) or get_default_branch_git(repo_path)
+    if branch and origin_head is not None:
+        _cache.set_branch(repo_path, origin_head, branch)
+    return branch
 
 
 def has_no_commits(repo_path: Path) -> bool:
@@ -136,8 +295,8 @@ def has_uncommitted_changes(repo_path: Path) -> bool:
         return True  # Assume dirty if we can't check
 
 
-def pull_repo(repo_path: Path, progress_callback=None) -> PullResult:
-    """Pull a single git repository."""
+def fetch_repo(repo_path: Path) -> PullResult:
+    """Network stage: resolve the default branch and fetch it from origin."""
     # Check for empty repository (no commits)
     if has_no_commits(repo_path):
         return PullResult(
@@ -147,22 +306,66 @@ def pull_repo(repo_path: Path, progress_callback=None) -> PullResult:
             skipped=True,
         )
 
-    # Check for uncommitted changes
-    if has_uncommitted_changes(repo_path):
+    # Get default branch
+    default_branch = get_default_branch(repo_path)
+    if not default_branch:
         return PullResult(
             path=repo_path,
             success=False,
-            message="uncommitted changes",
-            skipped=True,
+            message="could not determine default branch",
         )
 
-    # Get default branch
-    default_branch = get_default_branch(repo_path)
-    if not default_branch:
+    # Fetch (updates refs/remotes/origin/<branch>)
+    try:
+        result = subprocess.run(
+            ["git", "fetch", "origin", default_branch],
+            cwd=repo_path,
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+    except subprocess.TimeoutExpired:
         return PullResult(
             path=repo_path,
             success=False,
-            message="could not determine default branch",
+            message="fetch timed out",
+            branch=default_branch,
+        )
+    except subprocess.SubprocessError as e:
+        return PullResult(
+            path=repo_path,
+            success=False,
+            message=f"fetch error: {e}",
+            branch=default_branch,
+        )
+    if result.returncode != 0:
+        return PullResult(
+            path=repo_path,
+            success=False,
+            message=f"fetch failed: {result.stderr.strip()}",
+            branch=default_branch,
+        )
+    return PullResult(
+        path=repo_path,
+        success=True,
+        message=f"fetched {default_branch}",
+        branch=default_branch,
+    )
+
+
+def update_repo(fetched: PullResult) -> PullResult:
+    """Local stage: fast-forward the default branch to the fetched origin ref."""
+    repo_path = fetched.path
+    default_branch = fetched.branch
+
+    # Check for uncommitted changes
+    if has_uncommitted_changes(repo_path):
+        return PullResult(
+            path=repo_path,
+            success=False,
+            message="uncommitted changes",
+            skipped=True,
+            branch=default_branch,
         )
 
     # Get current branch
@@ -185,27 +388,30 @@ def pull_repo(repo_path: Path, progress_callback=None) -> PullResult:
     # Checkout default branch if needed
     if current_branch and current_branch != default_branch:
         try:
-            subprocess.run(
+            result = subprocess.run(
                 ["git", "checkout", default_branch],
                 cwd=repo_path,
                 capture_output=True,
                 timeout=30,
             )
+            checkout_ok = result.returncode == 0
         except (subprocess.TimeoutExpired, subprocess.SubprocessError):
+            checkout_ok = False
+        if not checkout_ok:
             return PullResult(
                 path=repo_path,
                 success=False,
                 message=f"failed to checkout {default_branch}",
             )
 
-    # Pull
+    # Fast-forward
     try:
         result = subprocess.run(
-            ["git", "pull", "origin", default_branch],
+            ["git", "merge", "--ff-only", f"origin/{default_branch}"],
             cwd=repo_path,
             capture_output=True,
             text=True,
-            timeout=120,
+            timeout=60,
         )
         if result.returncode == 0:
             return PullResult(
@@ -218,25 +424,132 @@ def pull_repo(repo_path: Path, progress_callback=None) -> PullResult:
             return PullResult(
                 path=repo_path,
                 success=False,
-                message=f"pull failed: {result.stderr.strip()}",
+                message=f"fast-forward failed: {result.stderr.strip()}",
                 branch=default_branch,
             )
     except subprocess.TimeoutExpired:
         return PullResult(
             path=repo_path,
             success=False,
-            message="pull timed out",
+            message="fast-forward timed out",
             branch=default_branch,
         )
     except subprocess.SubprocessError as e:
         return PullResult(
             path=repo_path,
             success=False,
-            message=f"pull error: {e}",
+            message=f"fast-forward error: {e}",
             branch=default_branch,
         )
 
 
+def pull_repo(repo_path: Path) -> PullResult:
+    """Pull a single git repository (both stages, sequentially)."""
+    result = fetch_repo(repo_path)
+    if not result.success:
+        return result
+    return update_repo(result)
+
+
+class PhaseTimer:
+    """Collects (start, end) spans of one pipeline stage across threads."""
+
+    def __init__(self, jobs: int):
+        self.jobs = jobs
+        self.spans: list[tuple[float, float]] = []
+        self.lock = threading.Lock()
+
+    def run(self, fn, *args) -> tuple[PullResult, float]:
+        start = time.monotonic()
+        try:
+            result = fn(*args)
+        except Exception as e:
+            path = args[0] if isinstance(args[0], Path) else args[0].path
+            result = PullResult(path=path, success=False, message=f"error: {e}")
+        end = time.monotonic()
+        with self.lock:
+            self.spans.append((start, end))
+        return result, round(end - start, 3)
+
+    def summary(self) -> dict:
+        if not self.spans:
+            return {"jobs": self.jobs, "wall_seconds": 0.0, "busy_seconds": 0.0}
+        wall = max(e for _, e in self.spans) - min(s for s, _ in self.spans)
+        busy = sum(e - s for s, e in self.spans)
+        return {
+            "jobs": self.jobs,
+            "wall_seconds": round(wall, 3),
+            "busy_seconds": round(busy, 3),
+        }
+
+
+def run_pipeline(repos: list[Path], fetch_timer: PhaseTimer, local_timer: PhaseTimer):
+    """Fetch and update repos, yielding results as each repo finishes."""
+    done: queue.Queue[PullResult] = queue.Queue()
+    fetch_pool = ThreadPoolExecutor(max_workers=fetch_timer.jobs)
+    local_pool = ThreadPoolExecutor(max_workers=local_timer.jobs)
+
+    def local_stage(fetched: PullResult):
+        result, seconds = local_timer.run(update_repo, fetched)
+        result.fetch_seconds = fetched.fetch_seconds
+        result.local_seconds = seconds
+        done.put(result)
+
+    def fetch_stage(repo_path: Path):
+        result, seconds = fetch_timer.run(fetch_repo, repo_path)
+        result.fetch_seconds = seconds
+        if result.success:
+            local_pool.submit(local_stage, result)
+        else:
+            done.put(result)
+
+    try:
+        for repo in repos:
+            fetch_pool.submit(fetch_stage, repo)
+        for _ in repos:
+            yield done.get()
+    finally:
+        fetch_pool.shutdown()
+        local_pool.shutdown()
+
+
+def write_json_summary(
+    dest: str, base_dir: Path, results: list[PullResult], phases: dict
+):
+    """Write a machine-readable run summary, slowest repos first."""
+    counts = {"ok": 0, "error": 0, "skipped": 0}
+    for r in results:
+        counts[r.status] += 1
+    ordered = sorted(
+        results,
+        key=lambda r: (r.fetch_seconds or 0) + (r.local_seconds or 0),
+        reverse=True,
+    )
+    summary = {
+        "base_dir": str(base_dir),
+        "phases": phases,
+        "counts": counts,
+        "repos": [
+            {
+                "path": str(r.path.relative_to(base_dir)),
+                "status": r.status,
+                "branch": r.branch,
+                "message": r.message,
+                "fetch_seconds": r.fetch_seconds,
+                "local_seconds": r.local_seconds,
+            }
+            for r in ordered
+        ],
+    }
+    if dest == "-":
+        json.dump(summary, sys.stdout, indent=2)
+        print()
+    else:
+        with open(dest, "w") as f:
+            json.dump(summary, f, indent=2)
+            f.write("\n")
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Recursively pull all git repositories under a directory"
@@ -251,8 +564,14 @@ def main() -> int:
         "-j",
         "--jobs",
         type=int,
+        default=16,
+        help="Number of parallel fetches (default: 16)",
+    )
+    parser.add_argument(
+        "--local-jobs",
+        type=int,
         default=4,
-        help="Number of parallel jobs (default: 4)",
+        help="Number of parallel checkouts/fast-forwards (default: 4)",
     )
     parser.add_argument(
         "-v",
@@ -260,58 +579,100 @@ def main() -> int:
         action="store_true",
         help="Show all results, not just errors",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore the discovery/default-branch cache and rebuild it",
+    )
+    parser.add_argument(
+        "--json",
+        metavar="PATH",
+        help="Write a JSON summary with per-phase timings to PATH ('-' for stdout)",
+    )
     args = parser.parse_args()
 
+    global _cache
+    _cache = RepoCache(get_cache_path(), enabled=not args.no_cache)
+
+    # Keep stdout clean for the JSON summary
+    out = sys.stderr if args.json == "-" else sys.stdout
+
     base_dir = Path(args.directory).expanduser().resolve()
     if not base_dir.is_dir():
         print(f"Error: {base_dir} is not a directory", file=sys.stderr)
         return 1
 
-    print(f"Searching for git repositories in {base_dir}...")
+    print(f"Searching for git repositories in {base_dir}...", file=out)
+    discover_start = time.monotonic()
     repos = find_git_repos(base_dir)
+    discover_seconds = round(time.monotonic() - discover_start, 3)
     total = len(repos)
-    print(f"Found {total} repositories")
-    print()
-
-    if not repos:
-        return 0
+    print(f"Found {total} repositories", file=out)
+    print(file=out)
 
     success_count = 0
     error_count = 0
     skipped_count = 0
     completed = 0
+    results = []
+
+    fetch_timer = PhaseTimer(args.jobs)
+    local_timer = PhaseTimer(args.local_jobs)
+    for result in run_pipeline(repos, fetch_timer, local_timer):
+        results.append(result)
+        completed += 1
+        rel_path = result.path.relative_to(base_dir)
+        branch_info = f" ({result.branch})" if result.branch else ""
+
+        # Clear line and show progress (zero-pad to align)
+        width = len(str(total))
+        progress = f"[{completed:0{width}d}/{total}]"
+
+        if result.skipped:
+            skipped_count += 1
+            print(
+                f"{progress} SKIP    {rel_path}{branch_info} - {result.message}",
+                file=out,
+            )
+        elif result.success:
+            success_count += 1
+            print(f"{progress} OK      {rel_path}{branch_info}", file=out)
+        else:
+            error_count += 1
+            print(
+                f"{progress} ERROR   {rel_path}{branch_info} - {result.message}",
+                file=out,
+            )
+
+    _cache.save()
 
-    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
-        futures = {executor.submit(pull_repo, repo): repo for repo in repos}
-
-        for future in as_completed(futures):
-            result = future.result()
-            completed += 1
-            rel_path = result.path.relative_to(base_dir)
-            branch_info = f" ({result.branch})" if result.branch else ""
-
-            # Clear line and show progress (zero-pad to align)
-            width = len(str(total))
-            progress = f"[{completed:0{width}d}/{total}]"
-
-            if result.skipped:
-                skipped_count += 1
-                print(f"{progress} SKIP    {rel_path}{branch_info} - {result.message}")
-            elif result.success:
-                success_count += 1
-                print(f"{progress} OK      {rel_path}{branch_info}")
-            else:
-                error_count += 1
-                print(f"{progress} ERROR   {rel_path}{branch_info} - {result.message}")
-
-    print()
-    print("=" * 40)
-    print("SUMMARY")
-    print("=" * 40)
-    print(f"Success: {success_count}")
-    print(f"Errors:  {error_count}")
-    print(f"Skipped: {skipped_count}")
-    print("=" * 40)
+    phases = {
+        "discover": {"wall_seconds": discover_seconds},
+        "fetch": fetch_timer.summary(),
+        "local": local_timer.summary(),
+    }
+    if args.json:
+        write_json_summary(args.json, base_dir, results, phases)
+
+    if not repos:
+        return 0
+
+    print(file=out)
+    print("=" * 40, file=out)
+    print("SUMMARY", file=out)
+    print("=" * 40, file=out)
+    print(f"Success: {success_count}", file=out)
+    print(f"Errors:  {error_count}", file=out)
+    print(f"Skipped: {skipped_count}", file=out)
+    print(
+        f"Fetch:   {phases['fetch']['wall_seconds']:.1f}s ({args.jobs} jobs)",
+        file=out,
+    )
+    print(
+        f"Local:   {phases['local']['wall_seconds']:.1f}s ({args.local_jobs} jobs)",
+        file=out,
+    )
+    print("=" * 40, file=out)
 
     return 0 if error_count == 0 else 1
 
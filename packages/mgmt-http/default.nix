@@ -0,0 +1,5 @@
+{ pkgs }:
+
+# Shared HTTP transport for the *-mgmt tools. Tools put the source directory
+# on PYTHONPATH (see syncthing-mgmt); this derivation just exposes the module.
+pkgs.writeTextDir "lib/mgmt_http.py" (builtins.readFile ./mgmt_http.py)
@@ -0,0 +1,201 @@
+"""
+Shared HTTP transport for the *-mgmt API clients.
+
+HttpTransport wraps one pooled requests.Session per client, so parallel
+fetches reuse keep-alive connections instead of opening a new TCP (and TLS)
+connection per call. A circuit breaker makes calls fail fast once the server
+is known to be down, and every call is timed per endpoint.
+
+Usage:
+    transport = HttpTransport(base_url, headers={"X-API-Key": key}, pool_size=10)
+    response = transport.request("GET", "/rest/config")
+    transport.print_timings()
+"""
+
+import logging
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+log = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a server that recently failed repeatedly."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker shared by all threads of a client.
+
+    After `threshold` connection failures in a row the circuit opens and
+    calls fail immediately for `cooldown` seconds. The first call after that
+    is let through as a probe: success closes the circuit, failure reopens it.
+    """
+
+    def __init__(self, threshold: int = 3, cooldown: float = 10.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self.lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def before_call(self):
+        with self.lock:
+            if self.opened_at is None:
+                return
+            remaining = self.opened_at + self.cooldown - time.monotonic()
+            if remaining > 0 or self.probing:
+                raise CircuitOpenError(
+                    f"server unreachable after {self.failures} failed attempts "
+                    f"(retrying in {max(remaining, 0):.0f}s)"
+                )
+            self.probing = True
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+
+@dataclass
+class EndpointStats:
+    """Latencies of one METHOD /path (query string stripped)."""
+
+    count: int = 0
+    errors: int = 0
+    samples: List[float] = field(default_factory=list)
+
+    def percentile(self, pct: float) -> float:
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class HttpTransport:
+    """Pooled keep-alive session with retries, circuit breaker and timings."""
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 30,
+        pool_size: int = 10,
+        max_retries: int = 5,
+        retry_delay: float = 2.0,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.breaker = breaker or CircuitBreaker()
+        self.stats: Dict[str, EndpointStats] = {}
+        self.stats_lock = threading.Lock()
+
+        # One pool per host, sized to the caller's worker count; block rather
+        # than open throwaway connections when every pooled one is busy.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size, pool_block=True
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+    def _record(self, method: str, endpoint: str, seconds: float, error: bool):
+        key = f"{method} {endpoint.split('?', 1)[0]}"
+        with self.stats_lock:
+            stats = self.stats.setdefault(key, EndpointStats())
+            stats.count += 1
+            stats.errors += int(error)
+            stats.samples.append(seconds)
+
+    def request(
+        self,
+        method: str,
+        endpoint: str,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Send a request, retrying connection errors with exponential backoff.
+
+        HTTP error statuses are returned as-is for the client to interpret.
+        Raises CircuitOpenError once the breaker has opened, including
+        between retries, so callers stop waiting on a server that is down.
+        """
+        url = f"{self.base_url}{endpoint}"
+        for attempt in range(self.max_retries):
+            self.breaker.before_call()
+            start = time.perf_counter()
+            try:
+                response = self.session.request(
+                    method, url, timeout=timeout or self.timeout, **kwargs
+                )
+            except requests.exceptions.RequestException:
+                self._record(method, endpoint, time.perf_counter() - start, True)
+                self.breaker.record_failure()
+                if attempt == self.max_retries - 1 or self.breaker.is_open:
+                    raise
+                wait_time = self.retry_delay * (2**attempt)
+                log.info(
+                    f"    Connection error, retrying in {wait_time:.1f}s... "
+                    f"(attempt {attempt + 1}/{self.max_retries})"
+                )
+                time.sleep(wait_time)
+                continue
+
+            self.breaker.record_success()
+            self._record(
+                method,
+                endpoint,
+                time.perf_counter() - start,
+                response.status_code >= 400,
+            )
+            return response
+        raise AssertionError("unreachable")
+
+    def print_timings(self, file=sys.stderr):
+        """Print per-endpoint latency stats, slowest total first."""
+        with self.stats_lock:
+            rows = sorted(
+                self.stats.items(), key=lambda kv: sum(kv[1].samples), reverse=True
+            )
+        if not rows:
+            return
+        width = max(len(key) for key, _ in rows)
+        print(
+            f"\n{'Endpoint':<{width}}  {'Calls':>5}  {'Err':>3}  {'p50 ms':>7}  "
+            f"{'p95 ms':>7}  {'Max ms':>7}  {'Total s':>7}",
+            file=file,
+        )
+        for key, stats in rows:
+            print(
+                f"{key:<{width}}  {stats.count:>5}  {stats.errors:>3}  "
+                f"{stats.percentile(50) * 1000:>7.1f}  "
+                f"{stats.percentile(95) * 1000:>7.1f}  "
+                f"{max(stats.samples) * 1000:>7.1f}  {sum(stats.samples):>7.2f}",
+                file=file,
+            )
+
+    def close(self):
+        self.session.close()
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """CLI for Apple Notes via osascript."""
 
+import codecs
 import glob
 import hashlib
 import html
@@ -9,6 +10,7 @@ import json
 import os
 import re
 import shutil
+import sqlite3
 import subprocess
 import sys
 import tempfile
@@ -195,6 +197,14 @@ def cache_invalidate():
 # ---------------------------------------------------------------------------
 
 
+def _osascript_command(body, args=None):
+    if args:
+        script = f'on run argv\ntell application "Notes"\n{body}\nend tell\nend run'
+        return ["osascript", "-e", script] + list(args)
+    script = f'tell application "Notes"\n{body}\nend tell'
+    return ["osascript", "-e", script]
+
+
 def run_osascript(body, args=None):
     """Run an AppleScript wrapped in tell application "Notes".
 
@@ -204,14 +214,8 @@ def run_osascript(body, args=None):
     characters that AppleScript treats as special syntax (guillemets, curly
     quotes, etc.).
     """
-    if args:
-        script = f'on run argv\ntell application "Notes"\n{body}\nend tell\nend run'
-        cmd = ["osascript", "-e", script] + list(args)
-    else:
-        script = f'tell application "Notes"\n{body}\nend tell'
-        cmd = ["osascript", "-e", script]
     result = subprocess.run(
-        cmd,
+        _osascript_command(body, args),
         capture_output=True,
         text=True,
     )
@@ -287,6 +291,340 @@ def _get_attachment_count(folder, name):
     return int(output)
 
 
+# ---------------------------------------------------------------------------
+# Bulk extraction
+# ---------------------------------------------------------------------------
+
+# One osascript run walks every account and folder with bulk property reads
+# (one Apple Event per property per folder, not per note), instead of paying
+# osascript startup and a new Notes connection for each folder.
+
+# ASCII unit/record separators never appear in note names or dates
+FIELD_SEP = "\x1f"
+RECORD_SEP = "\x1e"
+BULK_READ_SIZE = 1 << 16
+
+
+def bulk_notes_script(content=None):
+    """AppleScript emitting one record per folder and per note.
+
+    Records are "F", account, folder and "N", id, name, modification date,
+    attachment count, then the note's `content` property ("body" or
+    "plaintext") last, since only it may contain a field separator.
+    """
+    content_read = (
+        f"\n                set noteContent to {content} of every note of f"
+        if content
+        else ""
+    )
+    content_field = " & US & (item i of noteContent)" if content else ""
+    return f"""set US to character id 31
+    set output to {{}}
+    repeat with a in every account
+        set accountName to name of a
+        repeat with f in every folder of a
+            set end of output to "F" & US & accountName & US & (name of f)
+            set noteIds to id of every note of f
+            if (count of noteIds) > 0 then
+                set noteNames to name of every note of f
+                set noteDates to modification date of every note of f{content_read}
+                try
+                    set noteAtts to id of every attachment of every note of f
+                on error
+                    set noteAtts to {{}}
+                    repeat with n in every note of f
+                        set end of noteAtts to every attachment of n
+                    end repeat
+                end try
+                repeat with i from 1 to count of noteIds
+                    set end of output to "N" & US & (item i of noteIds) & US & (item i of noteNames) & US & ((item i of noteDates) as text) & US & ((count of item i of noteAtts) as text){content_field}
+                end repeat
+            end if
+        end repeat
+    end repeat
+    set AppleScript's text item delimiters to character id 30
+    return output as text"""
+
+
+def _parse_bulk_record(record, folder):
+    parts = record.split(FIELD_SEP, 5)
+    if parts[0] == "F" and len(parts) == 3:
+        return {"type": "folder", "account": parts[1], "folder": parts[2]}
+    if parts[0] == "N" and len(parts) >= 5 and folder:
+        note = {
+            "type": "note",
+            "account": folder["account"],
+            "folder": folder["folder"],
+            "id": parts[1],
+            "name": parts[2],
+            "modified": parts[3].strip(),
+            "attachments": int(parts[4] or 0),
+        }
+        if len(parts) == 6:
+            note["content"] = parts[5]
+        return note
+    return None
+
+
+def iter_bulk_notes(content=None):
+    """Yield folder and note records for every account from one osascript run.
+
+    Output is split into records as it is read off the pipe, so a full dump
+    with bodies is never held (and copied) as one string. Folder records come
+    before their notes and also mark empty folders.
+    """
+    proc = subprocess.Popen(
+        _osascript_command(bulk_notes_script(content)),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    folder = None
+    try:
+        while True:
+            chunk = proc.stdout.read1(BULK_READ_SIZE)
+            if chunk:
+                pending += decoder.decode(chunk)
+                *records, pending = pending.split(RECORD_SEP)
+            else:
+                # osascript ends its output with a newline
+                pending += decoder.decode(b"", final=True)
+                records = [pending.removesuffix("\n")] if pending.strip() else []
+            for record in records:
+                parsed = _parse_bulk_record(record, folder)
+                if parsed is None:
+                    continue
+                if parsed["type"] == "folder":
+                    folder = parsed
+                yield parsed
+            if not chunk:
+                break
+        stderr = proc.stderr.read().decode(errors="replace")
+        if proc.wait() != 0:
+            click.echo(f"Error: {stderr.strip()}", err=True)
+            sys.exit(1)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+
+# ---------------------------------------------------------------------------
+# Local mirror
+# ---------------------------------------------------------------------------
+
+# SQLite copy of every note (metadata, HTML body and its plain text) with an
+# FTS5 index, so list/search/count/view don't need an osascript call per
+# folder. Lives outside CACHE_DIR so cache_invalidate() doesn't drop it; a
+# write only clears its freshness stamp and the next read refreshes it.
+MIRROR_PATH = os.path.join(
+    os.environ.get("XDG_STATE_HOME", os.path.expanduser("~/.local/state")),
+    "notes-cli",
+    "mirror.sqlite3",
+)
+MIRROR_BODY_BATCH = 200  # note ids per body-fetch osascript call
+
+NOTE_BODIES_SCRIPT = """set US to character id 31
+    set output to {}
+    repeat with noteId in argv
+        set n to note id (noteId as text)
+        set end of output to (noteId as text) & US & (body of n)
+    end repeat
+    set AppleScript's text item delimiters to character id 30
+    return output as text"""
+
+MIRROR_SCHEMA = """
+CREATE TABLE IF NOT EXISTS folders (
+    name TEXT PRIMARY KEY,
+    pos INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    note_id TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    folder TEXT NOT NULL,
+    modified TEXT NOT NULL,
+    folder_pos INTEGER NOT NULL DEFAULT 0,
+    pos INTEGER NOT NULL DEFAULT 0,
+    attachments INTEGER NOT NULL DEFAULT 0,
+    html TEXT NOT NULL DEFAULT '',
+    body TEXT NOT NULL DEFAULT ''
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+    name, folder, modified, body,
+    content='notes', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS notes_ai AFTER INSERT ON notes BEGIN
+    INSERT INTO notes_fts(rowid, name, folder, modified, body)
+    VALUES (new.id, new.name, new.folder, new.modified, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS notes_ad AFTER DELETE ON notes BEGIN
+    INSERT INTO notes_fts(notes_fts, rowid, name, folder, modified, body)
+    VALUES ('delete', old.id, old.name, old.folder, old.modified, old.body);
+END;
+CREATE TRIGGER IF NOT EXISTS notes_au AFTER UPDATE OF name, folder, modified, body ON notes BEGIN
+    INSERT INTO notes_fts(notes_fts, rowid, name, folder, modified, body)
+    VALUES ('delete', old.id, old.name, old.folder, old.modified, old.body);
+    INSERT INTO notes_fts(rowid, name, folder, modified, body)
+    VALUES (new.id, new.name, new.folder, new.modified, new.body);
+END;
+"""
+
+
+def open_mirror():
+    """Open (creating if needed) the mirror database."""
+    os.makedirs(os.path.dirname(MIRROR_PATH), exist_ok=True)
+    db = sqlite3.connect(MIRROR_PATH)
+    db.executescript(MIRROR_SCHEMA)
+    return db
+
+
+def fetch_note_bodies(note_ids):
+    """Yield (id, HTML body) for the given note ids."""
+    for start in range(0, len(note_ids), MIRROR_BODY_BATCH):
+        batch = note_ids[start : start + MIRROR_BODY_BATCH]
+        output = run_osascript(NOTE_BODIES_SCRIPT, args=batch)
+        for record in output.split(RECORD_SEP):
+            parts = record.split(FIELD_SEP, 1)
+            if len(parts) == 2:
+                yield parts[0], parts[1]
+
+
+def refresh_mirror(db, full=False):
+    """Bring the mirror up to date; return (updated, removed) note counts.
+
+    Only notes whose modification date changed (or that are new) have their
+    body fetched; renames and moves without an edit just update metadata.
+    An empty mirror, or a large backlog of edits, takes the bodies from one
+    bulk dump instead of per-id batches.
+    """
+    if full:
+        db.execute("DELETE FROM notes")
+    known = {
+        row[0]: row[1:]
+        for row in db.execute("SELECT note_id, name, folder, modified FROM notes")
+    }
+    content = None if known else "body"
+
+    folders, notes = [], []
+    for record in iter_bulk_notes(content):
+        if record["type"] == "folder":
+            folders.append(record["folder"])
+            pos = 0
+            continue
+        record["folder_pos"] = len(folders) - 1
+        record["pos"] = pos
+        pos += 1
+        notes.append(record)
+
+    seen = {n["id"] for n in notes}
+    changed = [
+        n["id"]
+        for n in notes
+        if n["id"] not in known or known[n["id"]][2] != n["modified"]
+    ]
+    removed = [(note_id,) for note_id in known if note_id not in seen]
+
+    if content:
+        bodies = ((n["id"], n["content"]) for n in notes)
+    elif len(changed) > MIRROR_BODY_BATCH:
+        wanted = set(changed)
+        bodies = (
+            (r["id"], r["content"])
+            for r in iter_bulk_notes("body")
+            if r["type"] == "note" and r["id"] in wanted
+        )
+    else:
+        bodies = fetch_note_bodies(changed)
+
+    with db:
+        db.execute("DELETE FROM folders")
+        db.executemany(
+            "INSERT OR IGNORE INTO folders (name, pos) VALUES (?, ?)",
+            [(name, pos) for pos, name in enumerate(folders)],
+        )
+        db.executemany("DELETE FROM notes WHERE note_id = ?", removed)
+        for n in notes:
+            meta = (n["name"], n["folder"], n["modified"])
+            if n["id"] not in known:
+                db.execute(
+                    "INSERT INTO notes (note_id, name, folder, modified) VALUES (?, ?, ?, ?)",
+                    (n["id"], *meta),
+                )
+            elif known[n["id"]] != meta:
+                db.execute(
+                    "UPDATE notes SET name = ?, folder = ?, modified = ? WHERE note_id = ?",
+                    (*meta, n["id"]),
+                )
+        # Positions and attachment counts aren't indexed, so always cheap
+        db.executemany(
+            "UPDATE notes SET folder_pos = ?, pos = ?, attachments = ? WHERE note_id = ?",
+            [(n["folder_pos"], n["pos"], n["attachments"], n["id"]) for n in notes],
+        )
+        for note_id, html_body in bodies:
+            db.execute(
+                "UPDATE notes SET html = ?, body = ? WHERE note_id = ?",
+                (html_body, html_to_text(html_body), note_id),
+            )
+    cache_set("mirror", True)
+    return len(changed), len(removed)
+
+
+def get_mirror():
+    """Open the mirror, refreshing it first if older than CACHE_TTL or invalidated."""
+    db = open_mirror()
+    if not cache_get("mirror"):
+        refresh_mirror(db)
+    return db
+
+
+def mirror_folder_names(db):
+    return [row[0] for row in db.execute("SELECT name FROM folders ORDER BY pos")]
+
+
+def mirror_notes(db, folder):
+    """Return notes in a folder as dicts, in Notes order."""
+    rows = db.execute(
+        "SELECT name, modified, attachments FROM notes WHERE folder = ? ORDER BY pos",
+        (folder,),
+    )
+    return [{"name": r[0], "modified": r[1], "attachments": r[2]} for r in rows]
+
+
+def mirror_search(db, query, folder=None):
+    """Case-insensitive substring search over note names and bodies."""
+    if len(query) >= 3:
+        # Trigram index: a quoted phrase matches any substring
+        sql = (
+            "SELECT n.folder, n.name FROM notes_fts JOIN notes n ON n.id = notes_fts.rowid"
+            " WHERE notes_fts MATCH ?"
+        )
+        params = ['{name body} : "' + query.replace('"', '""') + '"']
+    else:
+        # Too short for trigrams; a scan over a few thousand rows is still fast
+        pattern = "%" + re.sub(r"([\\%_])", r"\\\1", query) + "%"
+        sql = (
+            "SELECT n.folder, n.name FROM notes n"
+            " WHERE (n.name LIKE ? ESCAPE '\\' OR n.body LIKE ? ESCAPE '\\')"
+        )
+        params = [pattern, pattern]
+    if folder:
+        sql += " AND n.folder = ?"
+        params.append(folder)
+    sql += " ORDER BY n.folder_pos, n.pos"
+    return [{"folder": r[0], "name": r[1]} for r in db.execute(sql, params)]
+
+
+def mirror_note_html(db, folder, name):
+    """Return the HTML body of a note, or None if it isn't mirrored."""
+    row = db.execute(
+        "SELECT html FROM notes WHERE folder = ? AND name = ? ORDER BY pos LIMIT 1",
+        (folder, name),
+    ).fetchone()
+    return row[0] if row else None
+
+
 # ---------------------------------------------------------------------------
 # Note body helpers
 # ---------------------------------------------------------------------------
@@ -472,6 +810,28 @@ def _get_folder_names():
     return names
 
 
+def _format_note_line(name, mod_date, att_count, prefix=""):
+    """Format a note for `list -l`: name plus date and attachment count."""
+    display = f"{prefix}{name}"
+    meta = []
+    if mod_date:
+        meta.append(mod_date.strip())
+    if int(att_count) > 0:
+        meta.append(f"{att_count} attachment{'s' if int(att_count) != 1 else ''}")
+    if meta:
+        display += f"  [{', '.join(meta)}]"
+    return display
+
+
+def _require_folder(db, folder):
+    if folder not in mirror_folder_names(db):
+        click.echo(
+            f"Error: folder '{folder}' not found (try 'notes refresh' or --live)",
+            err=True,
+        )
+        sys.exit(1)
+
+
 def _print_notes(folder, prefix="", detailed=False):
     """List notes in a folder, optionally prefixing each line."""
     if detailed:
@@ -484,17 +844,7 @@ def _print_notes(folder, prefix="", detailed=False):
                 name = parts[0]
                 mod_date = parts[1] if len(parts) > 1 else ""
                 att_count = parts[2] if len(parts) > 2 else "0"
-                display = f"{prefix}{name}"
-                meta = []
-                if mod_date:
-                    meta.append(mod_date.strip())
-                if int(att_count) > 0:
-                    meta.append(
-                        f"{att_count} attachment{'s' if int(att_count) != 1 else ''}"
-                    )
-                if meta:
-                    display += f"  [{', '.join(meta)}]"
-                click.echo(display)
+                click.echo(_format_note_line(name, mod_date, att_count, prefix))
     else:
         output = run_osascript(LIST_NOTES_SCRIPT, args=[folder])
         if output:
@@ -515,57 +865,113 @@ def _print_notes(folder, prefix="", detailed=False):
     help="Show modification date and attachment count.",
 )
 @click.option("--no-cache", is_flag=True, help="Bypass cache.")
-def list_notes(folder, all_folders, as_json, detailed, no_cache):
+@click.option("--live", is_flag=True, help="Query Notes directly, not the mirror.")
+def list_notes(folder, all_folders, as_json, detailed, no_cache, live):
     """List notes in a folder (or all folders with --all)."""
     if no_cache:
         cache_invalidate()
-    if as_json:
-        result = {}
+    if not live:
+        db = get_mirror()
         if all_folders or not folder:
-            folder_names = _get_folder_names()
+            folder_names = mirror_folder_names(db)
         else:
+            _require_folder(db, folder)
             folder_names = [folder]
+        if as_json:
+            result = {fname: mirror_notes(db, fname) for fname in folder_names}
+            click.echo(json.dumps(result, indent=2))
+            return
+        prefixed = all_folders or not folder
         for fname in folder_names:
-            output = run_osascript(LIST_NOTES_DETAIL_SCRIPT, args=[fname])
-            notes = []
-            if output:
-                for line in output.splitlines():
-                    if not line:
-                        continue
-                    parts = line.split("<<F>>")
-                    notes.append(
-                        {
-                            "name": parts[0],
-                            "modified": parts[1].strip() if len(parts) > 1 else "",
-                            "attachments": int(parts[2]) if len(parts) > 2 else 0,
-                        }
+            prefix = f"{fname}/" if prefixed else ""
+            for note in mirror_notes(db, fname):
+                if detailed:
+                    click.echo(
+                        _format_note_line(
+                            note["name"], note["modified"], note["attachments"], prefix
+                        )
                     )
-            result[fname] = notes
-        click.echo(json.dumps(result, indent=2))
+                else:
+                    click.echo(f"{prefix}{note['name']}")
         return
 
     if all_folders or not folder:
-        folder_names = _get_folder_names()
-        for fname in folder_names:
-            _print_notes(fname, prefix=f"{fname}/", detailed=detailed)
-    else:
-        _print_notes(folder, detailed=detailed)
+        # One bulk run; lines are printed as records arrive
+        result = {}
+        for record in iter_bulk_notes():
+            fname = record["folder"]
+            if record["type"] == "folder":
+                result.setdefault(fname, [])
+            elif as_json:
+                result[fname].append(
+                    {
+                        "name": record["name"],
+                        "modified": record["modified"],
+                        "attachments": record["attachments"],
+                    }
+                )
+            elif detailed:
+                click.echo(
+                    _format_note_line(
+                        record["name"],
+                        record["modified"],
+                        record["attachments"],
+                        f"{fname}/",
+                    )
+                )
+            else:
+                click.echo(f"{fname}/{record['name']}")
+        if as_json:
+            click.echo(json.dumps(result, indent=2))
+        return
+
+    if as_json:
+        output = run_osascript(LIST_NOTES_DETAIL_SCRIPT, args=[folder])
+        notes = []
+        if output:
+            for line in output.splitlines():
+                if not line:
+                    continue
+                parts = line.split("<<F>>")
+                notes.append(
+                    {
+                        "name": parts[0],
+                        "modified": parts[1].strip() if len(parts) > 1 else "",
+                        "attachments": int(parts[2]) if len(parts) > 2 else 0,
+                    }
+                )
+        click.echo(json.dumps({folder: notes}, indent=2))
+        return
+
+    _print_notes(folder, detailed=detailed)
 
 
 @cli.command()
 @click.argument("folder", default="")
 @click.option("--all", "all_folders", is_flag=True, help="Count in all folders.")
 @click.option("--json", "as_json", is_flag=True, help="Output as JSON.")
-def count(folder, all_folders, as_json):
+@click.option("--live", is_flag=True, help="Query Notes directly, not the mirror.")
+def count(folder, all_folders, as_json, live):
     """Count notes in a folder (or all folders with --all)."""
+    if live:
+        folder_counts = None
+    else:
+        db = get_mirror()
+        folder_counts = dict(
+            db.execute("SELECT folder, count(*) FROM notes GROUP BY folder")
+        )
+
     if all_folders or not folder:
-        folder_names = _get_folder_names()
         counts = {}
-        total = 0
-        for fname in folder_names:
-            c = int(run_osascript(COUNT_SCRIPT, args=[fname]))
-            counts[fname] = c
-            total += c
+        if folder_counts is None:
+            for record in iter_bulk_notes():
+                counts.setdefault(record["folder"], 0)
+                if record["type"] == "note":
+                    counts[record["folder"]] += 1
+        else:
+            for fname in mirror_folder_names(db):
+                counts[fname] = folder_counts.get(fname, 0)
+        total = sum(counts.values())
         if as_json:
             counts["_total"] = total
             click.echo(json.dumps(counts, indent=2))
@@ -574,7 +980,11 @@ def count(folder, all_folders, as_json):
                 click.echo(f"{fname}: {c}")
             click.echo(f"Total: {total}")
     else:
-        c = int(run_osascript(COUNT_SCRIPT, args=[folder]))
+        if folder_counts is None:
+            c = int(run_osascript(COUNT_SCRIPT, args=[folder]))
+        else:
+            _require_folder(db, folder)
+            c = folder_counts.get(folder, 0)
         if as_json:
             click.echo(json.dumps({"folder": folder, "count": c}))
         else:
@@ -598,9 +1008,18 @@ def count(folder, all_folders, as_json):
 @click.option(
     "--no-title", is_flag=True, default=False, help="Skip the first line (note title)."
 )
-def view(folder, name, fmt, no_title):
+@click.option("--live", is_flag=True, help="Query Notes directly, not the mirror.")
+def view(folder, name, fmt, no_title, live):
     """View a note's content."""
-    if fmt == "plain":
+    # Notes not in the mirror yet (created since the last refresh) are read live
+    html_body = None if live else mirror_note_html(get_mirror(), folder, name)
+    if html_body is not None:
+        text = html_to_text(html_body, fmt)
+        if no_title:
+            lines = text.split("\n", 1)
+            text = lines[1].lstrip("\n") if len(lines) > 1 else ""
+        click.echo(text)
+    elif fmt == "plain":
         output = run_osascript(
             f"""{find_note()}
     return plaintext of item 1 of matchedNotes""",
@@ -1056,23 +1475,24 @@ SEARCH_SCRIPT = """set matchedNotes to every note in folder (item 1 of argv) who
 @click.argument("query")
 @click.option("--folder", default=None, help="Limit search to a specific folder.")
 @click.option("--json", "as_json", is_flag=True, help="Output as JSON.")
-def search(query, folder, as_json):
+@click.option("--live", is_flag=True, help="Query Notes directly, not the mirror.")
+def search(query, folder, as_json, live):
     """Search notes by content."""
     results = []
-    if folder:
+    if not live:
+        results = mirror_search(get_mirror(), query, folder)
+    elif folder:
         output = run_osascript(SEARCH_SCRIPT, args=[folder, query])
         if output:
             for line in output.splitlines():
                 if line:
                     results.append({"folder": folder, "name": line})
     else:
-        folder_names = _get_folder_names()
-        for fname in folder_names:
-            output = run_osascript(SEARCH_SCRIPT, args=[fname, query])
-            if output:
-                for line in output.splitlines():
-                    if line:
-                        results.append({"folder": fname, "name": line})
+        # Same plaintext match as SEARCH_SCRIPT, done here over one bulk run
+        needle = query.casefold()
+        for record in iter_bulk_notes("plaintext"):
+            if record["type"] == "note" and needle in record["content"].casefold():
+                results.append({"folder": record["folder"], "name": record["name"]})
 
     if as_json:
         click.echo(json.dumps(results, indent=2))
@@ -1100,6 +1520,14 @@ def accounts(as_json):
 # -- cache management -------------------------------------------------------
 
 
+@cli.command()
+@click.option("--full", is_flag=True, help="Rebuild the mirror from scratch.")
+def refresh(full):
+    """Refresh the local mirror used by list, count, search and view."""
+    updated, removed = refresh_mirror(open_mirror(), full=full)
+    click.echo(f"Mirror refreshed: {updated} updated, {removed} removed")
+
+
 @cli.command("clear-cache")
 def clear_cache():
     """Clear the notes cache."""
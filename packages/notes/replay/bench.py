@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Benchmark notes' osascript access patterns against the replaying osascript.
+
+    python3 bench.py generate --notes 5000 --folders 25
+    python3 bench.py run --latency 0.15
+
+`generate` synthesises recordings for a library of the given size: the bulk
+dumps (index, HTML bodies, plaintext) plus the per-folder scripts the CLI
+used before the bulk path. `run` times one-call-per-folder against a single
+bulk call, then the multi-folder commands end to end, counting osascript
+calls. --latency models osascript startup plus the Apple Events connection,
+which the replay itself doesn't pay.
+"""
+
+import argparse
+import importlib.machinery
+import importlib.util
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+NOTES_PY = os.path.join(HERE, "..", "notes.py")
+FAKE_OSASCRIPT = os.path.join(HERE, "osascript")
+DEFAULT_DIR = os.path.join(HERE, "recordings")
+WORDS = (
+    "alpha bravo charlie delta echo foxtrot golf hotel india juliet kilo lima".split()
+)
+
+
+def load_notes():
+    spec = importlib.util.spec_from_file_location("notes", NOTES_PY)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_replay():
+    spec = importlib.util.spec_from_loader(
+        "replay_osascript",
+        importlib.machinery.SourceFileLoader("replay_osascript", FAKE_OSASCRIPT),
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def synth_library(note_count, folder_count, seed=0):
+    rng = random.Random(seed)
+    folders = {f"Folder {i:02d}": [] for i in range(folder_count)}
+    names = list(folders)
+    for i in range(note_count):
+        title = f"Note {i:05d} {rng.choice(WORDS)}"
+        paragraphs = [
+            " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 40)))
+            for _ in range(rng.randint(1, 12))
+        ]
+        folders[rng.choice(names)].append(
+            {
+                "id": f"x-coredata://BENCH/ICNote/p{i + 1}",
+                "name": title,
+                "modified": f"Monday, {1 + i % 28} January 2024 at 10:{i % 60:02d}:00",
+                "attachments": rng.choice([0, 0, 0, 1, 2]),
+                "body": f"<div><h1>{title}</h1></div>"
+                + "".join(f"<div>{p}</div>" for p in paragraphs),
+                "plaintext": "\n".join([title] + paragraphs),
+            }
+        )
+    return folders
+
+
+def generate(args):
+    notes = load_notes()
+    replay = load_replay()
+    library = synth_library(args.notes, args.folders)
+    os.makedirs(args.dir, exist_ok=True)
+
+    def record(body, output, script_args=None):
+        argv = notes._osascript_command(body, script_args)[1:]
+        key = replay.recording_key(argv)
+        with open(os.path.join(args.dir, f"{key}.out"), "w") as f:
+            f.write(output + "\n")
+        with open(os.path.join(args.dir, f"{key}.json"), "w") as f:
+            json.dump({"returncode": 0, "stderr": "", "argv": argv}, f)
+
+    us, rs = notes.FIELD_SEP, notes.RECORD_SEP
+    for content in (None, "body", "plaintext"):
+        records = []
+        for fname, folder_notes in library.items():
+            records.append(us.join(["F", "iCloud", fname]))
+            for n in folder_notes:
+                fields = ["N", n["id"], n["name"], n["modified"], str(n["attachments"])]
+                if content:
+                    fields.append(n[content])
+                records.append(us.join(fields))
+        record(notes.bulk_notes_script(content), rs.join(records))
+
+    record("get name of every folder", ", ".join(library))
+    for fname, folder_notes in library.items():
+        record(
+            notes.LIST_NOTES_DETAIL_SCRIPT,
+            "".join(
+                f"{n['name']}<<F>>{n['modified']}<<F>>{n['attachments']}\n"
+                for n in folder_notes
+            ),
+            [fname],
+        )
+        record(notes.COUNT_SCRIPT, str(len(folder_notes)), [fname])
+        record(
+            notes.LIST_NOTES_SCRIPT,
+            "".join(f"{n['name']}\n" for n in folder_notes),
+            [fname],
+        )
+    print(f"Wrote recordings for {args.notes} notes in {args.folders} folders")
+    print(f"  {args.dir}")
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"  {label:<34} {time.perf_counter() - start:8.3f}s  {result}")
+
+
+def run(args):
+    env = dict(os.environ)
+    env["PATH"] = f"{HERE}{os.pathsep}{env['PATH']}"
+    env["NOTES_REPLAY_DIR"] = args.dir
+    env["NOTES_REPLAY_LATENCY"] = str(args.latency)
+    state = tempfile.mkdtemp(prefix="notes-bench-")
+    env["XDG_STATE_HOME"] = env["XDG_CACHE_HOME"] = state
+    env["NOTES_REPLAY_LOG"] = log_path = os.path.join(state, "calls.log")
+    os.environ.update(env)
+
+    notes = load_notes()
+    folder_names = notes.run_osascript("get name of every folder").split(", ")
+
+    def per_folder():
+        rows = 0
+        for fname in folder_names:
+            output = notes.run_osascript(notes.LIST_NOTES_DETAIL_SCRIPT, args=[fname])
+            rows += len(output.splitlines())
+        return f"{rows} notes, {len(folder_names)} calls"
+
+    def bulk():
+        rows = sum(1 for r in notes.iter_bulk_notes() if r["type"] == "note")
+        return f"{rows} notes, 1 call"
+
+    print(f"Access pattern (latency {args.latency}s per call)")
+    timed("per-folder detail scripts", per_folder)
+    timed("bulk index", bulk)
+
+    print("Commands end to end")
+    commands = [
+        ["list", "--all", "-l", "--live"],
+        ["count", "--all", "--live"],
+        ["search", args.query, "--live"],
+        ["refresh", "--full"],
+        ["search", args.query],
+    ]
+    for command in commands:
+        open(log_path, "w").close()
+
+        def invoke():
+            subprocess.run(
+                [sys.executable, NOTES_PY] + command,
+                env=env,
+                check=True,
+                stdout=subprocess.DEVNULL,
+            )
+            with open(log_path) as f:
+                return f"{sum(1 for _ in f)} osascript calls"
+
+        timed(" ".join(command), invoke)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dir", default=DEFAULT_DIR, help="Recordings directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    gen = sub.add_parser("generate", help="Synthesise recordings")
+    gen.add_argument("--notes", type=int, default=5000)
+    gen.add_argument("--folders", type=int, default=25)
+    bench = sub.add_parser("run", help="Time access patterns and commands")
+    bench.add_argument("--latency", type=float, default=0.0)
+    bench.add_argument("--query", default="foxtrot golf")
+    args = parser.parse_args()
+    {"generate": generate, "run": run}[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,25 +2,93 @@
 """Sync local git repositories to/from remotes.
 
 Safe-only operations: ff-only pull, no-force push. Skips and alerts on conflicts.
+Repositories are processed in parallel (--jobs), with at most --per-host network
+operations against any one remote host. Output is printed in config order,
+ALERT lines as soon as they happen, and alerts are sent as a single Discord
+message per run.
+
+Before fetching, the remote branch tip is checked with `git ls-remote`; when it
+matches the remote-tracking ref (the tip seen by the last fetch) the fetch is
+skipped. SSH connections to the same host are shared across repos for the run.
 
 Commands:
   reposync init   --config-file <path>   Idempotent repo/remote setup
   reposync sync   --config-file <path>   Sync all configured repos
   reposync status --config-file <path>   Show sync state of all repos
+                  [--no-fetch]           ...from local refs only, no network
 """
 
 import argparse
 import json
 import os
 import platform
+import re
+import shlex
 import subprocess
 import sys
+import threading
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
 
 GIT_TIMEOUT = 60
+DEFAULT_JOBS = 4
+DEFAULT_PER_HOST = 2
+DISCORD_MESSAGE_LIMIT = 2000
+# One master connection per host/user/port, kept briefly for the next repo
+SSH_MULTIPLEX_OPTIONS = "-o ControlMaster=auto -o ControlPersist=60"
+
+# Per-thread output buffer so parallel repos don't interleave
+_output = threading.local()
+_print_lock = threading.Lock()
+_host_slots = {}
+_host_slots_lock = threading.Lock()
+_per_host = DEFAULT_PER_HOST
+_ssh_multiplex = True
+
+
+def emit(message, file=None):
+    """Print a line, or buffer it when running inside a repo worker."""
+    file = file or sys.stdout
+    lines = getattr(_output, "lines", None)
+    if lines is None:
+        print(message, file=file)
+    else:
+        lines.append((file, message))
+
+
+def captured(fn, *args):
+    """Run fn with output buffered; return (result, [(file, line), ...])."""
+    _output.lines = []
+    try:
+        return fn(*args), _output.lines
+    finally:
+        _output.lines = None
+
+
+def remote_host(remote_url):
+    """Host part of a git remote URL (scp-like, ssh://, https://), or the URL itself."""
+    match = re.match(r"^[a-z+]+://(?:[^@/]+@)?([^:/]+)", remote_url)
+    if match:
+        return match.group(1)
+    match = re.match(r"^(?:[^@/]+@)?([^:/]+):", remote_url)
+    if match:
+        return match.group(1)
+    return remote_url
+
+
+@contextmanager
+def host_slot(repo):
+    """Hold one of the --per-host network slots for the repo's remote host."""
+    host = remote_host(repo.get("remoteUrl", ""))
+    with _host_slots_lock:
+        slot = _host_slots.setdefault(host, threading.BoundedSemaphore(_per_host))
+    with slot:
+        yield
 
 
-def run_git(*args, cwd=None, check=True, timeout=GIT_TIMEOUT):
+def run_git(*args, cwd=None, check=True, timeout=GIT_TIMEOUT, env=None):
     try:
         result = subprocess.run(
             ["git"] + list(args),
@@ -28,14 +96,163 @@ def run_git(*args, cwd=None, check=True, timeout=GIT_TIMEOUT):
             capture_output=True,
             text=True,
             timeout=timeout,
+            env=env,
         )
     except subprocess.TimeoutExpired:
-        return subprocess.CompletedProcess(args, 1, "", f"git {args[0]} timed out after {timeout}s")
+        return subprocess.CompletedProcess(
+            args, 1, "", f"git {args[0]} timed out after {timeout}s"
+        )
     if check and result.returncode != 0:
-        print(f"Error: {result.stderr.strip()}", file=sys.stderr)
+        emit(f"Error: {result.stderr.strip()}", file=sys.stderr)
     return result
 
 
+@dataclass
+class RefState:
+    """Branch tips and divergence for one repo, read with two git calls."""
+
+    head_branch: str | None
+    local_sha: str | None
+    remote_sha: str | None
+    ahead: int = 0
+    behind: int = 0
+
+    @property
+    def local_exists(self) -> bool:
+        return self.local_sha is not None
+
+    @property
+    def remote_exists(self) -> bool:
+        return self.remote_sha is not None
+
+
+def probe_refs(path, remote, branch):
+    """Read HEAD, local/remote tips and ahead/behind counts.
+
+    One `for-each-ref` lists local heads (marking the one HEAD points to)
+    and the remote-tracking ref; one `rev-list --left-right --count` is only
+    run when both tips exist and differ. Returns None if git fails.
+    """
+    local_ref = f"refs/heads/{branch}"
+    remote_ref = f"refs/remotes/{remote}/{branch}"
+    result = run_git(
+        "for-each-ref",
+        "--format=%(HEAD)%09%(refname)%09%(objectname)",
+        "refs/heads/",
+        remote_ref,
+        cwd=path,
+        check=False,
+    )
+    if result.returncode != 0:
+        return None
+
+    state = RefState(head_branch=None, local_sha=None, remote_sha=None)
+    for line in result.stdout.splitlines():
+        head, refname, sha = line.split("\t")
+        if head == "*":
+            state.head_branch = refname.removeprefix("refs/heads/")
+        if refname == local_ref:
+            state.local_sha = sha
+        elif refname == remote_ref:
+            state.remote_sha = sha
+
+    if (
+        state.local_exists
+        and state.remote_exists
+        and state.local_sha != state.remote_sha
+    ):
+        counts = run_git(
+            "rev-list",
+            "--left-right",
+            "--count",
+            f"{state.local_sha}...{state.remote_sha}",
+            cwd=path,
+            check=False,
+        )
+        if counts.returncode == 0:
+            ahead, behind = counts.stdout.split()
+            state.ahead, state.behind = int(ahead), int(behind)
+    return state
+
+
+def ssh_multiplex_command():
+    """ssh command sharing one connection per host, or None if it can't.
+
+    The control socket lives in a directory only this user can write
+    ($XDG_RUNTIME_DIR, else ~/.ssh): at a predictable path in /tmp another
+    local user could create it first and have ssh talk to their socket.
+    """
+    control_dir = os.environ.get("XDG_RUNTIME_DIR") or os.path.expanduser("~/.ssh")
+    try:
+        os.makedirs(control_dir, mode=0o700, exist_ok=True)
+    except OSError:
+        return None
+    control_path = os.path.join(control_dir, "reposync-%C")
+    return (
+        f"ssh {SSH_MULTIPLEX_OPTIONS} -o {shlex.quote(f'ControlPath={control_path}')}"
+    )
+
+
+def network_env(path):
+    """Environment for fetch/push/ls-remote that multiplexes SSH per host.
+
+    Left alone when the user already chose an SSH command (GIT_SSH,
+    GIT_SSH_COMMAND or core.sshCommand from any config file git reads),
+    which GIT_SSH_COMMAND would override.
+    """
+    if not _ssh_multiplex or "GIT_SSH_COMMAND" in os.environ or "GIT_SSH" in os.environ:
+        return None
+    configured = run_git("config", "--get", "core.sshCommand", cwd=path, check=False)
+    if configured.stdout.strip():
+        return None
+    command = ssh_multiplex_command()
+    if command is None:
+        return None
+    return {**os.environ, "GIT_SSH_COMMAND": command}
+
+
+def remote_tip(repo):
+    """Current tip of the remote branch via ls-remote.
+
+    Returns the sha, "" if the branch doesn't exist on the remote, or None if
+    the remote couldn't be queried.
+    """
+    path = repo["path"]
+    with host_slot(repo):
+        result = run_git(
+            "ls-remote",
+            "--heads",
+            repo["remote"],
+            f"refs/heads/{repo['branch']}",
+            cwd=path,
+            check=False,
+            env=network_env(path),
+        )
+    if result.returncode != 0:
+        return None
+    for line in result.stdout.splitlines():
+        sha, _, refname = line.partition("\t")
+        if refname == f"refs/heads/{repo['branch']}":
+            return sha
+    return ""
+
+
+def fetch_if_changed(repo, tracking_sha, always_fetch=False):
+    """Fetch unless ls-remote shows the remote branch hasn't moved.
+
+    tracking_sha is the remote-tracking ref, i.e. the tip seen by the last
+    fetch, so no separate fingerprint state is kept. Returns the fetch
+    result, or None if the fetch was skipped.
+    """
+    path = repo["path"]
+    if not always_fetch and remote_tip(repo) == (tracking_sha or ""):
+        return None
+    with host_slot(repo):
+        return run_git(
+            "fetch", repo["remote"], cwd=path, check=False, env=network_env(path)
+        )
+
+
 def has_git_lock(path):
     git_dir = os.path.join(path, ".git")
     for lock in ("index.lock", "HEAD.lock", "config.lock"):
@@ -74,13 +291,44 @@ def get_discord_webhook(config):
     return None
 
 
-def alert(webhook_url, message):
-    print(f"ALERT: {message}", file=sys.stderr)
-    if webhook_url:
-        send_discord(webhook_url, message)
+class Alerts:
+    """Collects alerts during a run and sends them as one Discord message."""
+
+    def __init__(self, webhook_url=None):
+        self.webhook_url = webhook_url
+        self.messages = []
+        self.lock = threading.Lock()
+
+    def add(self, message):
+        with self.lock:
+            self.messages.append(message)
+
+    def flush(self):
+        if not self.webhook_url or not self.messages:
+            return
+        header = f"{len(self.messages)} alert(s):"
+        chunks = [header]
+        for message in self.messages:
+            line = f"- {message}"
+            # Stay under Discord's message size limit (prefix included)
+            if len(chunks[-1]) + len(line) + 1 > DISCORD_MESSAGE_LIMIT - 100:
+                chunks.append(line)
+            else:
+                chunks[-1] += "\n" + line
+        for chunk in chunks:
+            send_discord(self.webhook_url, chunk)
+        self.messages = []
+
 
+def alert(alerts, message):
+    """Print an ALERT line right away, even from a buffered repo worker."""
+    with _print_lock:
+        print(f"ALERT: {message}", file=sys.stderr, flush=True)
+    if alerts:
+        alerts.add(message)
 
-def init_repo(repo, webhook_url=None):
+
+def init_repo(repo, alerts=None):
     path = repo["path"]
     remote = repo["remote"]
     remote_url = repo["remoteUrl"]
@@ -89,56 +337,76 @@ def init_repo(repo, webhook_url=None):
     name = f"{display} ({remote}/{branch})"
 
     if not os.path.isdir(path):
-        print(f"{name}: skip ({path} does not exist)", file=sys.stderr)
+        emit(f"{name}: skip ({path} does not exist)", file=sys.stderr)
         return True
 
     git_dir = os.path.join(path, ".git")
     if not os.path.isdir(git_dir):
-        print(f"{name}: initializing git repo at {path}", file=sys.stderr)
+        emit(f"{name}: initializing git repo at {path}", file=sys.stderr)
         result = run_git("init", cwd=path)
         if result.returncode != 0:
-            alert(webhook_url, f"`{name}`: git init failed")
+            alert(alerts, f"`{name}`: git init failed")
             return False
 
     # Ensure remote exists with correct URL
     result = run_git("remote", "get-url", remote, cwd=path, check=False)
     if result.returncode != 0:
-        print(f"{name}: adding remote {remote} -> {remote_url}", file=sys.stderr)
+        emit(f"{name}: adding remote {remote} -> {remote_url}", file=sys.stderr)
         run_git("remote", "add", remote, remote_url, cwd=path)
     elif result.stdout.strip() != remote_url:
-        print(f"{name}: updating remote {remote} -> {remote_url}", file=sys.stderr)
+        emit(f"{name}: updating remote {remote} -> {remote_url}", file=sys.stderr)
         run_git("remote", "set-url", remote, remote_url, cwd=path)
     else:
-        print(f"{name}: remote {remote} OK", file=sys.stderr)
+        emit(f"{name}: remote {remote} OK", file=sys.stderr)
 
     # Fetch from remote
-    result = run_git("fetch", remote, cwd=path, check=False)
+    with host_slot(repo):
+        result = run_git("fetch", remote, cwd=path, check=False, env=network_env(path))
     if result.returncode != 0:
-        alert(webhook_url, f"`{name}`: fetch failed — {result.stderr.strip()}")
+        alert(alerts, f"`{name}`: fetch failed — {result.stderr.strip()}")
         return False
 
     # Ensure branch exists and tracks remote
-    result = run_git("rev-parse", "--verify", branch, cwd=path, check=False)
-    if result.returncode != 0:
+    state = probe_refs(path, remote, branch)
+    if state is None:
+        alert(alerts, f"`{name}`: could not read refs")
+        return False
+    if not state.local_exists:
         # Local branch doesn't exist — check if remote branch does
-        result = run_git("rev-parse", "--verify", f"{remote}/{branch}", cwd=path, check=False)
-        if result.returncode == 0:
-            print(f"{name}: creating branch {branch} tracking {remote}/{branch}", file=sys.stderr)
-            result = run_git("checkout", "-b", branch, "--track", f"{remote}/{branch}", cwd=path, check=False)
+        if state.remote_exists:
+            emit(
+                f"{name}: creating branch {branch} tracking {remote}/{branch}",
+                file=sys.stderr,
+            )
+            result = run_git(
+                "checkout",
+                "-b",
+                branch,
+                "--track",
+                f"{remote}/{branch}",
+                cwd=path,
+                check=False,
+            )
             if result.returncode != 0:
-                alert(webhook_url, f"`{name}`: failed to create branch {branch} — {result.stderr.strip()}")
+                alert(
+                    alerts,
+                    f"`{name}`: failed to create branch {branch} — {result.stderr.strip()}",
+                )
                 return False
         else:
-            print(f"{name}: branch {branch} not on remote yet (will be created on first push)", file=sys.stderr)
+            emit(
+                f"{name}: branch {branch} not on remote yet (will be created on first push)",
+                file=sys.stderr,
+            )
     else:
         # Set upstream tracking
         run_git("branch", "-u", f"{remote}/{branch}", branch, cwd=path, check=False)
 
-    print(f"{name}: init complete", file=sys.stderr)
+    emit(f"{name}: init complete", file=sys.stderr)
     return True
 
 
-def sync_repo(repo, webhook_url=None):
+def sync_repo(repo, alerts=None, always_fetch=False):
     path = repo["path"]
     remote = repo["remote"]
     branch = repo["branch"]
@@ -147,83 +415,88 @@ def sync_repo(repo, webhook_url=None):
     name = f"{display} ({remote}/{branch})"
 
     if not os.path.isdir(path):
-        print(f"{name}: skip ({path} does not exist)", file=sys.stderr)
+        emit(f"{name}: skip ({path} does not exist)", file=sys.stderr)
         return True
 
     if not os.path.isdir(os.path.join(path, ".git")):
-        print(f"{name}: skip (not a git repo)", file=sys.stderr)
+        emit(f"{name}: skip (not a git repo)", file=sys.stderr)
         return True
 
     if has_git_lock(path):
-        print(f"{name}: skip (git lock file exists)", file=sys.stderr)
+        emit(f"{name}: skip (git lock file exists)", file=sys.stderr)
         return True
 
     ok = True
     actions = []
 
-    # Fetch
-    result = run_git("fetch", remote, cwd=path, check=False)
-    if result.returncode != 0:
-        alert(webhook_url, f"`{name}`: fetch failed — {result.stderr.strip()}")
+    state = probe_refs(path, remote, branch)
+    if state is None:
+        alert(alerts, f"`{name}`: could not read refs")
         return False
 
-    # Check if remote branch exists
-    result = run_git("rev-parse", "--verify", f"{remote}/{branch}", cwd=path, check=False)
-    remote_exists = result.returncode == 0
-
-    # Check if local branch exists
-    result = run_git("rev-parse", "--verify", branch, cwd=path, check=False)
-    local_exists = result.returncode == 0
+    # Fetch (skipped when the remote branch hasn't moved since the last fetch)
+    result = fetch_if_changed(repo, state.remote_sha, always_fetch)
+    if result is not None:
+        if result.returncode != 0:
+            alert(alerts, f"`{name}`: fetch failed — {result.stderr.strip()}")
+            return False
+        state = probe_refs(path, remote, branch)
+        if state is None:
+            alert(alerts, f"`{name}`: could not read refs")
+            return False
 
     # Pull (ff-only) — only if HEAD is on the target branch and this repo allows pulls.
     if sync_mode == "push-only":
-        print(f"{name}: skip pull (push-only mode)", file=sys.stderr)
-    elif remote_exists and local_exists:
-        head_ref = run_git("symbolic-ref", "--short", "HEAD", cwd=path, check=False)
-        current_branch = head_ref.stdout.strip() if head_ref.returncode == 0 else None
-
-        if current_branch != branch:
-            print(f"{name}: skip pull (HEAD is on {current_branch!r}, not {branch!r})", file=sys.stderr)
-        else:
-            local_before = run_git("rev-parse", branch, cwd=path, check=False).stdout.strip()
-            result = run_git("merge", "--ff-only", f"{remote}/{branch}", cwd=path, check=False)
+        emit(f"{name}: skip pull (push-only mode)", file=sys.stderr)
+    elif state.remote_exists and state.local_exists:
+        if state.head_branch != branch:
+            emit(
+                f"{name}: skip pull (HEAD is on {state.head_branch!r}, not {branch!r})",
+                file=sys.stderr,
+            )
+        elif state.behind:
+            result = run_git(
+                "merge", "--ff-only", f"{remote}/{branch}", cwd=path, check=False
+            )
             if result.returncode != 0:
-                alert(webhook_url, f"`{name}`: pull failed (not fast-forward) — resolve manually")
+                alert(
+                    alerts,
+                    f"`{name}`: pull failed (not fast-forward) — resolve manually",
+                )
                 ok = False
             else:
-                local_after = run_git("rev-parse", branch, cwd=path, check=False).stdout.strip()
-                if local_before != local_after:
-                    count = run_git("rev-list", "--count", f"{local_before}..{local_after}", cwd=path, check=False)
-                    n = count.stdout.strip() if count.returncode == 0 else "?"
-                    actions.append(f"pulled {n} commit(s)")
-
-    # Push
-    if local_exists:
-        local_sha = run_git("rev-parse", branch, cwd=path, check=False).stdout.strip()
-        remote_sha = run_git("rev-parse", f"{remote}/{branch}", cwd=path, check=False).stdout.strip() if remote_exists else None
-        result = run_git("push", remote, branch, cwd=path, check=False)
+                actions.append(f"pulled {state.behind} commit(s)")
+                state.local_sha, state.behind = state.remote_sha, 0
+
+    # Push — the remote-tracking ref was just fetched, so nothing ahead means nothing to push
+    if state.local_exists and (state.ahead or not state.remote_exists):
+        with host_slot(repo):
+            result = run_git(
+                "push", remote, branch, cwd=path, check=False, env=network_env(path)
+            )
         if result.returncode != 0:
             stderr = result.stderr.strip()
             if "non-fast-forward" in stderr or "rejected" in stderr:
-                alert(webhook_url, f"`{name}`: push rejected (non-fast-forward) — resolve manually")
+                alert(
+                    alerts,
+                    f"`{name}`: push rejected (non-fast-forward) — resolve manually",
+                )
             else:
-                alert(webhook_url, f"`{name}`: push failed — {stderr}")
+                alert(alerts, f"`{name}`: push failed — {stderr}")
             ok = False
-        elif remote_sha and local_sha != remote_sha:
-            count = run_git("rev-list", "--count", f"{remote_sha}..{local_sha}", cwd=path, check=False)
-            n = count.stdout.strip() if count.returncode == 0 else "?"
-            actions.append(f"pushed {n} commit(s)")
-    elif not remote_exists:
-        print(f"{name}: skip (no local or remote branch yet)", file=sys.stderr)
+        elif state.remote_exists:
+            actions.append(f"pushed {state.ahead} commit(s)")
+    elif not state.local_exists and not state.remote_exists:
+        emit(f"{name}: skip (no local or remote branch yet)", file=sys.stderr)
 
     if ok:
         summary = ", ".join(actions) if actions else "up to date"
-        print(f"{name}: OK ({summary})", file=sys.stderr)
+        emit(f"{name}: OK ({summary})", file=sys.stderr)
 
     return ok
 
 
-def status_repo(repo):
+def status_repo(repo, fetch=True, always_fetch=False):
     path = repo["path"]
     remote = repo["remote"]
     branch = repo["branch"]
@@ -231,50 +504,87 @@ def status_repo(repo):
     name = f"{display} ({remote}/{branch})"
 
     if not os.path.isdir(path) or not os.path.isdir(os.path.join(path, ".git")):
-        print(f"{name}: not a repo")
+        emit(f"{name}: not a repo")
         return
 
+    state = probe_refs(path, remote, branch)
     # Fetch silently
-    run_git("fetch", remote, cwd=path, check=False)
-
-    local = run_git("rev-parse", branch, cwd=path, check=False)
-    remote_ref = run_git("rev-parse", f"{remote}/{branch}", cwd=path, check=False)
+    if (
+        fetch
+        and state is not None
+        and fetch_if_changed(repo, state.remote_sha, always_fetch)
+    ):
+        state = probe_refs(path, remote, branch)
+    if state is None:
+        emit(f"{name}: could not read refs")
+        return
 
-    if local.returncode != 0:
-        print(f"{name}: no local branch")
+    if not state.local_exists:
+        emit(f"{name}: no local branch")
         return
-    if remote_ref.returncode != 0:
-        print(f"{name}: no remote branch (local only)")
+    if not state.remote_exists:
+        emit(f"{name}: no remote branch (local only)")
         return
 
-    local_sha = local.stdout.strip()
-    remote_sha = remote_ref.stdout.strip()
-
-    if local_sha == remote_sha:
-        print(f"{name}: up to date")
+    if state.local_sha == state.remote_sha:
+        emit(f"{name}: up to date")
         return
 
-    ahead = run_git("rev-list", "--count", f"{remote}/{branch}..{branch}", cwd=path, check=False)
-    behind = run_git("rev-list", "--count", f"{branch}..{remote}/{branch}", cwd=path, check=False)
-    a = int(ahead.stdout.strip()) if ahead.returncode == 0 else 0
-    b = int(behind.stdout.strip()) if behind.returncode == 0 else 0
-
+    a, b = state.ahead, state.behind
     if a > 0 and b > 0:
-        print(f"{name}: DIVERGED (ahead {a}, behind {b})")
+        emit(f"{name}: DIVERGED (ahead {a}, behind {b})")
     elif a > 0:
-        print(f"{name}: ahead {a}")
+        emit(f"{name}: ahead {a}")
     elif b > 0:
-        print(f"{name}: behind {b}")
+        emit(f"{name}: behind {b}")
+
+
+def run_repos(repos, fn, jobs):
+    """Run fn(repo) for every repo in parallel and print output in config order.
+
+    Entries sharing a path run sequentially in one worker so they never race
+    on the same .git directory. Returns the results in config order.
+    """
+    groups = {}
+    for index, repo in enumerate(repos):
+        key = os.path.realpath(repo["path"])
+        groups.setdefault(key, []).append(index)
+
+    def run_group(indices):
+        return {index: captured(fn, repos[index]) for index in indices}
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        futures = {}
+        for indices in groups.values():
+            future = executor.submit(run_group, indices)
+            for index in indices:
+                futures[index] = future
+
+        results = []
+        for index in range(len(repos)):
+            result, lines = futures[index].result()[index]
+            with _print_lock:
+                for file, line in lines:
+                    print(line, file=file)
+            results.append(result)
+    return results
+
+
+def configure_parallelism(args):
+    global _per_host, _ssh_multiplex
+    _per_host = max(1, args.per_host)
+    _ssh_multiplex = not args.no_ssh_multiplex
 
 
 def cmd_init(args):
     config = load_config(args.config_file)
-    webhook_url = get_discord_webhook(config)
-    all_ok = True
-    for repo in config.get("repositories", []):
-        if not init_repo(repo, webhook_url):
-            all_ok = False
-    return 0 if all_ok else 1
+    configure_parallelism(args)
+    alerts = Alerts(get_discord_webhook(config))
+    results = run_repos(
+        config.get("repositories", []), lambda repo: init_repo(repo, alerts), args.jobs
+    )
+    alerts.flush()
+    return 0 if all(results) else 1
 
 
 def needs_init(repo):
@@ -297,27 +607,37 @@ def needs_init(repo):
     return False
 
 
-def cmd_sync(args):
-    config = load_config(args.config_file)
-    webhook_url = get_discord_webhook(config)
+def init_and_sync_repo(repo, alerts, always_fetch=False):
+    # Only init repos that need it (init fetches, so sync doesn't need to)
+    if needs_init(repo):
+        init_repo(repo, alerts)
+        always_fetch = False
+    return sync_repo(repo, alerts, always_fetch)
 
-    # Only init repos that need it
-    for repo in config.get("repositories", []):
-        if needs_init(repo):
-            init_repo(repo, webhook_url)
 
-    # Then sync
-    all_ok = True
-    for repo in config.get("repositories", []):
-        if not sync_repo(repo, webhook_url):
-            all_ok = False
-    return 0 if all_ok else 1
+def cmd_sync(args):
+    config = load_config(args.config_file)
+    configure_parallelism(args)
+    alerts = Alerts(get_discord_webhook(config))
+    results = run_repos(
+        config.get("repositories", []),
+        lambda repo: init_and_sync_repo(repo, alerts, args.always_fetch),
+        args.jobs,
+    )
+    alerts.flush()
+    return 0 if all(results) else 1
 
 
 def cmd_status(args):
     config = load_config(args.config_file)
-    for repo in config.get("repositories", []):
-        status_repo(repo)
+    configure_parallelism(args)
+    run_repos(
+        config.get("repositories", []),
+        lambda repo: status_repo(
+            repo, fetch=not args.no_fetch, always_fetch=args.always_fetch
+        ),
+        args.jobs,
+    )
     return 0
 
 
@@ -328,6 +648,36 @@ def main():
     for name in ("init", "sync", "status"):
         sub = subparsers.add_parser(name)
         sub.add_argument("--config-file", required=True)
+        sub.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=DEFAULT_JOBS,
+            help=f"Repositories processed in parallel (default: {DEFAULT_JOBS})",
+        )
+        sub.add_argument(
+            "--per-host",
+            type=int,
+            default=DEFAULT_PER_HOST,
+            help=f"Concurrent fetch/push operations per remote host (default: {DEFAULT_PER_HOST})",
+        )
+        sub.add_argument(
+            "--no-ssh-multiplex",
+            action="store_true",
+            help="Don't share SSH connections per host (ControlMaster)",
+        )
+
+    subparsers.choices["status"].add_argument(
+        "--no-fetch",
+        action="store_true",
+        help="Report from the last fetched remote-tracking refs without contacting remotes",
+    )
+    for name in ("sync", "status"):
+        subparsers.choices[name].add_argument(
+            "--always-fetch",
+            action="store_true",
+            help="Fetch even when ls-remote shows the remote branch unchanged",
+        )
 
     args = parser.parse_args()
     commands = {"init": cmd_init, "sync": cmd_sync, "status": cmd_status}
@@ -1,6 +1,7 @@
 { pkgs }:
 
 pkgs.writeShellScriptBin "syncthing-mgmt" ''
+  export PYTHONPATH="${../mgmt-http}:$PYTHONPATH"
   exec ${
     pkgs.python3.withPackages (ps: [
       ps.requests
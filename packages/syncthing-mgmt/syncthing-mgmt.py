@@ -5,8 +5,10 @@ Applies GUI credentials and device IDs via Syncthing REST API.
 """
 
 import sys
+import copy
 import json
 import time
+import atexit
 import requests
 import argparse
 import xml.etree.ElementTree as ET
@@ -16,13 +18,27 @@ import os
 import subprocess
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any, Tuple
-from rich.console import Console
+from rich.console import Console, Group
+from rich.live import Live
+from rich.text import Text
 from rich.table import Table
 from rich import box
 
+# Shared transport lives in packages/mgmt-http (on PYTHONPATH when built by Nix)
+sys.path.append(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "../mgmt-http")
+)
+from mgmt_http import CircuitOpenError, HttpTransport  # noqa: E402
+
 USER_AGENT = "syncthing-mgmt/1.0.0"
 
+# Parallel workers per fetch helper; status runs two helpers at once, so the
+# connection pool holds enough keep-alive connections for both.
+FETCH_WORKERS = 5
+POOL_SIZE = 2 * FETCH_WORKERS
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
 
@@ -35,66 +51,66 @@ class SyncthingClient:
         timeout: int = 30,
         max_retries: int = 5,
         retry_delay: float = 2.0,
+        pool_size: int = POOL_SIZE,
     ):
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.max_retries = max_retries
-        self.retry_delay = retry_delay
-        self.headers = {
-            "User-Agent": USER_AGENT,
-            "X-API-Key": api_key,
-        }
+        self.transport = HttpTransport(
+            self.base_url,
+            headers={
+                "User-Agent": USER_AGENT,
+                "X-API-Key": api_key,
+            },
+            timeout=timeout,
+            pool_size=pool_size,
+            max_retries=max_retries,
+            retry_delay=retry_delay,
+        )
 
-    def _api_call(self, method: str, endpoint: str, data=None):
-        """Make API request with error handling and retry logic."""
-        url = f"{self.base_url}{endpoint}"
-        last_error = None
+    def _api_call(
+        self, method: str, endpoint: str, data=None, timeout: Optional[float] = None
+    ):
+        """Make API request with error handling (retries live in the transport)."""
+        try:
+            response = self.transport.request(
+                method, endpoint, json=data, timeout=timeout
+            )
+        except CircuitOpenError as e:
+            raise Exception(f"Syncthing at {self.base_url} is down: {e}") from e
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Network error after retries: {e}") from e
 
-        for attempt in range(self.max_retries):
+        if response.status_code not in (200, 201, 204):
             try:
-                response = requests.request(
-                    method, url, json=data, headers=self.headers, timeout=self.timeout
+                error_data = response.json()
+                logging.debug(f"DEBUG: Error response: {error_data}")
+                message = error_data.get("error", "Unknown error")
+                raise Exception(
+                    f"API error: {message} (Status: {response.status_code})"
                 )
-
-                if response.status_code not in (200, 201, 204):
-                    try:
-                        error_data = response.json()
-                        logging.debug(f"DEBUG: Error response: {error_data}")
-                        message = error_data.get("error", "Unknown error")
-                        raise Exception(
-                            f"API error: {message} (Status: {response.status_code})"
-                        )
-                    except ValueError:
-                        logging.debug(f"DEBUG: Response text: {response.text}")
-                        raise Exception(
-                            f"API request failed with status {response.status_code}"
-                        )
-
-                if response.status_code == 204:
-                    return None
-
-                try:
-                    return response.json()
-                except ValueError:
-                    return {"success": True}
-
-            except requests.exceptions.RequestException as e:
-                last_error = e
-                if attempt < self.max_retries - 1:
-                    wait_time = self.retry_delay * (2**attempt)  # Exponential backoff
-                    logging.info(
-                        f"    Connection error, retrying in {wait_time:.1f}s... (attempt {attempt + 1}/{self.max_retries})"
-                    )
-                    time.sleep(wait_time)
-                    continue
+            except ValueError:
+                logging.debug(f"DEBUG: Response text: {response.text}")
                 raise Exception(
-                    f"Network error after {self.max_retries} attempts: {last_error}"
+                    f"API request failed with status {response.status_code}"
                 )
 
+        if response.status_code == 204:
+            return None
+
+        try:
+            return response.json()
+        except ValueError:
+            return {"success": True}
+
     def get_config(self):
         """Get current Syncthing configuration."""
         return self._api_call("GET", "/rest/config")
 
+    def put_config(self, config: dict):
+        """Replace the whole configuration in one transaction."""
+        return self._api_call("PUT", "/rest/config", data=config)
+
     def get_gui_config(self):
         """Get GUI configuration."""
         return self._api_call("GET", "/rest/config/gui")
@@ -177,6 +193,21 @@ class SyncthingClient:
         """Trigger a rescan for a folder."""
         return self._api_call("POST", f"/rest/db/scan?folder={folder_id}")
 
+    def get_events(
+        self,
+        since: int = 0,
+        events: Optional[List[str]] = None,
+        timeout: int = 60,
+        limit: Optional[int] = None,
+    ):
+        """Long-poll for events after `since` (returns [] when timeout expires)."""
+        endpoint = f"/rest/events?since={since}&timeout={timeout}"
+        if events:
+            endpoint += "&events=" + ",".join(events)
+        if limit:
+            endpoint += f"&limit={limit}"
+        return self._api_call("GET", endpoint, timeout=timeout + self.timeout)
+
     def get_system_status(self):
         """Get system status (includes local device ID)."""
         return self._api_call("GET", "/rest/system/status")
@@ -330,11 +361,14 @@ Please check that:
             logging.error(error_msg)
             raise Exception("Syncthing is not running (nothing listening on port 8384)")
 
-    return SyncthingClient(base_url, api_key)
+    client = SyncthingClient(base_url, api_key)
+    if getattr(args, "timings", False):
+        atexit.register(client.transport.print_timings)
+    return client
 
 
 def fetch_completions_parallel(
-    client, tasks: List[Tuple[str, Optional[str]]], max_workers: int = 5
+    client, tasks: List[Tuple[str, Optional[str]]], max_workers: int = FETCH_WORKERS
 ) -> Dict[Tuple[str, Optional[str]], Any]:
     """
     Fetch completion status for multiple device/folder combinations in parallel.
@@ -367,7 +401,7 @@ def fetch_completions_parallel(
 
 
 def fetch_folder_statuses_parallel(
-    client, folder_ids: List[str], max_workers: int = 5
+    client, folder_ids: List[str], max_workers: int = FETCH_WORKERS
 ) -> Dict[str, Any]:
     """
     Fetch folder statuses in parallel.
@@ -398,208 +432,336 @@ def fetch_folder_statuses_parallel(
     return results
 
 
-def sync_devices(client, devices_config, dry_run=False):
-    """
-    Sync devices declaratively (add, update, remove).
+@dataclass
+class ConfigChange:
+    """One difference between the running and the declared configuration."""
 
-    Args:
-        client: SyncthingClient instance
-        devices_config: Dict mapping device names to device IDs
-        dry_run: If True, only show what would be changed
-    """
-    current_devices = {
-        dev["deviceID"]: dev
-        for dev in client.get_devices()
-        if dev and isinstance(dev, dict) and "deviceID" in dev
-    }
-    configured_device_ids = set(devices_config.values())
+    action: str  # ADD, UPDATE or REMOVE
+    kind: str  # gui, device or folder
+    key: str  # device ID, folder ID or "gui"
+    name: str
+    fields: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
 
-    logging.info(f"  Syncing devices ({len(devices_config)} configured)...")
 
-    # Add or update devices that are in config
-    for device_name, device_id in devices_config.items():
-        if device_id in current_devices:
-            current_name = current_devices[device_id].get("name", "")
-            if current_name != device_name:
-                logging.info(
-                    f"    UPDATE: {current_name} -> {device_name} ({device_id[:7]}...)"
+@dataclass
+class SyncPlan:
+    """Desired full config plus the changes that lead to it from current."""
+
+    current: Dict[str, Any]
+    desired: Dict[str, Any]
+    local_device_id: Optional[str]
+    changes: List[ConfigChange] = field(default_factory=list)
+
+    def folder(self, folder_id: str) -> Optional[Dict[str, Any]]:
+        return next(
+            (f for f in self.desired.get("folders", []) if f.get("id") == folder_id),
+            None,
+        )
+
+    def device_label(self, device_id: str) -> str:
+        for config in (self.desired, self.current):
+            for dev in config.get("devices", []):
+                if dev.get("deviceID") == device_id and dev.get("name"):
+                    return dev["name"]
+        return f"{device_id[:7]}..."
+
+
+def _new_object(plan: SyncPlan, kind: str) -> Dict[str, Any]:
+    """Start a new device/folder from the daemon's defaults (Syncthing >= 1.12)."""
+    return copy.deepcopy(plan.current.get("defaults", {}).get(kind, {}))
+
+
+def _password_matches(password: str, current_hash: str) -> bool:
+    if password.startswith("$2"):
+        return password == current_hash
+    try:
+        return bcrypt.checkpw(password.encode("utf-8"), current_hash.encode("utf-8"))
+    except ValueError:
+        return False
+
+
+def plan_gui(plan: SyncPlan, gui_config: Dict[str, Any]):
+    """Plan GUI credential changes; a plain-text password is only re-hashed if it changed."""
+    gui = plan.desired.setdefault("gui", {})
+    username = gui_config.get("username")
+    password = gui_config.get("password")
+    fields = {}
+
+    if username and gui.get("user", "") != username:
+        fields["user"] = (gui.get("user", ""), username)
+        gui["user"] = username
+
+    if password and not _password_matches(password, gui.get("password", "")):
+        if password.startswith("$2"):
+            gui["password"] = password
+        else:
+            gui["password"] = hash_password(password)
+        fields["password"] = ("***", "***")
+
+    if fields:
+        plan.changes.append(ConfigChange("UPDATE", "gui", "gui", "GUI", fields))
+
+
+def plan_local_device_name(plan: SyncPlan, device_name: str):
+    if not plan.local_device_id:
+        logging.error("    Could not determine local device ID")
+        return
+    for dev in plan.desired.get("devices", []):
+        if dev.get("deviceID") == plan.local_device_id:
+            if dev.get("name", "") != device_name:
+                plan.changes.append(
+                    ConfigChange(
+                        "UPDATE",
+                        "device",
+                        plan.local_device_id,
+                        device_name,
+                        {"name": (dev.get("name", ""), device_name)},
+                    )
                 )
-                if not dry_run:
-                    client.update_device(device_id, {"name": device_name})
-                    logging.info("      ✓ Device name updated")
-                else:
-                    logging.info("      [DRY-RUN] Would update device name")
-            else:
-                logging.info(
-                    f"    OK: {device_name} ({device_id[:7]}...) already configured"
+                dev["name"] = device_name
+            return
+    logging.error(
+        f"    Could not find local device config for ID {plan.local_device_id[:7]}..."
+    )
+
+
+def plan_devices(plan: SyncPlan, devices_config: Dict[str, str]):
+    """Plan device additions and renames (removals come after folders)."""
+    devices = plan.desired.setdefault("devices", [])
+    current = {d["deviceID"]: d for d in devices if "deviceID" in d}
+
+    for device_name, device_id in devices_config.items():
+        dev = current.get(device_id)
+        if dev is None:
+            dev = _new_object(plan, "device")
+            dev.update({"deviceID": device_id, "name": device_name})
+            devices.append(dev)
+            current[device_id] = dev
+            plan.changes.append(ConfigChange("ADD", "device", device_id, device_name))
+        elif dev.get("name", "") != device_name:
+            plan.changes.append(
+                ConfigChange(
+                    "UPDATE",
+                    "device",
+                    device_id,
+                    device_name,
+                    {"name": (dev.get("name", ""), device_name)},
                 )
+            )
+            dev["name"] = device_name
+
+
+def plan_device_removals(plan: SyncPlan, devices_config: Dict[str, str]):
+    """Plan removal of devices that are not configured (never the local device)."""
+    keep = set(devices_config.values())
+    if plan.local_device_id:
+        keep.add(plan.local_device_id)
+
+    remaining = []
+    for dev in plan.desired.get("devices", []):
+        device_id = dev.get("deviceID")
+        if device_id in keep:
+            remaining.append(dev)
         else:
-            logging.info(f"    ADD: {device_name} ({device_id[:7]}...)")
-            if not dry_run:
-                client.add_device(device_id, device_name)
-                logging.info("      ✓ Device added")
-            else:
-                logging.info("      [DRY-RUN] Would add device")
-
-    # Remove devices that are in Syncthing but not in config
-    for device_id, device in current_devices.items():
-        if device_id not in configured_device_ids:
-            device_name = device.get("name", "Unknown")
-            logging.info(f"    REMOVE: {device_name} ({device_id[:7]}...)")
-            if not dry_run:
-                client.remove_device(device_id)
-                logging.info("      ✓ Device removed")
-            else:
-                logging.info("      [DRY-RUN] Would remove device")
+            plan.changes.append(
+                ConfigChange("REMOVE", "device", device_id, dev.get("name", "Unknown"))
+            )
+    plan.desired["devices"] = remaining
 
 
-def sync_folders(client, folders_config, devices_config, dry_run=False):
+def plan_folders(
+    plan: SyncPlan, folders_config: Dict[str, Any], devices_config: Dict[str, str]
+):
     """
-    Sync folders declaratively (add, update, remove).
+    Plan folder additions, updates and removals.
 
-    Args:
-        client: SyncthingClient instance
-        folders_config: Dict mapping folder IDs to folder configurations
-        devices_config: Dict mapping device names to device IDs (for resolution)
-        dry_run: If True, only show what would be changed
+    Folder devices may be given by name (resolved through devices_config) or
+    by ID. The local device is always shared with a folder by Syncthing, so it
+    is ignored when comparing device lists and kept when rewriting them.
     """
-    current_folders = {
-        f["id"]: f
-        for f in client.get_folders()
-        if f and isinstance(f, dict) and "id" in f
-    }
-    configured_folder_ids = set(folders_config.keys())
+    local_id = plan.local_device_id
+    folders = plan.desired.setdefault("folders", [])
+    current = {f["id"]: f for f in folders if "id" in f}
 
-    # Build device name to ID mapping for resolving device references
-    device_name_to_id = {name: dev_id for name, dev_id in devices_config.items()}
+    for folder_id, folder_cfg in folders_config.items():
+        device_ids = [devices_config.get(d, d) for d in folder_cfg.get("devices", [])]
+        new_label = folder_cfg.get("label", folder_id)
+        new_path = folder_cfg["path"]
+
+        folder = current.get(folder_id)
+        if folder is None:
+            folder = _new_object(plan, "folder")
+            folder.update(
+                {
+                    "id": folder_id,
+                    "label": new_label,
+                    "path": new_path,
+                    "devices": [
+                        {"deviceID": dev_id}
+                        for dev_id in ([local_id] if local_id else []) + device_ids
+                    ],
+                }
+            )
+            folders.append(folder)
+            plan.changes.append(ConfigChange("ADD", "folder", folder_id, new_label))
+            continue
 
-    logging.info(f"  Syncing folders ({len(folders_config)} configured)...")
+        fields = {}
+        for key, value in (("label", new_label), ("path", new_path)):
+            if folder.get(key, "") != value:
+                fields[key] = (folder.get(key, ""), value)
+                folder[key] = value
+
+        shared = [d for d in folder.get("devices", []) if isinstance(d, dict)]
+        current_ids = {d.get("deviceID") for d in shared} - {local_id}
+        if current_ids != set(device_ids):
+            fields["devices"] = (sorted(current_ids), sorted(set(device_ids)))
+            kept = [
+                d
+                for d in shared
+                if d.get("deviceID") == local_id or d.get("deviceID") in device_ids
+            ]
+            kept_ids = {d.get("deviceID") for d in kept}
+            kept += [{"deviceID": i} for i in device_ids if i not in kept_ids]
+            folder["devices"] = kept
 
-    # Add or update folders that are in config
-    for folder_id, folder_cfg in folders_config.items():
-        # Resolve device names/IDs to device IDs
-        configured_devices = folder_cfg.get("devices", [])
-        resolved_device_ids = []
-        for dev in configured_devices:
-            # Check if it's a device name (exists in mapping) or already a device ID
-            if dev in device_name_to_id:
-                resolved_device_ids.append(device_name_to_id[dev])
-            else:
-                # Assume it's already a device ID
-                resolved_device_ids.append(dev)
-
-        if folder_id in current_folders:
-            current_folder = current_folders[folder_id]
-            current_label = current_folder.get("label", "")
-            current_path = current_folder.get("path", "")
-            current_devices = set(
-                d.get("deviceID")
-                for d in current_folder.get("devices", [])
-                if d and isinstance(d, dict)
+        if fields:
+            plan.changes.append(
+                ConfigChange("UPDATE", "folder", folder_id, new_label, fields)
             )
 
-            new_label = folder_cfg.get("label", folder_id)
-            new_path = folder_cfg["path"]
-            new_devices = set(resolved_device_ids)
-
-            # Check if anything changed
-            if (
-                current_label != new_label
-                or current_path != new_path
-                or current_devices != new_devices
-            ):
-                logging.info(f"    UPDATE: {folder_id}")
-                if not dry_run:
-                    # Build device list for API
-                    devices_list = [{"deviceID": dev_id} for dev_id in new_devices]
-                    update_data = {
-                        "label": new_label,
-                        "path": new_path,
-                        "devices": devices_list,
-                    }
-                    client.update_folder(folder_id, update_data)
-                    logging.info("      ✓ Folder updated")
-                else:
-                    logging.info("      [DRY-RUN] Would update folder")
-            else:
-                logging.info(f"    OK: {folder_id} already configured")
+    remaining = []
+    for folder in folders:
+        if folder.get("id") in folders_config:
+            remaining.append(folder)
         else:
-            logging.info(f"    ADD: {folder_id}")
-            if not dry_run:
-                # Build device list for API
-                devices_list = [{"deviceID": dev_id} for dev_id in resolved_device_ids]
-                add_data = {
-                    "id": folder_id,
-                    "label": folder_cfg.get("label", folder_id),
-                    "path": folder_cfg["path"],
-                    "devices": devices_list,
-                }
-                client.add_folder(folder_id, add_data)
-                logging.info("      ✓ Folder added")
-            else:
-                logging.info("      [DRY-RUN] Would add folder")
-
-    # Remove folders that are in Syncthing but not in config
-    for folder_id, folder in current_folders.items():
-        if folder_id not in configured_folder_ids:
-            folder_label = folder.get("label", folder_id)
-            logging.info(f"    REMOVE: {folder_label} ({folder_id})")
-            if not dry_run:
-                client.remove_folder(folder_id)
-                logging.info("      ✓ Folder removed")
-            else:
-                logging.info("      [DRY-RUN] Would remove folder")
+            plan.changes.append(
+                ConfigChange(
+                    "REMOVE",
+                    "folder",
+                    folder.get("id", ""),
+                    folder.get("label", folder.get("id", "")),
+                )
+            )
+    plan.desired["folders"] = remaining
 
 
-def sync_local_device_name(client, device_name: str, dry_run=False):
+def plan_sync(
+    config: Dict[str, Any],
+    current_config: Dict[str, Any],
+    local_device_id: Optional[str],
+) -> SyncPlan:
     """
-    Sync the local device name.
+    Compute the full desired Syncthing config from the declarative config.
 
-    Args:
-        client: SyncthingClient instance
-        device_name: Desired name for this device
-        dry_run: If True, only show what would be changed
+    Changes are recorded in an order that is also safe for per-object calls:
+    GUI, devices added/renamed, folders, then devices removed.
     """
-    logging.info("  Syncing local device name...")
+    plan = SyncPlan(
+        current=current_config,
+        desired=copy.deepcopy(current_config),
+        local_device_id=local_device_id,
+    )
+    devices_config = config.get("devices") or {}
+
+    if config.get("gui"):
+        plan_gui(plan, config["gui"])
+    if config.get("localDeviceName"):
+        plan_local_device_name(plan, config["localDeviceName"])
+    if "devices" in config:
+        plan_devices(plan, devices_config)
+    if "folders" in config:
+        plan_folders(plan, config["folders"], devices_config)
+    if "devices" in config:
+        plan_device_removals(plan, devices_config)
+    return plan
+
+
+def _format_value(plan: SyncPlan, key: str, value) -> str:
+    if key == "devices":
+        return "[" + ", ".join(plan.device_label(d) for d in value) + "]"
+    return repr(value)
+
+
+def print_plan(plan: SyncPlan):
+    """Print the plan as a structured diff (same output for dry-run and apply)."""
+    counts = {
+        action: sum(1 for c in plan.changes if c.action == action)
+        for action in ("ADD", "UPDATE", "REMOVE")
+    }
+    logging.info(
+        f"  Plan: {counts['ADD']} to add, {counts['UPDATE']} to update, "
+        f"{counts['REMOVE']} to remove"
+    )
+    for change in plan.changes:
+        if change.kind == "device":
+            label = f"{change.name} ({change.key[:7]}...)"
+        elif change.kind == "folder" and change.name != change.key:
+            label = f"{change.name} ({change.key})"
+        else:
+            label = change.name
+        logging.info(f"    {change.action} {change.kind}: {label}")
+        for key, (old, new) in change.fields.items():
+            logging.info(
+                f"        {key}: {_format_value(plan, key, old)} -> "
+                f"{_format_value(plan, key, new)}"
+            )
 
-    # Get local device ID
-    system_status = client.get_system_status()
-    local_device_id = system_status.get("myID")
-    if not local_device_id:
-        logging.error("    Could not determine local device ID")
-        return
 
-    # Get current device config
-    devices = client.get_devices()
-    local_device = None
-    for dev in devices:
-        if dev and isinstance(dev, dict) and dev.get("deviceID") == local_device_id:
-            local_device = dev
-            break
-
-    if not local_device:
-        logging.error(
-            f"    Could not find local device config for ID {local_device_id[:7]}..."
-        )
-        return
+def apply_plan_per_object(client, plan: SyncPlan):
+    """Apply a plan with one REST call per changed object (fallback path)."""
+    for change in plan.changes:
+        if change.kind == "gui":
+            gui = plan.desired["gui"]
+            client.update_gui_config(
+                username=gui["user"] if "user" in change.fields else None,
+                password_hash=gui["password"] if "password" in change.fields else None,
+            )
+        elif change.kind == "device":
+            if change.action == "ADD":
+                client.add_device(change.key, change.name)
+            elif change.action == "UPDATE":
+                client.update_device(change.key, {"name": change.name})
+            else:
+                client.remove_device(change.key)
+        elif change.kind == "folder":
+            if change.action == "ADD":
+                client.add_folder(change.key, plan.folder(change.key))
+            elif change.action == "UPDATE":
+                folder = plan.folder(change.key)
+                client.update_folder(
+                    change.key, {key: folder[key] for key in change.fields}
+                )
+            else:
+                client.remove_folder(change.key)
+        logging.info(f"    ✓ {change.action} {change.kind}: {change.name}")
+
 
-    current_name = local_device.get("name", "")
-    if current_name == device_name:
-        logging.info(f"    OK: Local device name already set to '{device_name}'")
+def apply_plan(client, plan: SyncPlan, per_object: bool = False):
+    """
+    Apply a plan with a single PUT /rest/config, so Syncthing commits
+    config.xml and restarts affected folders once. Falls back to per-object
+    calls if the full update is rejected or per_object is set.
+    """
+    if not plan.changes:
         return
 
-    logging.info(
-        f"    UPDATE: '{current_name}' -> '{device_name}' ({local_device_id[:7]}...)"
-    )
-    if not dry_run:
-        client.update_device(local_device_id, {"name": device_name})
-        logging.info("      ✓ Local device name updated")
-    else:
-        logging.info("      [DRY-RUN] Would update local device name")
+    if not per_object:
+        try:
+            client.put_config(plan.desired)
+            logging.info(
+                f"  ✓ Applied {len(plan.changes)} change(s) in one config update"
+            )
+            return
+        except Exception as e:
+            logging.warning(f"  Full config update failed: {e}")
+            logging.info("  Falling back to per-object updates...")
+
+    apply_plan_per_object(client, plan)
 
 
 def cmd_sync(args):
-    """Sync GUI credentials and devices from configuration file."""
+    """Sync GUI credentials, devices and folders from configuration file."""
     try:
         # Load configuration
         with open(args.config_file, "r") as f:
@@ -609,55 +771,16 @@ def cmd_sync(args):
 
         logging.info("Syncing Syncthing configuration...")
 
-        # Sync local device name if present
-        if "localDeviceName" in config and config["localDeviceName"]:
-            sync_local_device_name(
-                client, config["localDeviceName"], dry_run=args.dry_run
-            )
-
-        # Sync GUI credentials if present
-        if "gui" in config and config["gui"] is not None:
-            gui_config = config["gui"]
-            username = gui_config.get("username")
-            password = gui_config.get("password")
-
-            if username or password:
-                logging.info("  Updating GUI credentials...")
-
-                # Hash password if needed
-                password_hash = None
-                if password:
-                    # Check if it's already a bcrypt hash
-                    if password.startswith("$2"):
-                        password_hash = password
-                        logging.info("    Using pre-hashed password")
-                    else:
-                        password_hash = hash_password(password)
-                        logging.info("    Hashed plain text password with bcrypt")
-
-                if not args.dry_run:
-                    client.update_gui_config(
-                        username=username, password_hash=password_hash
-                    )
-                    logging.info("    ✓ GUI credentials updated")
-                else:
-                    logging.info("    [DRY-RUN] Would update GUI credentials")
-
-        # Sync devices if present (fully declarative - add and remove)
-        if "devices" in config:
-            sync_devices(client, config["devices"], dry_run=args.dry_run)
-
-        # Sync folders if present (fully declarative - add and remove)
-        if "folders" in config:
-            devices_config = config.get("devices", {})
-            sync_folders(
-                client, config["folders"], devices_config, dry_run=args.dry_run
-            )
+        current_config = client.get_config()
+        system_status = client.get_system_status()
+        plan = plan_sync(config, current_config, system_status.get("myID"))
+        print_plan(plan)
 
         if args.dry_run:
             logging.info("")
             logging.info("Dry-run complete - no changes made")
         else:
+            apply_plan(client, plan, per_object=args.per_object)
             logging.info("")
             logging.info("Sync complete!")
 
@@ -673,16 +796,8 @@ def cmd_sync(args):
         sys.exit(1)
 
 
-def display_this_device(system_status, connections_data=None):
-    """Display information about this device."""
-    if not system_status:
-        return
-
-    console = Console()
-    console.print()  # Add blank line
-    console.print("[bold cyan]This Device[/bold cyan]")
-
-    # Create table
+def this_device_table(system_status, connections_data=None) -> Table:
+    """Build the "This Device" table."""
     table = Table(show_header=False, show_lines=False, box=box.ROUNDED, padding=(0, 1))
     table.add_column("Property", style="dim", width=25)
     table.add_column("Value", style="bold")
@@ -744,20 +859,58 @@ def display_this_device(system_status, connections_data=None):
                 version_str += f" ({arch})"
         table.add_row("Version", version_str)
 
-    console.print(table)
+    return table
 
 
-def display_devices(devices, detailed=False, connections=None, completions=None):
-    """Display devices in a formatted table."""
+def display_this_device(system_status, connections_data=None):
+    """Display information about this device."""
+    if not system_status:
+        return
+
     console = Console()
     console.print()  # Add blank line
-    console.print("[bold cyan]Remote Devices[/bold cyan]")
+    console.print("[bold cyan]This Device[/bold cyan]")
+    console.print(this_device_table(system_status, connections_data))
+
+
+def device_row(device, connections=None, completions=None) -> Tuple[str, ...]:
+    """Build the table row for one remote device."""
+    name = device.get("name", "Unknown")
+    device_id = device.get("deviceID", "")
+    device_id_short = device_id[:7] + "..." if device_id else ""
+
+    # Get connection status
+    conn_status = ""
+    sync_status = ""
+    if connections and device_id in connections:
+        conn = connections[device_id]
+        if conn.get("paused"):
+            conn_status = "[yellow]Paused[/yellow]"
+        elif conn.get("connected"):
+            conn_status = "[green]Connected[/green]"
+            # Check if syncing
+            if completions and device_id in completions:
+                comp = completions[device_id]
+                completion_pct = comp.get("completion", 100)
+                if completion_pct < 100:
+                    # Show syncing progress
+                    need_bytes = comp.get("needBytes", 0)
+                    need_size = format_bytes(need_bytes)
+                    sync_status = (
+                        f"[cyan]Syncing {completion_pct:.0f}%[/cyan], {need_size}"
+                    )
+                else:
+                    sync_status = "[green]Up to Date[/green]"
+        else:
+            conn_status = "[red]Disconnected[/red]"
+    else:
+        conn_status = "[dim]Unknown[/dim]"
 
-    if not devices:
-        print("  (none)")
-        return
+    return (name, device_id_short, conn_status, sync_status)
 
-    # Create table
+
+def devices_table(rows: List[Tuple[str, ...]]) -> Table:
+    """Build the remote devices table from rows made by device_row."""
     table = Table(
         show_header=True, header_style="bold cyan", show_lines=False, box=box.ROUNDED
     )
@@ -766,44 +919,117 @@ def display_devices(devices, detailed=False, connections=None, completions=None)
     table.add_column("Connection Status", justify="center")
     table.add_column("Sync Status")
 
-    for device in devices:
-        if not device or not isinstance(device, dict):
-            continue
-        name = device.get("name", "Unknown")
-        device_id = device.get("deviceID", "")
-        device_id_short = device_id[:7] + "..." if device_id else ""
+    for row in rows:
+        table.add_row(*row)
+    return table
+
+
+def display_devices(devices, detailed=False, connections=None, completions=None):
+    """Display devices in a formatted table."""
+    console = Console()
+    console.print()  # Add blank line
+    console.print("[bold cyan]Remote Devices[/bold cyan]")
 
-        # Get connection status
-        conn_status = ""
+    if not devices:
+        print("  (none)")
+        return
+
+    rows = [
+        device_row(device, connections, completions)
+        for device in devices
+        if device and isinstance(device, dict)
+    ]
+    console.print(devices_table(rows))
+
+
+def folder_rows(
+    folder,
+    device_map=None,
+    folder_statuses=None,
+    local_device_id=None,
+    device_completions=None,
+) -> List[Tuple[str, str, str]]:
+    """Build the table rows for one folder (label, path, one row per device)."""
+    folder_id = folder.get("id", "")
+    label = folder.get("label", folder_id)
+    path = folder.get("path", "")
+    devices = folder.get("devices", [])
+
+    # Show non-idle folder states (scanning, syncing, ...) next to the label
+    state = (folder_statuses or {}).get(folder_id, {}).get("state", "")
+    if state and state != "idle":
+        label = f"{label} [cyan]({state})[/cyan]"
+
+    # Get devices to display (excluding local device)
+    devices_to_show = []
+    for d in devices:
+        if d and isinstance(d, dict):
+            dev_id = d.get("deviceID", "")
+            if local_device_id and dev_id == local_device_id:
+                continue
+            devices_to_show.append(d)
+
+    # Build device info list
+    device_rows = []
+    for d in devices_to_show:
+        dev_id = d.get("deviceID", "")
+
+        # Get device name
+        if device_map and dev_id in device_map:
+            dev_name = device_map[dev_id]
+        else:
+            dev_name = dev_id[:7] + "..."
+
+        # Get sync status
         sync_status = ""
-        if connections and device_id in connections:
-            conn = connections[device_id]
-            if conn.get("paused"):
-                conn_status = "[yellow]Paused[/yellow]"
-            elif conn.get("connected"):
-                conn_status = "[green]Connected[/green]"
-                # Check if syncing
-                if completions and device_id in completions:
-                    comp = completions[device_id]
-                    completion_pct = comp.get("completion", 100)
-                    if completion_pct < 100:
-                        # Show syncing progress
-                        need_bytes = comp.get("needBytes", 0)
-                        need_size = format_bytes(need_bytes)
-                        sync_status = (
-                            f"[cyan]Syncing {completion_pct:.0f}%[/cyan], {need_size}"
-                        )
-                    else:
-                        sync_status = "[green]Up to Date[/green]"
+        if device_completions and (dev_id, folder_id) in device_completions:
+            comp = device_completions[(dev_id, folder_id)]
+            need_items = comp.get("needItems", 0)
+            need_bytes = comp.get("needBytes", 0)
+
+            if need_items > 0:
+                items_str = f"{need_items:,} item{'s' if need_items != 1 else ''}"
+                bytes_str = format_bytes(need_bytes)
+                sync_status = f"[red]Out of Sync:[/red] {items_str}, ~{bytes_str}"
             else:
-                conn_status = "[red]Disconnected[/red]"
-        else:
-            conn_status = "[dim]Unknown[/dim]"
+                sync_status = "[green]Up to Date[/green]"
+
+        device_rows.append((dev_name, sync_status))
 
-        table.add_row(name, device_id_short, conn_status, sync_status)
+    # Rows: first row has label, second row has path, rest are empty
+    if not device_rows:
+        # No devices to show
+        return [(label, "(none)", ""), (f"[dim]{path}[/dim]", "", "")]
+
+    # First row: folder label + first device
+    rows = [(label, device_rows[0][0], device_rows[0][1])]
+    # Second row: path + second device (or just path if only one device)
+    if len(device_rows) > 1:
+        rows.append((f"[dim]{path}[/dim]", device_rows[1][0], device_rows[1][1]))
+    else:
+        rows.append((f"[dim]{path}[/dim]", "", ""))
+    # Remaining devices
+    for idx in range(2, len(device_rows)):
+        rows.append(("", device_rows[idx][0], device_rows[idx][1]))
+    return rows
+
+
+def folders_table(rows_per_folder: List[List[Tuple[str, str, str]]]) -> Table:
+    """Build the folders table, one section per folder."""
+    table = Table(
+        show_header=True, header_style="bold cyan", show_lines=False, box=box.ROUNDED
+    )
+    table.add_column("Folders", style="bold")
+    table.add_column("Devices", style="yellow")
+    table.add_column("Sync Status", style="green")
 
-    # Print the table
-    console.print(table)
+    for idx, rows in enumerate(rows_per_folder):
+        # Add section divider between folders
+        if idx:
+            table.add_section()
+        for row in rows:
+            table.add_row(*row)
+    return table
 
 
 def display_folders(
@@ -832,86 +1058,14 @@ def display_folders(
         print("  (none)")
         return
 
-    # Create table
-    table = Table(
-        show_header=True, header_style="bold cyan", show_lines=False, box=box.ROUNDED
-    )
-    table.add_column("Folders", style="bold")
-    table.add_column("Devices", style="yellow")
-    table.add_column("Sync Status", style="green")
-
-    first_folder = True
-    for folder in folders:
-        if not folder or not isinstance(folder, dict):
-            continue
-
-        # Add section divider between folders
-        if not first_folder:
-            table.add_section()
-        first_folder = False
-
-        folder_id = folder.get("id", "")
-        label = folder.get("label", folder_id)
-        path = folder.get("path", "")
-        devices = folder.get("devices", [])
-
-        # Get devices to display (excluding local device)
-        devices_to_show = []
-        for d in devices:
-            if d and isinstance(d, dict):
-                dev_id = d.get("deviceID", "")
-                if local_device_id and dev_id == local_device_id:
-                    continue
-                devices_to_show.append(d)
-
-        # Build device info list
-        device_rows = []
-        for d in devices_to_show:
-            dev_id = d.get("deviceID", "")
-
-            # Get device name
-            if device_map and dev_id in device_map:
-                dev_name = device_map[dev_id]
-            else:
-                dev_name = dev_id[:7] + "..."
-
-            # Get sync status
-            sync_status = ""
-            if device_completions and (dev_id, folder_id) in device_completions:
-                comp = device_completions[(dev_id, folder_id)]
-                need_items = comp.get("needItems", 0)
-                need_bytes = comp.get("needBytes", 0)
-
-                if need_items > 0:
-                    items_str = f"{need_items:,} item{'s' if need_items != 1 else ''}"
-                    bytes_str = format_bytes(need_bytes)
-                    sync_status = f"[red]Out of Sync:[/red] {items_str}, ~{bytes_str}"
-                else:
-                    sync_status = "[green]Up to Date[/green]"
-
-            device_rows.append((dev_name, sync_status))
-
-        # Add rows: first row has label, second row has path, rest are empty
-        if device_rows:
-            # First row: folder label + first device
-            table.add_row(label, device_rows[0][0], device_rows[0][1])
-            # Second row: path + second device (or just path if only one device)
-            if len(device_rows) > 1:
-                table.add_row(
-                    f"[dim]{path}[/dim]", device_rows[1][0], device_rows[1][1]
-                )
-            else:
-                table.add_row(f"[dim]{path}[/dim]", "", "")
-            # Remaining devices
-            for idx in range(2, len(device_rows)):
-                table.add_row("", device_rows[idx][0], device_rows[idx][1])
-        else:
-            # No devices to show
-            table.add_row(label, "(none)", "")
-            table.add_row(f"[dim]{path}[/dim]", "", "")
-
-    # Print the table
-    console.print(table)
+    rows_per_folder = [
+        folder_rows(
+            folder, device_map, folder_statuses, local_device_id, device_completions
+        )
+        for folder in folders
+        if folder and isinstance(folder, dict)
+    ]
+    console.print(folders_table(rows_per_folder))
 
 
 def cmd_list_devices(args):
@@ -1030,107 +1184,324 @@ def cmd_list_folders(args):
         sys.exit(1)
 
 
-def cmd_status(args):
-    """Show status of configured devices and folders."""
-    try:
-        client = get_client(args)
+@dataclass
+class StatusSnapshot:
+    """Everything `status` shows, gathered by one full poll."""
+
+    devices: List[Dict[str, Any]]
+    folders: List[Dict[str, Any]]
+    system_status: Optional[Dict[str, Any]]
+    connections_data: Optional[Dict[str, Any]]
+    connections: Dict[str, Any]
+    local_device_id: Optional[str]
+    device_map: Dict[str, str]
+    completions: Dict[str, Any]
+    device_completions: Dict[Tuple[str, str], Any]
+    folder_statuses: Dict[str, Any]
+
+
+def fetch_status(client) -> StatusSnapshot:
+    """Poll devices, folders, connections and every (device, folder) completion."""
+    # Fetch initial data in parallel
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        future_devices = executor.submit(client.get_devices)
+        future_folders = executor.submit(client.get_folders)
+        future_status = executor.submit(client.get_system_status)
+        future_connections = executor.submit(client.get_connections)
+
+        devices = future_devices.result()
+        folders = future_folders.result()
+        try:
+            system_status = future_status.result()
+            local_device_id = system_status.get("myID") if system_status else None
+        except Exception:
+            system_status = None
+            local_device_id = None
+        try:
+            connections_data = future_connections.result()
+            connections = (
+                connections_data.get("connections", {}) if connections_data else {}
+            )
+        except Exception:
+            connections_data = None
+            connections = {}
+
+    # Filter out the local device
+    if local_device_id:
+        devices = [d for d in devices if d.get("deviceID") != local_device_id]
+
+    # Build device ID to name map for folder display
+    device_map = {
+        d.get("deviceID"): d.get("name", "Unknown")
+        for d in devices
+        if d and isinstance(d, dict) and "deviceID" in d
+    }
 
-        # Fetch initial data in parallel
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            future_devices = executor.submit(client.get_devices)
-            future_folders = executor.submit(client.get_folders)
-            future_status = executor.submit(client.get_system_status)
-            future_connections = executor.submit(client.get_connections)
+    # Collect all completion tasks for parallel fetching
+    completion_tasks = []
 
-            devices = future_devices.result()
-            folders = future_folders.result()
-            try:
-                system_status = future_status.result()
-                local_device_id = system_status.get("myID") if system_status else None
-            except Exception:
-                system_status = None
-                local_device_id = None
-            try:
-                connections_data = future_connections.result()
-                connections = (
-                    connections_data.get("connections", {}) if connections_data else {}
-                )
-            except Exception:
-                connections_data = None
-                connections = None
+    # Device-level completions (for connected devices only)
+    for device_id, conn in connections.items():
+        if conn.get("connected"):
+            completion_tasks.append((device_id, None))
 
-        # Filter out the local device
-        if local_device_id:
-            devices = [d for d in devices if d.get("deviceID") != local_device_id]
+    # Device-folder completions (all devices, not just connected)
+    for folder in folders:
+        if folder and isinstance(folder, dict) and "id" in folder:
+            folder_id = folder["id"]
+            folder_devices = folder.get("devices", [])
+            for d in folder_devices:
+                if d and isinstance(d, dict):
+                    dev_id = d.get("deviceID", "")
+                    if local_device_id and dev_id == local_device_id:
+                        continue
+                    completion_tasks.append((dev_id, folder_id))
+
+    # Fetch completions and folder statuses in parallel
+    folder_ids = [f["id"] for f in folders if f and isinstance(f, dict) and "id" in f]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        future_completions = executor.submit(
+            fetch_completions_parallel, client, completion_tasks
+        )
+        future_folder_statuses = executor.submit(
+            fetch_folder_statuses_parallel, client, folder_ids
+        )
 
-        # Build device ID to name map for folder display
-        device_map = {
-            d.get("deviceID"): d.get("name", "Unknown")
-            for d in devices
-            if d and isinstance(d, dict) and "deviceID" in d
-        }
+        all_completions = future_completions.result()
+        folder_statuses = future_folder_statuses.result()
 
-        # Collect all completion tasks for parallel fetching
-        completion_tasks = []
+    # Split results into device-level and folder-level completions
+    completions = {}
+    device_completions = {}
+    for (dev_id, folder_id), comp in all_completions.items():
+        if folder_id is None:
+            completions[dev_id] = comp
+        else:
+            device_completions[(dev_id, folder_id)] = comp
+
+    return StatusSnapshot(
+        devices=devices,
+        folders=folders,
+        system_status=system_status,
+        connections_data=connections_data,
+        connections=connections,
+        local_device_id=local_device_id,
+        device_map=device_map,
+        completions=completions,
+        device_completions=device_completions,
+        folder_statuses=folder_statuses,
+    )
 
-        # Device-level completions (for connected devices only)
-        if connections:
-            for device_id, conn in connections.items():
-                if conn.get("connected"):
-                    completion_tasks.append((device_id, None))
 
-        # Device-folder completions (all devices, not just connected)
-        for folder in folders:
-            if folder and isinstance(folder, dict) and "id" in folder:
-                folder_id = folder["id"]
-                folder_devices = folder.get("devices", [])
-                for d in folder_devices:
-                    if d and isinstance(d, dict):
-                        dev_id = d.get("deviceID", "")
-                        if local_device_id and dev_id == local_device_id:
-                            continue
-                        completion_tasks.append((dev_id, folder_id))
+# Events that `status --watch` applies to its model. ConfigSaved forces a
+# full poll since devices or folders may have been added or removed.
+WATCH_EVENTS = [
+    "FolderCompletion",
+    "StateChanged",
+    "DeviceConnected",
+    "DeviceDisconnected",
+    "DevicePaused",
+    "DeviceResumed",
+    "ConfigSaved",
+]
 
-        # Fetch completions and folder statuses in parallel
-        folder_ids = [
-            f["id"] for f in folders if f and isinstance(f, dict) and "id" in f
-        ]
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            future_completions = executor.submit(
-                fetch_completions_parallel, client, completion_tasks
+
+class StatusView:
+    """
+    Status model kept current from the event stream.
+
+    Table rows are cached per folder and per device; an event only drops the
+    rows it affects, so a redraw rebuilds just those.
+    """
+
+    def __init__(self, snapshot: StatusSnapshot):
+        self.snapshot = snapshot
+        self.folder_rows: Dict[str, List[Tuple[str, str, str]]] = {}
+        self.device_rows: Dict[str, Tuple[str, ...]] = {}
+        self.needs_reload = False
+        self.dirty = True
+
+    def _touch(self, folder_id: Optional[str] = None, device_id: Optional[str] = None):
+        if folder_id is not None:
+            self.folder_rows.pop(folder_id, None)
+        if device_id is not None:
+            self.device_rows.pop(device_id, None)
+        self.dirty = True
+
+    def _update_device_completion(self, device_id: str):
+        """Recompute a device's overall completion from its folder completions."""
+        need_bytes = 0
+        global_bytes = 0
+        for (dev_id, _), comp in self.snapshot.device_completions.items():
+            if dev_id == device_id:
+                need_bytes += comp.get("needBytes", 0)
+                global_bytes += comp.get("globalBytes", 0)
+        completion = (
+            100.0 if not global_bytes else 100.0 * (1 - need_bytes / global_bytes)
+        )
+        self.snapshot.completions[device_id] = {
+            "completion": completion,
+            "needBytes": need_bytes,
+        }
+
+    def apply_event(self, event: Dict[str, Any]):
+        snap = self.snapshot
+        event_type = event.get("type")
+        data = event.get("data") or {}
+
+        if event_type == "FolderCompletion":
+            device_id = data.get("device")
+            folder_id = data.get("folder")
+            snap.device_completions[(device_id, folder_id)] = data
+            self._update_device_completion(device_id)
+            self._touch(folder_id=folder_id, device_id=device_id)
+        elif event_type == "StateChanged":
+            folder_id = data.get("folder")
+            snap.folder_statuses.setdefault(folder_id, {})["state"] = data.get("to")
+            self._touch(folder_id=folder_id)
+        elif event_type in ("DeviceConnected", "DeviceDisconnected"):
+            device_id = data.get("id")
+            conn = snap.connections.setdefault(device_id, {})
+            conn["connected"] = event_type == "DeviceConnected"
+            self._touch(device_id=device_id)
+        elif event_type in ("DevicePaused", "DeviceResumed"):
+            device_id = data.get("device")
+            conn = snap.connections.setdefault(device_id, {})
+            conn["paused"] = event_type == "DevicePaused"
+            self._touch(device_id=device_id)
+        elif event_type == "ConfigSaved":
+            self.needs_reload = True
+
+    def render(self, footer: str = "") -> Group:
+        snap = self.snapshot
+        parts = [Text("Folders", style="bold cyan")]
+
+        folders = [f for f in snap.folders if f and isinstance(f, dict)]
+        for folder in folders:
+            folder_id = folder.get("id", "")
+            if folder_id not in self.folder_rows:
+                self.folder_rows[folder_id] = folder_rows(
+                    folder,
+                    snap.device_map,
+                    snap.folder_statuses,
+                    snap.local_device_id,
+                    snap.device_completions,
+                )
+        if folders:
+            parts.append(
+                folders_table([self.folder_rows[f.get("id", "")] for f in folders])
             )
-            future_folder_statuses = executor.submit(
-                fetch_folder_statuses_parallel, client, folder_ids
+        else:
+            parts.append(Text("  (none)"))
+
+        if snap.system_status:
+            parts += [
+                Text(""),
+                Text("This Device", style="bold cyan"),
+                this_device_table(snap.system_status, snap.connections_data),
+            ]
+
+        parts += [Text(""), Text("Remote Devices", style="bold cyan")]
+        devices = [d for d in snap.devices if d and isinstance(d, dict)]
+        for device in devices:
+            device_id = device.get("deviceID", "")
+            if device_id not in self.device_rows:
+                self.device_rows[device_id] = device_row(
+                    device, snap.connections, snap.completions
+                )
+        if devices:
+            parts.append(
+                devices_table(
+                    [self.device_rows[d.get("deviceID", "")] for d in devices]
+                )
             )
+        else:
+            parts.append(Text("  (none)"))
 
-            all_completions = future_completions.result()
-            folder_statuses = future_folder_statuses.result()
+        if footer:
+            parts.append(Text(footer, style="dim"))
+        self.dirty = False
+        return Group(*parts)
 
-        # Split results into device-level and folder-level completions
-        completions = {}
-        device_completions = {}
-        for (dev_id, folder_id), comp in all_completions.items():
-            if folder_id is None:
-                completions[dev_id] = comp
-            else:
-                device_completions[(dev_id, folder_id)] = comp
+
+def watch_status(client, reconnect_delay: float = 5.0):
+    """
+    Show status and keep it current from /rest/events.
+
+    The full state is polled only at start and after a reconnect (or a
+    ConfigSaved event); everything else comes from long-polling events since
+    the last seen ID.
+    """
+    footer = "Watching Syncthing events - Ctrl+C to exit"
+    view = None
+    since = 0
+
+    with Live(console=Console(), auto_refresh=False) as live:
+        while True:
+            try:
+                if view is None:
+                    # Take the event ID before polling so nothing is missed in between
+                    latest = client.get_events(0, WATCH_EVENTS, timeout=0, limit=1)
+                    since = latest[-1]["id"] if latest else 0
+                    view = StatusView(fetch_status(client))
+                    live.update(view.render(footer), refresh=True)
+
+                for event in client.get_events(since, WATCH_EVENTS) or []:
+                    since = max(since, event.get("id", since))
+                    view.apply_event(event)
+
+                if view.needs_reload:
+                    view = None
+                elif view.dirty:
+                    live.update(view.render(footer), refresh=True)
+
+            except KeyboardInterrupt:
+                return
+            except Exception as e:
+                view = None
+                live.update(
+                    Text(
+                        f"Connection lost: {e}\nReconnecting in {reconnect_delay:.0f}s...",
+                        style="red",
+                    ),
+                    refresh=True,
+                )
+                try:
+                    time.sleep(reconnect_delay)
+                except KeyboardInterrupt:
+                    return
+
+
+def cmd_status(args):
+    """Show status of configured devices and folders."""
+    try:
+        client = get_client(args)
+
+        if getattr(args, "watch", False):
+            watch_status(client)
+            return
+
+        snap = fetch_status(client)
 
         # Display folders with device name resolution
         display_folders(
-            folders,
+            snap.folders,
             detailed=False,
-            device_map=device_map,
-            folder_statuses=folder_statuses,
-            local_device_id=local_device_id,
-            device_completions=device_completions,
+            device_map=snap.device_map,
+            folder_statuses=snap.folder_statuses,
+            local_device_id=snap.local_device_id,
+            device_completions=snap.device_completions,
         )
 
         # Display this device
-        display_this_device(system_status, connections_data)
+        display_this_device(snap.system_status, snap.connections_data)
 
         # Display devices
         display_devices(
-            devices, detailed=False, connections=connections, completions=completions
+            snap.devices,
+            detailed=False,
+            connections=snap.connections,
+            completions=snap.completions,
         )
 
     except Exception as e:
@@ -1187,12 +1558,22 @@ def main():
         subparser.add_argument(
             "--config-xml", help="Path to Syncthing config.xml (to extract API key)"
         )
+        subparser.add_argument(
+            "--timings",
+            action="store_true",
+            help="Print per-endpoint request latency stats on exit",
+        )
 
     # CLI: status command
     status_parser = cli_subparsers.add_parser(
         "status", help="Show status of configured devices and folders (default)"
     )
     add_cli_args(status_parser)
+    status_parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and update from the Syncthing event stream",
+    )
 
     # CLI: scan command
     scan_parser = cli_subparsers.add_parser(
@@ -1243,6 +1624,16 @@ def main():
         action="store_true",
         help="Restart Syncthing after applying changes",
     )
+    declarative_parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print per-endpoint request latency stats on exit",
+    )
+    declarative_parser.add_argument(
+        "--per-object",
+        action="store_true",
+        help="Apply changes with one REST call per device/folder instead of a single config update",
+    )
 
     args = parser.parse_args()
 
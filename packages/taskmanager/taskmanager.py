@@ -2,6 +2,8 @@
 """Taskmanager: unified task management across Apple Reminders and Taskwarrior."""
 
 import difflib
+import functools
+import hashlib
 import json
 import os
 import platform
@@ -9,6 +11,8 @@ import re
 import shutil
 import subprocess
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import click
 
@@ -23,6 +27,11 @@ def is_darwin():
 
 _verbose = False
 _prefix_mode = False
+_jobs = 4
+_dry_run = False
+# Per-key match_key results: loaded from drift state / collected this run
+_drift_memo = {}
+_drift_memo_used = {}
 
 
 def prefixed_title(project, title):
@@ -33,33 +42,520 @@ def prefixed_title(project, title):
 
 
 def run(cmd, stdin_text=None):
+    if _dry_run:
+        click.echo(f"  [dry-run] {' '.join(cmd)}", err=True)
+        return subprocess.CompletedProcess(cmd, 0, "", "")
     if _verbose:
         click.echo(f"  >> {' '.join(cmd)}", err=True)
     result = subprocess.run(cmd, capture_output=True, text=True, input=stdin_text)
     if result.returncode != 0:
         click.echo(f"Error running {' '.join(cmd)}: {result.stderr.strip()}", err=True)
+    _snapshot.note_write(cmd)
     return result
 
 
+TW_UUID_RE = re.compile(
+    r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$"
+)
+REMS_WRITE_COMMANDS = {"add", "edit", "complete", "uncomplete", "delete", "move"}
+
+
+class Snapshot:
+    """Per-run cache of `task export` and `rems show` output.
+
+    Each export runs at most once per scope and every lookup reads from the
+    cached records. Writes issued through run() mark the touched UUIDs,
+    projects and lists stale; only those are re-fetched on the next read.
+    """
+
+    def __init__(self):
+        # Raw TW records in export order, keyed by UUID
+        self.tw_by_uuid = {}
+        # Loaded project scopes; None means the full database is loaded
+        self.tw_scopes = set()
+        self.tw_stale_uuids = set()
+        self.tw_stale_projects = set()
+        # (project, description) -> [(position, record)]
+        self.tw_index = None
+        self.rem_lists = None
+        # list name -> raw `rems show --include-completed` items
+        self.rem_items = {}
+        self.rem_stale = set()
+        # (list, title) -> [(position, item)]
+        self.rem_index = {}
+        # Watermark for the first read after seeding from a persisted mirror,
+        # and when that mirror was last built from a full export
+        self.tw_since = None
+        self.tw_built = None
+
+    def _tw_loaded(self, project):
+        return None in self.tw_scopes or project in self.tw_scopes
+
+    def tw_export(self, filter_args):
+        result = subprocess.run(
+            ["task"] + filter_args + ["export"], capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            return None
+        try:
+            return json.loads(result.stdout)
+        except json.JSONDecodeError:
+            return None
+
+    def load_mirror(self, records, since, built):
+        """Seed from a persisted full export; only tasks modified after
+        `since` are re-exported on the first read."""
+        self.tw_by_uuid = {t["uuid"]: t for t in records}
+        self.tw_scopes = {None}
+        self.tw_since = since
+        self.tw_built = built
+        self.tw_index = None
+
+    def _tw_refresh(self):
+        """Re-export stale projects and UUIDs, updating records in place."""
+        if self.tw_since:
+            records = self.tw_export([f"modified.after:{self.tw_since}"])
+            if records is None:
+                # Drop the mirror; the next read does a full export
+                self.tw_by_uuid = {}
+                self.tw_scopes = set()
+                self.tw_built = None
+            else:
+                self.tw_by_uuid.update((t["uuid"], t) for t in records)
+            self.tw_since = None
+            self.tw_index = None
+
+        projects = {p for p in self.tw_stale_projects if self._tw_loaded(p)}
+        self.tw_stale_projects = set()
+        for project in sorted(projects):
+            records = self.tw_export([f"project.is:{project}"])
+            if records is None:
+                continue
+            fresh = {t["uuid"]: t for t in records}
+            for uuid in [
+                u
+                for u, t in self.tw_by_uuid.items()
+                if t.get("project", "") == project and u not in fresh
+            ]:
+                del self.tw_by_uuid[uuid]
+            self.tw_by_uuid.update(fresh)
+            self.tw_index = None
+
+        uuids = sorted(self.tw_stale_uuids)
+        self.tw_stale_uuids = set()
+        if uuids:
+            records = self.tw_export(uuids)
+            if records is not None:
+                fresh = {t["uuid"]: t for t in records}
+                for uuid in uuids:
+                    if uuid not in fresh:
+                        # Purged
+                        self.tw_by_uuid.pop(uuid, None)
+                self.tw_by_uuid.update(fresh)
+                self.tw_index = None
+
+    def tw_records(self, project=None):
+        """Return raw TW records for a project (or all), exporting on first use."""
+        self._tw_refresh()
+        if not self._tw_loaded(project):
+            cmd = [f"project.is:{project}"] if project else []
+            records = self.tw_export(cmd)
+            if records is None:
+                return None
+            if project:
+                self.tw_by_uuid.update((t["uuid"], t) for t in records)
+            else:
+                self.tw_by_uuid = {t["uuid"]: t for t in records}
+            self.tw_scopes.add(project)
+            self.tw_index = None
+        if project is None:
+            return list(self.tw_by_uuid.values())
+        return [t for t in self.tw_by_uuid.values() if t.get("project", "") == project]
+
+    def tw_lookup(self, project, *descriptions):
+        """Return TW records with one of the given descriptions, in export order."""
+        if self.tw_records(project) is None:
+            return []
+        if self.tw_index is None:
+            self.tw_index = {}
+            for pos, t in enumerate(self.tw_by_uuid.values()):
+                key = (t.get("project", ""), t.get("description", ""))
+                self.tw_index.setdefault(key, []).append((pos, t))
+        hits = []
+        for desc in set(descriptions):
+            hits.extend(self.tw_index.get((project, desc), []))
+        return [t for _, t in sorted(hits, key=lambda h: h[0])]
+
+    def reminder_lists(self):
+        """Return Reminders list names, or None if `rems show-lists` failed."""
+        if self.rem_lists is None:
+            result = subprocess.run(
+                ["rems", "show-lists"], capture_output=True, text=True
+            )
+            if result.returncode != 0:
+                return None
+            self.rem_lists = result.stdout.strip().splitlines()
+        return self.rem_lists
+
+    @staticmethod
+    def _fetch_list(list_name):
+        result = subprocess.run(
+            ["rems", "show", list_name, "--format", "json", "--include-completed"],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            return None
+        try:
+            return json.loads(result.stdout)
+        except json.JSONDecodeError:
+            return None
+
+    def _drop_stale(self, list_name):
+        if list_name in self.rem_stale:
+            self.rem_items.pop(list_name, None)
+            self.rem_index.pop(list_name, None)
+            self.rem_stale.discard(list_name)
+
+    def prefetch_reminders(self, lists, jobs=1):
+        """Export every list not yet cached, running up to `jobs` at once.
+
+        Results are stored per list name, so callers iterating `lists` in
+        order see the same data as the serial path.
+        """
+        for list_name in lists:
+            self._drop_stale(list_name)
+        missing = [n for n in dict.fromkeys(lists) if n not in self.rem_items]
+        if not missing:
+            return
+        if jobs <= 1 or len(missing) == 1:
+            for list_name in missing:
+                self.rem_items[list_name] = self._fetch_list(list_name)
+            return
+        with ThreadPoolExecutor(max_workers=min(jobs, len(missing))) as executor:
+            for list_name, items in zip(
+                missing, executor.map(self._fetch_list, missing)
+            ):
+                self.rem_items[list_name] = items
+
+    def reminder_items(self, list_name):
+        """Return raw items (including completed) for a list, or None on error."""
+        self._drop_stale(list_name)
+        if list_name not in self.rem_items:
+            self.rem_items[list_name] = self._fetch_list(list_name)
+        return self.rem_items[list_name]
+
+    def reminder_lookup(self, list_name, *titles):
+        """Return (position, item) pairs with one of the given titles, in list order."""
+        items = self.reminder_items(list_name)
+        if items is None:
+            return []
+        if list_name not in self.rem_index:
+            index = {}
+            for pos, item in enumerate(items):
+                index.setdefault(item.get("title", ""), []).append((pos, item))
+            self.rem_index[list_name] = index
+        hits = []
+        for title in set(titles):
+            hits.extend(self.rem_index[list_name].get(title, []))
+        return sorted(hits, key=lambda h: h[0])
+
+    def note_write(self, cmd):
+        """Mark whatever a `task`/`rems` write command touched as stale."""
+        if not cmd:
+            return
+        if cmd[0] == "task" and "export" not in cmd:
+            for arg in cmd[1:]:
+                if TW_UUID_RE.match(arg):
+                    self.tw_stale_uuids.add(arg)
+                    # Completing a recurring instance spawns the next one
+                    record = self.tw_by_uuid.get(arg, {})
+                    if record.get("recur") or record.get("parent"):
+                        self.tw_stale_projects.add(record.get("project", ""))
+                elif arg.startswith("project:"):
+                    self.tw_stale_projects.add(arg[len("project:") :])
+        elif cmd[0] == "rems" and len(cmd) > 2:
+            if cmd[1] in REMS_WRITE_COMMANDS:
+                self.rem_stale.add(cmd[2])
+                if cmd[1] == "move" and len(cmd) > 4:
+                    self.rem_stale.add(cmd[4])
+            elif cmd[1] == "new-list" and self.rem_lists is not None:
+                if cmd[2] not in self.rem_lists:
+                    self.rem_lists.append(cmd[2])
+
+
+_snapshot = Snapshot()
+
+
+def to_tw_date(value):
+    """Convert a TW compact or ISO 8601 date to TW compact UTC for `task import`.
+
+    Naive ISO dates are local time, as `task modify due:...` treats them.
+    Returns "" for empty input and None when the value can't be parsed.
+    """
+    if not value:
+        return ""
+    if is_tw_compact(value):
+        return value
+    from datetime import datetime, timezone
+
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.astimezone()
+    return dt.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def tw_now():
+    from datetime import datetime, timezone
+
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+TW_IMPORT_DATE_FIELDS = ("due", "entry", "end")
+
+
+class TaskBatch:
+    """Collects Taskwarrior changes for a sync run and applies them with one
+    `task import` of full JSON records, keeping UUIDs.
+
+    Every change carries a fallback callable that performs it with individual
+    `task` commands; fallbacks run when a change can't be expressed as a record
+    or when the import is rejected. Planned records are staged into the
+    snapshot so later lookups in the same run see them.
+    """
+
+    def __init__(self):
+        self.records = {}
+        self.new_uuids = set()
+        self.fallbacks = {}
+
+    def __len__(self):
+        return len(self.records)
+
+    def _stage(self, uuid, record, fallback):
+        self.records[uuid] = record
+        self.fallbacks.setdefault(uuid, []).append(fallback)
+        _snapshot.tw_by_uuid[uuid] = record
+        _snapshot.tw_index = None
+
+    @staticmethod
+    def _apply(record, changes):
+        """Apply changes to a record in place. Returns False if a date is invalid."""
+        for field, value in changes.items():
+            if field == "annotate":
+                record.setdefault("annotations", []).append(
+                    {"entry": tw_now(), "description": value}
+                )
+                continue
+            if field in TW_IMPORT_DATE_FIELDS:
+                value = to_tw_date(value)
+                if value is None:
+                    return False
+            if value:
+                record[field] = value
+            else:
+                record.pop(field, None)
+        if changes.get("status") == "completed" and not record.get("end"):
+            record["end"] = tw_now()
+        elif changes.get("status") == "pending":
+            record.pop("end", None)
+        record["modified"] = tw_now()
+        return True
+
+    def modify(self, uuid, changes, fallback):
+        """Plan changes to an existing task ("annotate" appends an annotation)."""
+        base = self.records.get(uuid) or _snapshot.tw_by_uuid.get(uuid)
+        if base is None:
+            fallback()
+            return
+        record = json.loads(json.dumps(base))
+        for computed in ("id", "urgency"):
+            record.pop(computed, None)
+        if not self._apply(record, changes):
+            fallback()
+            return
+        self._stage(uuid, record, fallback)
+
+    def add(self, project, description, changes, fallback):
+        """Plan a new task. Returns its UUID, or "" when the fallback ran instead."""
+        import uuid as uuid_mod
+
+        uuid = str(uuid_mod.uuid4())
+        record = {
+            "uuid": uuid,
+            "description": description,
+            "project": project,
+            "status": "pending",
+            "entry": tw_now(),
+        }
+        if not self._apply(record, changes):
+            fallback()
+            return ""
+        self.new_uuids.add(uuid)
+        self._stage(uuid, record, fallback)
+        return uuid
+
+    def _applied(self):
+        """UUIDs whose planned record is already in the database."""
+        exported = _snapshot.tw_export(list(self.records)) or []
+        by_uuid = {t["uuid"]: t for t in exported}
+        applied = set()
+        for uuid, record in self.records.items():
+            current = by_uuid.get(uuid)
+            if current is None:
+                continue
+            if uuid in self.new_uuids or all(
+                current.get(f) == record.get(f)
+                for f in ("description", "status", "due", "end", "entry", "priority")
+            ):
+                applied.add(uuid)
+        return applied
+
+    def flush(self, dry_run=False):
+        """Import all planned records. Returns the number of tasks written."""
+        if not self.records:
+            return 0
+        payload = json.dumps(list(self.records.values()), ensure_ascii=False)
+        if dry_run:
+            click.echo()
+            click.echo(f"Taskwarrior import batch ({len(self.records)} task(s)):")
+            click.echo(json.dumps(list(self.records.values()), indent=2))
+            return len(self.records)
+
+        result = run(["task", "rc.confirmation:off", "import", "-"], stdin_text=payload)
+        if result.returncode == 0:
+            click.echo()
+            click.echo(
+                f"Imported {len(self.records)} Taskwarrior task(s) in one batch."
+            )
+        else:
+            # Import may have stopped part-way; only replay what didn't land
+            applied = self._applied()
+            click.echo(
+                f"  task import rejected — applying {len(self.records) - len(applied)}"
+                " change(s) individually",
+                err=True,
+            )
+            for uuid in self.records:
+                if uuid in applied:
+                    continue
+                # Staged records are not in the database; drop them before replay
+                _snapshot.tw_by_uuid.pop(uuid, None)
+                for fallback in self.fallbacks[uuid]:
+                    fallback()
+        _snapshot.tw_stale_uuids.update(self.records)
+        count = len(self.records)
+        self.records = {}
+        self.new_uuids = set()
+        self.fallbacks = {}
+        return count
+
+
+DRIFT_STATE_VERSION = 1
+# Re-export tasks modified this long before the watermark, so changes synced
+# in from other devices with older `modified` stamps are still picked up
+INCREMENTAL_LOOKBACK_HOURS = 24
+# Force a full export when the persisted mirror is older than this
+FULL_REBUILD_HOURS = 24 * 7
+TW_DATE_FORMAT = "%Y%m%dT%H%M%SZ"
+
+
+def drift_state_path():
+    base = os.environ.get("XDG_STATE_HOME", os.path.expanduser("~/.local/state"))
+    return os.path.join(base, "taskmanager", "drift-state.json")
+
+
+def load_drift_state(full=False):
+    """Seed the snapshot and per-key memo from the last drift/sync run.
+
+    With full=True the persisted state is ignored and rebuilt from a full
+    export when the run finishes.
+    """
+    from datetime import datetime, timedelta, timezone
+
+    _drift_memo.clear()
+    _drift_memo_used.clear()
+    if full:
+        return
+    try:
+        with open(drift_state_path()) as f:
+            state = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return
+    if state.get("version") != DRIFT_STATE_VERSION:
+        return
+    _drift_memo.update(state.get("keys", {}))
+
+    watermark = state.get("watermark", "")
+    built = state.get("built", "")
+    if not (watermark and built and "tasks" in state):
+        return
+    now = datetime.now(timezone.utc)
+    try:
+        built_at = datetime.strptime(built, TW_DATE_FORMAT).replace(tzinfo=timezone.utc)
+        since = datetime.strptime(watermark, TW_DATE_FORMAT) - timedelta(
+            hours=INCREMENTAL_LOOKBACK_HOURS
+        )
+    except ValueError:
+        return
+    if now - built_at > timedelta(hours=FULL_REBUILD_HOURS):
+        return
+    _snapshot.load_mirror(state["tasks"], since.strftime(TW_DATE_FORMAT), built)
+
+
+def save_drift_state(prune=True):
+    """Persist the TW mirror, its `modified` watermark and per-key drift results.
+
+    The mirror is only written when the full database is loaded; a scoped
+    run without a mirror keeps just the per-key results. prune=False keeps
+    results for keys this run did not look at (project-scoped runs).
+    """
+    from datetime import datetime, timezone
+
+    keys = {} if prune else dict(_drift_memo)
+    keys.update(_drift_memo_used)
+    state = {"version": DRIFT_STATE_VERSION, "keys": keys}
+    if None in _snapshot.tw_scopes:
+        tasks = _snapshot.tw_records()
+        if tasks is not None:
+            state["tasks"] = tasks
+            state["watermark"] = max((t.get("modified", "") for t in tasks), default="")
+            state["built"] = _snapshot.tw_built or datetime.now(timezone.utc).strftime(
+                TW_DATE_FORMAT
+            )
+
+    path = drift_state_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        click.echo(f"Warning: could not save drift state: {e}", err=True)
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
 def get_tw_tasks(project_filter=None):
     """Export tasks from Taskwarrior as a dict keyed by (project, title).
 
     Returns (tasks, instance_counts, all_instances) where all_instances is a
     dict of (project, title) -> [list of item dicts] for multi-instance matching.
     """
-    cmd = ["task"]
-    if project_filter:
-        cmd.append(f"project.is:{project_filter}")
-    cmd.append("export")
-
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
+    records = _snapshot.tw_records(project_filter)
+    if records is None:
         return {}, {}, {}
 
     tasks = {}
     instance_counts = {}
     all_instances = {}
-    for task in json.loads(result.stdout):
+    for task in records:
         project = task.get("project", "")
         desc = task.get("description", "")
         status = task.get("status", "pending")
@@ -86,7 +582,7 @@ def get_tw_tasks(project_filter=None):
             "due": task.get("due", ""),
             "end": task.get("end", ""),
             "entry": task.get("entry", ""),
-            "annotations": task.get("annotations", []),
+            "annotations": list(task.get("annotations", [])),
             "priority": ""
             if task.get("priority", "") == "none"
             else task.get("priority", ""),
@@ -132,32 +628,25 @@ def get_reminders(project_filter=None, include_completed=True):
     if project_filter:
         lists = [project_filter]
     else:
-        result = subprocess.run(["rems", "show-lists"], capture_output=True, text=True)
-        if result.returncode != 0:
+        lists = _snapshot.reminder_lists()
+        if lists is None:
             return {}, {}, {}
-        lists = result.stdout.strip().splitlines()
+    _snapshot.prefetch_reminders(lists, jobs=_jobs)
 
     reminders = {}
     instance_counts = {}
     all_instances = {}
 
     for list_name in lists:
-        show_args = ["rems", "show", list_name, "--format", "json"]
-        if include_completed:
-            show_args.append("--include-completed")
-
-        result = subprocess.run(show_args, capture_output=True, text=True)
-        if result.returncode != 0:
-            continue
-
-        try:
-            items = json.loads(result.stdout)
-        except json.JSONDecodeError:
+        items = _snapshot.reminder_items(list_name)
+        if items is None:
             continue
 
         for item in items:
             title = item.get("title", "")
             is_completed = item.get("isCompleted", False)
+            if is_completed and not include_completed:
+                continue
 
             # Strip list prefix from title if present
             prefix = f"{list_name}: "
@@ -287,6 +776,70 @@ def date_key(date_str):
     return clean.rstrip("Z")
 
 
+def local_date(date_str):
+    """Extract local YYYY-MM-DD for date-only comparison."""
+    loc = format_date_local(date_str)
+    return loc[:10] if loc else ""
+
+
+class RemInstanceIndex:
+    """Reminders instances bucketed for match_instances.
+
+    Each bucket holds ascending positions into rem_list, so the earliest
+    unclaimed position in a bucket is exactly what a linear scan over the
+    remaining items would have found first.
+    """
+
+    def __init__(self, rem_list, local):
+        self.items = rem_list
+        self.taken = [False] * len(rem_list)
+        self.buckets = {}
+        self.cursors = {}
+        self.statuses = set()
+        for i, rem_item in enumerate(rem_list):
+            status = rem_item["status"]
+            self.statuses.add(status)
+            due = local(rem_item.get("due", ""))
+            comp = local(rem_item.get("completionDate", ""))
+            if due:
+                self._add(("hasdue", status), i)
+                self._add(("due", status, due), i)
+                if comp:
+                    self._add(("due_comp", status, due, comp), i)
+            else:
+                self._add(("nodue", status), i)
+                if comp:
+                    self._add(("nodue_comp", status, comp), i)
+                notes = (rem_item.get("notes") or "").strip()
+                if notes:
+                    self._add(("nodue_notes", status, notes), i)
+
+    def _add(self, key, i):
+        self.buckets.setdefault(key, []).append(i)
+
+    def first(self, keys):
+        """Return the lowest unclaimed position across the given buckets."""
+        best = None
+        for key in keys:
+            bucket = self.buckets.get(key)
+            if not bucket:
+                continue
+            c = self.cursors.get(key, 0)
+            while c < len(bucket) and self.taken[bucket[c]]:
+                c += 1
+            self.cursors[key] = c
+            if c < len(bucket) and (best is None or bucket[c] < best):
+                best = bucket[c]
+        return best
+
+    def take(self, i):
+        self.taken[i] = True
+        return self.items[i]
+
+    def remaining(self):
+        return [item for i, item in enumerate(self.items) if not self.taken[i]]
+
+
 def match_instances(tw_list, rem_list):
     """Match multi-instance items by due date.
 
@@ -294,18 +847,141 @@ def match_instances(tw_list, rem_list):
     pending↔pending), then cross-status. This prevents a pending item
     from stealing a completed item's date match.
 
+    Dates are parsed once per distinct string and Reminders instances are
+    bucketed by (status, local due, local completion) in RemInstanceIndex,
+    so each tier resolves with hash lookups instead of rescanning the list.
+
     Returns (matched_pairs, tw_unmatched, rem_unmatched) where:
     - matched_pairs: list of (tw_item, rem_item) tuples
     - tw_unmatched: list of tw items with no Reminders match
     - rem_unmatched: list of rem items with no TW match
     """
+    local_cache = {}
+
+    def local(date_str):
+        if date_str not in local_cache:
+            local_cache[date_str] = local_date(date_str)
+        return local_cache[date_str]
+
+    index = RemInstanceIndex(rem_list, local)
     matched = []
-    rem_available = list(rem_list)
 
-    def local_date(date_str):
-        """Extract local YYYY-MM-DD for date-only comparison."""
-        loc = format_date_local(date_str)
-        return loc[:10] if loc else ""
+    tw_parsed = []
+    for tw_item in tw_list:
+        tw_ann = "; ".join(
+            a.get("description", "") for a in tw_item.get("annotations", [])
+        )
+        tw_parsed.append(
+            (
+                tw_item,
+                local(tw_item.get("due", "")),
+                local(tw_item.get("end", "")),
+                tw_ann,
+            )
+        )
+
+    def other_statuses(status):
+        return [s for s in index.statuses if s != status]
+
+    def try_match(tw_items, same_status_only):
+        """Match TW items to Rem items by due date + completion date.
+
+        Three-tier matching:
+        1. Strong: due date + completion date both match
+        2. Medium: due date matches (completion differs or missing)
+        3. Weak: both have no due date, completion date matches
+        """
+        unmatched = []
+        for parsed in tw_items:
+            tw_item, tw_due, tw_end, tw_ann = parsed
+            status = tw_item["status"]
+            statuses = [status] if same_status_only else other_statuses(status)
+
+            if tw_due:
+                best = None
+                if tw_end:
+                    best = index.first(
+                        [("due_comp", s, tw_due, tw_end) for s in statuses]
+                    )
+                if best is None:
+                    best = index.first([("due", s, tw_due) for s in statuses])
+            else:
+                keys = []
+                if tw_end:
+                    keys.extend(("nodue_comp", s, tw_end) for s in statuses)
+                if same_status_only and tw_ann:
+                    # Both have no due date, same status — prefer notes match
+                    keys.append(("nodue_notes", status, tw_ann))
+                best = index.first(keys)
+                if best is None and same_status_only:
+                    best = index.first([("nodue", status)])
+
+            if best is not None:
+                matched.append((tw_item, index.take(best)))
+            else:
+                unmatched.append(parsed)
+        return unmatched
+
+    # Pass 1: match same-status items by due date
+    tw_remaining = try_match(tw_parsed, same_status_only=True)
+    # Pass 2: match remaining cross-status items
+    tw_unmatched = try_match(tw_remaining, same_status_only=False)
+
+    # Pass 3: recurring completion reconciliation
+    # When a recurring item is completed in Reminders, the completed instance
+    # may lose its due date while TW still has the pending instance with the
+    # original due. Match unmatched TW pending with unmatched Rem completed
+    # (and vice versa) when one side has a due date and the other doesn't.
+    tw_still_unmatched = []
+    for parsed in tw_unmatched:
+        tw_item, tw_due = parsed[0], parsed[1]
+        presence = "nodue" if tw_due else "hasdue"
+        best = index.first([(presence, s) for s in other_statuses(tw_item["status"])])
+        if best is not None:
+            matched.append((tw_item, index.take(best)))
+        else:
+            tw_still_unmatched.append(parsed)
+    tw_unmatched = tw_still_unmatched
+
+    # Pass 4: pair remaining unmatched items from the same recurring group.
+    # Handles: (a) same-status with mismatched due dates (recurring next-instance),
+    # (b) cross-status with no due dates (item completed in one system but not the other).
+    tw_still_unmatched = []
+    for parsed in tw_unmatched:
+        tw_item, tw_due = parsed[0], parsed[1]
+        status = tw_item["status"]
+        if tw_due:
+            keys = [("nodue", status)]
+        else:
+            keys = [("hasdue", status)]
+            keys.extend(("nodue", s) for s in other_statuses(status))
+        best = index.first(keys)
+        if best is not None:
+            matched.append((tw_item, index.take(best)))
+        else:
+            tw_still_unmatched.append(parsed)
+
+    return (
+        matched,
+        [parsed[0] for parsed in tw_still_unmatched],
+        index.remaining(),
+    )
+
+
+def match_instances_linear(tw_list, rem_list):
+    """Reference linear-scan matcher, kept for `bench-match` comparisons.
+
+    Two passes: first match same-status items (completed↔completed,
+    pending↔pending), then cross-status. This prevents a pending item
+    from stealing a completed item's date match.
+
+    Returns (matched_pairs, tw_unmatched, rem_unmatched) where:
+    - matched_pairs: list of (tw_item, rem_item) tuples
+    - tw_unmatched: list of tw items with no Reminders match
+    - rem_unmatched: list of rem items with no TW match
+    """
+    matched = []
+    rem_available = list(rem_list)
 
     def try_match(tw_items, same_status_only):
         """Match TW items to Rem items by due date + completion date.
@@ -498,6 +1174,100 @@ def compare_metadata(tw, rem):
     return diffs
 
 
+def match_key(key, tw_list, rem_list):
+    """Instance-level drift for one multi-instance (project, title) key.
+
+    Returns a dict with "matched" (list of instance keys) and "diffs",
+    "tw_only", "rem_only" (dicts keyed by instance key).
+    """
+    matched = []
+    metadata_diffs = {}
+    tw_only = {}
+    rem_only = {}
+
+    matched_pairs, tw_unmatched, rem_unmatched = match_instances(tw_list, rem_list)
+
+    for tw_item, rem_item in matched_pairs:
+        due = date_key(tw_item.get("due", "")) or date_key(rem_item.get("due", ""))
+        due_display = (
+            format_date_local(tw_item.get("due", "") or rem_item.get("due", "")) or due
+        )
+        instance_key = (key[0], f"{key[1]} [{due_display}]")
+        matched.append(instance_key)
+
+        diffs = compare_metadata(tw_item, rem_item)
+        if diffs:
+            metadata_diffs[instance_key] = {
+                "diffs": diffs,
+                "tw": tw_item,
+                "rem": rem_item,
+            }
+
+    for tw_item in tw_unmatched:
+        due = date_key(tw_item.get("due", ""))
+        due_display = format_date_local(tw_item.get("due", "")) or due
+        instance_key = (key[0], f"{key[1]} [{due_display}]")
+        # Disambiguate when multiple unmatched items share the same due
+        while instance_key in tw_only:
+            instance_key = (instance_key[0], instance_key[1] + " #dup")
+        tw_only[instance_key] = tw_item
+
+    for rem_item in rem_unmatched:
+        due = date_key(rem_item.get("due", ""))
+        due_display = format_date_local(rem_item.get("due", "")) or due
+        instance_key = (key[0], f"{key[1]} [{due_display}]")
+        while instance_key in rem_only:
+            instance_key = (instance_key[0], instance_key[1] + " #dup")
+        rem_only[instance_key] = rem_item
+
+    return {
+        "matched": matched,
+        "diffs": metadata_diffs,
+        "tw_only": tw_only,
+        "rem_only": rem_only,
+    }
+
+
+def key_hash(key, tw_list, rem_list):
+    """Hash of everything match_key depends on, including the local UTC offset."""
+    payload = json.dumps(
+        [list(key), tw_list, rem_list, time.strftime("%z")],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def match_key_cached(key, tw_list, rem_list):
+    """match_key, reusing the persisted result when the key's inputs are unchanged."""
+    digest = key_hash(key, tw_list, rem_list)
+    stored = _drift_memo.get(digest)
+    if stored is not None:
+        result = {
+            "matched": [tuple(k) for k in stored["matched"]],
+            "diffs": {
+                tuple(k): {
+                    "diffs": [tuple(d) for d in info["diffs"]],
+                    "tw": info["tw"],
+                    "rem": info["rem"],
+                }
+                for k, info in stored["diffs"]
+            },
+            "tw_only": {tuple(k): item for k, item in stored["tw_only"]},
+            "rem_only": {tuple(k): item for k, item in stored["rem_only"]},
+        }
+    else:
+        result = match_key(key, tw_list, rem_list)
+        stored = {
+            "matched": result["matched"],
+            "diffs": list(result["diffs"].items()),
+            "tw_only": list(result["tw_only"].items()),
+            "rem_only": list(result["rem_only"].items()),
+        }
+    _drift_memo_used[digest] = stored
+    return result
+
+
 def compute_drift(project_filter=None):
     """Compute drift between Reminders and Taskwarrior."""
     tw_tasks, tw_counts, tw_instances = get_tw_tasks(project_filter)
@@ -536,48 +1306,13 @@ def compute_drift(project_filter=None):
                 rec_label = f" (recurring: {rec})" if rec else ""
                 click.echo(f"  {key[0]}: {key[1]}{rec_label}", err=True)
 
-            tw_list = tw_instances.get(key, [])
-            rem_list = rem_instances.get(key, [])
-
-            matched_pairs, tw_unmatched, rem_unmatched = match_instances(
-                tw_list, rem_list
+            result = match_key_cached(
+                key, tw_instances.get(key, []), rem_instances.get(key, [])
             )
-
-            for tw_item, rem_item in matched_pairs:
-                due = date_key(tw_item.get("due", "")) or date_key(
-                    rem_item.get("due", "")
-                )
-                due_display = (
-                    format_date_local(tw_item.get("due", "") or rem_item.get("due", ""))
-                    or due
-                )
-                instance_key = (key[0], f"{key[1]} [{due_display}]")
-                instance_matched.add(instance_key)
-
-                diffs = compare_metadata(tw_item, rem_item)
-                if diffs:
-                    instance_metadata_diffs[instance_key] = {
-                        "diffs": diffs,
-                        "tw": tw_item,
-                        "rem": rem_item,
-                    }
-
-            for tw_item in tw_unmatched:
-                due = date_key(tw_item.get("due", ""))
-                due_display = format_date_local(tw_item.get("due", "")) or due
-                instance_key = (key[0], f"{key[1]} [{due_display}]")
-                # Disambiguate when multiple unmatched items share the same due
-                while instance_key in instance_tw_only:
-                    instance_key = (instance_key[0], instance_key[1] + " #dup")
-                instance_tw_only[instance_key] = tw_item
-
-            for rem_item in rem_unmatched:
-                due = date_key(rem_item.get("due", ""))
-                due_display = format_date_local(rem_item.get("due", "")) or due
-                instance_key = (key[0], f"{key[1]} [{due_display}]")
-                while instance_key in instance_rem_only:
-                    instance_key = (instance_key[0], instance_key[1] + " #dup")
-                instance_rem_only[instance_key] = rem_item
+            instance_matched.update(result["matched"])
+            instance_metadata_diffs.update(result["diffs"])
+            instance_tw_only.update(result["tw_only"])
+            instance_rem_only.update(result["rem_only"])
 
     # Single-instance items: existing logic
     tw_keys = set(tw_tasks.keys()) - multi_instance
@@ -836,24 +1571,12 @@ def find_tw_uuids(project, title, status_filter=None):
     Matches against both prefixed ('Project: title') and unprefixed ('title')
     descriptions for backward compatibility during migration.
     """
-    result = subprocess.run(
-        ["task", f"project.is:{project}", "export"],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
-        return []
-    uuids = []
     legacy_prefixed = f"{project}: {title}"
-    try:
-        for t in json.loads(result.stdout):
-            desc = t.get("description", "")
-            if desc == title or desc == legacy_prefixed:
-                if status_filter and t.get("status", "") != status_filter:
-                    continue
-                uuids.append(t["uuid"])
-    except json.JSONDecodeError:
-        pass
+    uuids = []
+    for t in _snapshot.tw_lookup(project, title, legacy_prefixed):
+        if status_filter and t.get("status", "") != status_filter:
+            continue
+        uuids.append(t["uuid"])
     return uuids
 
 
@@ -876,42 +1599,40 @@ def find_reminder_index(
     - due_date: match by due date (date_key comparison)
     - notes_empty: True=only match items with empty notes, False=only with notes
     """
-    cmd = ["rems", "show", list_name, "--format", "json"]
+    items = _snapshot.reminder_items(list_name)
+    if items is None:
+        return None
+
+    # Map snapshot positions to indexes within the requested rems view
     if completed_only:
-        cmd.append("--only-completed")
+        view = [i for i, item in enumerate(items) if item.get("isCompleted", False)]
     elif include_completed:
-        cmd.append("--include-completed")
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        return None
+        view = list(range(len(items)))
+    else:
+        view = [i for i, item in enumerate(items) if not item.get("isCompleted", False)]
+    view_index = {pos: i for i, pos in enumerate(view)}
+
     legacy_prefixed = f"{list_name}: {title}"
-    try:
-        # First try exact match with all filters
-        items = json.loads(result.stdout)
-        candidates = []
-        for i, item in enumerate(items):
-            item_title = item.get("title", "")
-            if item_title != title and item_title != legacy_prefixed:
-                continue
-            if due_date:
-                item_due = format_date_local(item.get("dueDate", ""))
-                target_due = format_date_local(due_date)
-                if item_due[:10] != target_due[:10]:
-                    continue
-            if notes_empty is True and (item.get("notes") or "").strip():
+    hits = [
+        (view_index[pos], item)
+        for pos, item in _snapshot.reminder_lookup(list_name, title, legacy_prefixed)
+        if pos in view_index
+    ]
+    # First try exact match with all filters
+    target_due = format_date_local(due_date) if due_date else ""
+    for i, item in hits:
+        if due_date:
+            item_due = format_date_local(item.get("dueDate", ""))
+            if item_due[:10] != target_due[:10]:
                 continue
-            if notes_empty is False and not (item.get("notes") or "").strip():
-                continue
-            candidates.append(i)
-        if candidates:
-            return candidates[0]
-        # Fall back to title-only match
-        for i, item in enumerate(items):
-            item_title = item.get("title", "")
-            if item_title == title or item_title == legacy_prefixed:
-                return i
-    except json.JSONDecodeError:
-        pass
+        if notes_empty is True and (item.get("notes") or "").strip():
+            continue
+        if notes_empty is False and not (item.get("notes") or "").strip():
+            continue
+        return i
+    # Fall back to title-only match
+    if hits:
+        return hits[0][0]
     return None
 
 
@@ -936,10 +1657,88 @@ def format_update_summary(updates):
     return "\n    ".join(parts)
 
 
-def sync_metadata(metadata_diffs, direction=None, interactive=False):
+def apply_tw_updates(uuid, tw, tw_updates):
+    """Apply sync_metadata updates to one task with individual `task` commands."""
+    modify_args = []
+    if "title" in tw_updates:
+        modify_args.append(f"description:{tw_updates['title']}")
+    if "due" in tw_updates:
+        modify_args.append(f"due:{tw_updates['due']}")
+    if "entry" in tw_updates:
+        modify_args.append(f"entry:{tw_updates['entry']}")
+    if "priority" in tw_updates:
+        modify_args.append(f"priority:{tw_updates['priority']}")
+    # Set end before status change only if not completing
+    if "end" in tw_updates and "status" not in tw_updates:
+        modify_args.append(f"end:{tw_updates['end']}")
+    if modify_args:
+        result = run(["task", "rc.confirmation:off", uuid, "modify"] + modify_args)
+        # If modify fails on a recurring task (e.g. can't remove due),
+        # delete the recurring parent to stop recurrence, then retry
+        if result.returncode != 0 and tw.get("recur", ""):
+            click.echo("    Recurring task detected — purging to remove recurrence")
+            # Delete first if not already deleted, then purge
+            del_result = run(["task", "rc.confirmation:off", uuid, "delete"])
+            if del_result.returncode != 0:
+                # Already deleted — just purge
+                pass
+            run(["task", "rc.confirmation:off", uuid, "purge"])
+    if "notes" in tw_updates:
+        # Check if annotation already exists to avoid duplicates
+        existing_anns = tw.get("annotations", [])
+        existing_texts = {a.get("description", "").strip() for a in existing_anns}
+        if tw_updates["notes"].strip() not in existing_texts:
+            run(["task", uuid, "annotate", tw_updates["notes"]])
+    if "status" in tw_updates:
+        if tw_updates["status"] == "completed":
+            run(["task", "rc.confirmation:off", uuid, "done"])
+            # Set end after done — task done overwrites end with now
+            if "end" in tw_updates:
+                run(
+                    [
+                        "task",
+                        "rc.confirmation:off",
+                        uuid,
+                        "modify",
+                        f"end:{tw_updates['end']}",
+                    ]
+                )
+        else:
+            run(
+                [
+                    "task",
+                    "rc.confirmation:off",
+                    uuid,
+                    "modify",
+                    "status:pending",
+                ]
+            )
+
+
+def tw_import_changes(tw, tw_updates):
+    """Translate sync_metadata updates into TaskBatch record changes."""
+    changes = {}
+    if "title" in tw_updates:
+        changes["description"] = tw_updates["title"]
+    for field in ("due", "entry", "priority", "end"):
+        if field in tw_updates:
+            changes[field] = tw_updates[field]
+    if "notes" in tw_updates:
+        existing_texts = {
+            a.get("description", "").strip() for a in tw.get("annotations", [])
+        }
+        if tw_updates["notes"].strip() not in existing_texts:
+            changes["annotate"] = tw_updates["notes"]
+    if "status" in tw_updates:
+        changes["status"] = tw_updates["status"]
+    return changes
+
+
+def sync_metadata(metadata_diffs, direction=None, interactive=False, batch=None):
     """Sync metadata for matched items with drift. Returns count of updated items.
 
     direction: None=both ways, "reminders"=reminders→tw, "tw"=tw→reminders.
+    batch: optional TaskBatch collecting Taskwarrior changes for one import.
     """
     count = 0
     for (project, title), info in metadata_diffs.items():
@@ -1036,68 +1835,11 @@ def sync_metadata(metadata_diffs, direction=None, interactive=False):
             else:
                 uuids = find_tw_uuids(project, tw['title'])
             for uuid in uuids:
-                modify_args = []
-                if "title" in tw_updates:
-                    modify_args.append(f"description:{tw_updates['title']}")
-                if "due" in tw_updates:
-                    modify_args.append(f"due:{tw_updates['due']}")
-                if "entry" in tw_updates:
-                    modify_args.append(f"entry:{tw_updates['entry']}")
-                if "priority" in tw_updates:
-                    modify_args.append(f"priority:{tw_updates['priority']}")
-                # Set end before status change only if not completing
-                if "end" in tw_updates and "status" not in tw_updates:
-                    modify_args.append(f"end:{tw_updates['end']}")
-                if modify_args:
-                    result = run(
-                        ["task", "rc.confirmation:off", uuid, "modify"] + modify_args
-                    )
-                    # If modify fails on a recurring task (e.g. can't remove due),
-                    # delete the recurring parent to stop recurrence, then retry
-                    if result.returncode != 0 and tw.get("recur", ""):
-                        click.echo(
-                            "    Recurring task detected — purging to remove recurrence"
-                        )
-                        # Delete first if not already deleted, then purge
-                        del_result = run(
-                            ["task", "rc.confirmation:off", uuid, "delete"]
-                        )
-                        if del_result.returncode != 0:
-                            # Already deleted — just purge
-                            pass
-                        run(["task", "rc.confirmation:off", uuid, "purge"])
-                if "notes" in tw_updates:
-                    # Check if annotation already exists to avoid duplicates
-                    existing_anns = tw.get("annotations", [])
-                    existing_texts = {
-                        a.get("description", "").strip() for a in existing_anns
-                    }
-                    if tw_updates["notes"].strip() not in existing_texts:
-                        run(["task", uuid, "annotate", tw_updates["notes"]])
-                if "status" in tw_updates:
-                    if tw_updates["status"] == "completed":
-                        run(["task", "rc.confirmation:off", uuid, "done"])
-                        # Set end after done — task done overwrites end with now
-                        if "end" in tw_updates:
-                            run(
-                                [
-                                    "task",
-                                    "rc.confirmation:off",
-                                    uuid,
-                                    "modify",
-                                    f"end:{tw_updates['end']}",
-                                ]
-                            )
-                    else:
-                        run(
-                            [
-                                "task",
-                                "rc.confirmation:off",
-                                uuid,
-                                "modify",
-                                "status:pending",
-                            ]
-                        )
+                fallback = functools.partial(apply_tw_updates, uuid, tw, tw_updates)
+                if batch is not None:
+                    batch.modify(uuid, tw_import_changes(tw, tw_updates), fallback)
+                else:
+                    fallback()
             if uuids:
                 count += 1
                 click.echo(
@@ -1143,6 +1885,96 @@ def sync_metadata(metadata_diffs, direction=None, interactive=False):
     return count
 
 
+def complete_tw_task(uuid, raw_end):
+    """Mark a task done with `task done`, then restore its completion date."""
+    run(["task", "rc.confirmation:off", uuid, "done"])
+    if raw_end:
+        run(["task", "rc.confirmation:off", uuid, "modify", f"end:{raw_end}"])
+
+
+def update_tw_task(uuid, raw_due, tw_prio, notes):
+    """Update due/priority and annotate an existing task with `task` commands."""
+    mods = []
+    if raw_due:
+        mods.append(f"due:{raw_due}")
+    if tw_prio:
+        mods.append(f"priority:{tw_prio}")
+    if mods:
+        run(["task", "rc.confirmation:off", uuid, "modify"] + mods)
+    if notes:
+        run(["task", uuid, "annotate", notes])
+
+
+def add_tw_task(proj, desc, item):
+    """Create a task from a Reminders item with `task add` and follow-up modifies."""
+    add_cmd = ["task", "add", desc, f"project:{proj}"]
+
+    # Due date — pass raw ISO date so TW handles timezone correctly
+    raw_due = item.get("due", "")
+    if raw_due:
+        add_cmd.append(f"due:{raw_due}")
+
+    # Priority
+    tw_prio = REMINDERS_PRIORITY_MAP.get(item.get("priority", 0), "")
+    if tw_prio:
+        add_cmd.append(f"priority:{tw_prio}")
+
+    result = run(add_cmd)
+    if result.returncode == 0:
+        click.echo(f"  + Taskwarrior: {desc}")
+
+        # Find the UUID of the newly created task from task add output
+        task_id_match = re.search(r"Created task (\d+)\.", result.stdout)
+        uuid = ""
+        if task_id_match:
+            tid = task_id_match.group(1)
+            find = subprocess.run(
+                ["task", tid, "export"],
+                capture_output=True,
+                text=True,
+            )
+            if find.returncode == 0:
+                try:
+                    exported = json.loads(find.stdout)
+                    if exported:
+                        uuid = exported[0].get("uuid", "")
+                except json.JSONDecodeError:
+                    pass
+        if uuid:
+            # Notes → annotation
+            item_notes = (item.get("notes") or "").strip()
+            if item_notes:
+                run(["task", uuid, "annotate", item_notes])
+
+            # Creation date
+            raw_created = item.get("creationDate", "")
+            if raw_created:
+                run(
+                    [
+                        "task",
+                        "rc.confirmation:off",
+                        uuid,
+                        "modify",
+                        f"entry:{raw_created}",
+                    ]
+                )
+
+            # Completion date + status
+            if item["status"] == "completed":
+                run(["task", "rc.confirmation:off", uuid, "done"])
+            raw_end = item.get("completionDate", "")
+            if raw_end:
+                run(
+                    [
+                        "task",
+                        "rc.confirmation:off",
+                        uuid,
+                        "modify",
+                        f"end:{raw_end}",
+                    ]
+                )
+
+
 class TreeGroup(click.Group):
     def format_commands(self, ctx, formatter):
         commands = []
@@ -1647,6 +2479,13 @@ def parse_projects(project_str):
     return [p.strip() for p in project_str.split(",") if p.strip()]
 
 
+def prefetch_projects(project_list):
+    """Export all requested Reminders lists up front using the --jobs pool."""
+    lists = [p for p in project_list if p]
+    if len(lists) > 1 and is_darwin() and has_command("rems"):
+        _snapshot.prefetch_reminders(lists, jobs=_jobs)
+
+
 def filter_by_title(rem_only, tw_only, metadata_diffs, title_filter):
     """Filter drift results to items matching title substring."""
     if not title_filter:
@@ -1708,6 +2547,18 @@ def filter_by_recurring(rem_only, tw_only, metadata_diffs, multi_keys, recurring
     default=True,
     help="Run sort before computing drift (default: enabled).",
 )
+@click.option(
+    "--jobs",
+    type=int,
+    default=4,
+    help="Number of Reminders lists to export in parallel (default: 4).",
+)
+@click.option(
+    "--full",
+    is_flag=True,
+    default=False,
+    help="Ignore the incremental drift state and rebuild it from a full export.",
+)
 @click.pass_context
 def drift(
     ctx,
@@ -1720,10 +2571,13 @@ def drift(
     destination,
     verbose,
     sort_first,
+    jobs,
+    full,
 ):
     """Show drift between Reminders and Taskwarrior."""
-    global _verbose
+    global _verbose, _jobs
     _verbose = verbose
+    _jobs = jobs
 
     if sort_first:
         ctx.invoke(
@@ -1747,6 +2601,8 @@ def drift(
         raise SystemExit(1)
 
     project_list = parse_projects(projects) if projects else [project]
+    load_drift_state(full=full)
+    prefetch_projects(project_list)
     all_rem_only, all_tw_only, all_matched, all_metadata_diffs = {}, {}, set(), {}
     all_multi_keys = set()
     for proj in project_list:
@@ -1756,6 +2612,7 @@ def drift(
         all_matched.update(matched)
         all_metadata_diffs.update(metadata_diffs)
         all_multi_keys.update(multi_keys)
+    save_drift_state(prune=project_list == [None])
 
     all_metadata_diffs = filter_metadata_diffs(
         all_metadata_diffs, notes_only=notes, direction=source
@@ -1835,6 +2692,24 @@ def drift(
     default=True,
     help="Run sort before syncing (default: enabled).",
 )
+@click.option(
+    "--jobs",
+    type=int,
+    default=4,
+    help="Number of Reminders lists to export in parallel (default: 4).",
+)
+@click.option(
+    "--full",
+    is_flag=True,
+    default=False,
+    help="Ignore the incremental drift state and rebuild it from a full export.",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    default=False,
+    help="Print the commands and Taskwarrior import batch without writing.",
+)
 @click.pass_context
 def sync(
     ctx,
@@ -1852,10 +2727,15 @@ def sync(
     complete_orphans,
     purge_recurring,
     sort_first,
+    jobs,
+    full,
+    dry_run,
 ):
     """Sync missing items to both systems."""
-    global _verbose
+    global _verbose, _jobs, _dry_run
     _verbose = verbose
+    _jobs = jobs
+    _dry_run = dry_run
 
     if sort_first:
         ctx.invoke(
@@ -1881,6 +2761,8 @@ def sync(
         raise SystemExit(1)
 
     project_list = parse_projects(projects) if projects else [project]
+    load_drift_state(full=full)
+    prefetch_projects(project_list)
     all_rem_only, all_tw_only, all_matched, all_metadata_diffs = {}, {}, set(), {}
     all_multi_keys = set()
     for proj in project_list:
@@ -1890,6 +2772,7 @@ def sync(
         all_matched.update(matched)
         all_metadata_diffs.update(metadata_diffs)
         all_multi_keys.update(multi_keys)
+    save_drift_state(prune=project_list == [None])
 
     rem_only, tw_only, matched = all_rem_only, all_tw_only, all_matched
     metadata_diffs = filter_metadata_diffs(
@@ -1938,6 +2821,9 @@ def sync(
             click.echo("Aborted.")
             return
 
+    # Taskwarrior changes are collected here and written with one `task import`
+    batch = TaskBatch()
+
     # Reminders-only → add to Taskwarrior
     for item in rem_only.values():
         proj = item["project"]
@@ -1963,101 +2849,57 @@ def sync(
         if existing_uuids and item["status"] == "completed":
             # Complete the existing task instead of creating a duplicate
             uuid = existing_uuids[0]
-            run(["task", "rc.confirmation:off", uuid, "done"])
-            click.echo(f"  ~ Taskwarrior: {desc} (completed existing)")
             raw_end = item.get("completionDate", "")
+            changes = {"status": "completed"}
             if raw_end:
-                run(["task", "rc.confirmation:off", uuid, "modify", f"end:{raw_end}"])
+                changes["end"] = raw_end
+            batch.modify(
+                uuid, changes, functools.partial(complete_tw_task, uuid, raw_end)
+            )
+            click.echo(f"  ~ Taskwarrior: {desc} (completed existing)")
         elif existing_uuids:
             # Existing pending task — update metadata instead of creating duplicate
             uuid = existing_uuids[0]
-            mods = []
+            changes = {}
             raw_due = item.get("due", "")
             if raw_due:
-                mods.append(f"due:{raw_due}")
+                changes["due"] = raw_due
             tw_prio = REMINDERS_PRIORITY_MAP.get(item.get("priority", 0), "")
             if tw_prio:
-                mods.append(f"priority:{tw_prio}")
-            if mods:
-                run(["task", "rc.confirmation:off", uuid, "modify"] + mods)
+                changes["priority"] = tw_prio
             item_notes = (item.get("notes") or "").strip()
             if item_notes:
-                run(["task", uuid, "annotate", item_notes])
+                changes["annotate"] = item_notes
+            if changes:
+                batch.modify(
+                    uuid,
+                    changes,
+                    functools.partial(
+                        update_tw_task, uuid, raw_due, tw_prio, item_notes
+                    ),
+                )
             click.echo(f"  ~ Taskwarrior: {desc} (updated existing)")
         else:
-            add_cmd = ["task", "add", desc, f"project:{proj}"]
-
-            # Due date — pass raw ISO date so TW handles timezone correctly
-            raw_due = item.get("due", "")
-            if raw_due:
-                add_cmd.append(f"due:{raw_due}")
-
-            # Priority
-            tw_prio = REMINDERS_PRIORITY_MAP.get(item.get("priority", 0), "")
-            if tw_prio:
-                add_cmd.append(f"priority:{tw_prio}")
-
-            result = run(add_cmd)
-            if result.returncode == 0:
+            changes = {
+                "due": item.get("due", ""),
+                "priority": REMINDERS_PRIORITY_MAP.get(item.get("priority", 0), ""),
+                "status": item["status"],
+                "end": item.get("completionDate", ""),
+            }
+            raw_created = item.get("creationDate", "")
+            if raw_created:
+                changes["entry"] = raw_created
+            item_notes = (item.get("notes") or "").strip()
+            if item_notes:
+                changes["annotate"] = item_notes
+            if batch.add(
+                proj, desc, changes, functools.partial(add_tw_task, proj, desc, item)
+            ):
                 click.echo(f"  + Taskwarrior: {desc}")
 
-                # Find the UUID of the newly created task from task add output
-                task_id_match = re.search(r"Created task (\d+)\.", result.stdout)
-                uuid = ""
-                if task_id_match:
-                    tid = task_id_match.group(1)
-                    find = subprocess.run(
-                        ["task", tid, "export"],
-                        capture_output=True,
-                        text=True,
-                    )
-                    if find.returncode == 0:
-                        try:
-                            exported = json.loads(find.stdout)
-                            if exported:
-                                uuid = exported[0].get("uuid", "")
-                        except json.JSONDecodeError:
-                            pass
-                if uuid:
-                    # Notes → annotation
-                    item_notes = (item.get("notes") or "").strip()
-                    if item_notes:
-                        run(["task", uuid, "annotate", item_notes])
-
-                    # Creation date
-                    raw_created = item.get("creationDate", "")
-                    if raw_created:
-                        run(
-                            [
-                                "task",
-                                "rc.confirmation:off",
-                                uuid,
-                                "modify",
-                                f"entry:{raw_created}",
-                            ]
-                        )
-
-                    # Completion date + status
-                    if item["status"] == "completed":
-                        run(["task", "rc.confirmation:off", uuid, "done"])
-                    raw_end = item.get("completionDate", "")
-                    if raw_end:
-                        run(
-                            [
-                                "task",
-                                "rc.confirmation:off",
-                                uuid,
-                                "modify",
-                                f"end:{raw_end}",
-                            ]
-                        )
-
     # Taskwarrior-only → add to Reminders
     if is_darwin() and has_command("rems"):
-        existing = subprocess.run(
-            ["rems", "show-lists"], capture_output=True, text=True
-        )
-        existing_lists = set(existing.stdout.strip().splitlines())
+        existing_lists = set(_snapshot.reminder_lists() or [])
 
         for item in tw_only.values():
             proj = item["project"]
@@ -2130,12 +2972,14 @@ def sync(
     # Sync metadata for matched items with drift
     if metadata_diffs:
         meta_count = sync_metadata(
-            metadata_diffs, direction=source, interactive=interactive
+            metadata_diffs, direction=source, interactive=interactive, batch=batch
         )
         if meta_count:
             click.echo()
             click.echo(f"Updated metadata on {meta_count} items.")
 
+    batch.flush(dry_run=_dry_run)
+
     # Purge TW duplicates (always interactive, requires explicit confirmation)
     # Detects both TW-only items and TW-internal duplicates (multiple pending
     # tasks with the same project+description).
@@ -2179,19 +3023,16 @@ def sync(
         click.echo("--- Scanning for TW-internal duplicates ---")
         from collections import defaultdict
 
-        tw_cmd = ["task"]
-        for proj in (
-            parse_projects(projects) if projects else [project] if project else []
-        ):
-            if proj:
-                tw_cmd.append(f"project.is:{proj}")
-        tw_cmd.append("export")
-        tw_result = subprocess.run(tw_cmd, capture_output=True, text=True)
-        if tw_result.returncode == 0:
-            try:
-                all_tw = json.loads(tw_result.stdout)
-            except json.JSONDecodeError:
-                all_tw = []
+        scan_projects = [
+            p for p in (parse_projects(projects) if projects else [project]) if p
+        ]
+        if scan_projects:
+            all_tw = []
+            for proj in scan_projects:
+                all_tw.extend(_snapshot.tw_records(proj) or [])
+        else:
+            all_tw = _snapshot.tw_records()
+        if all_tw is not None:
             pending_by_desc = defaultdict(list)
             for t in all_tw:
                 if t.get("status") == "pending":
@@ -2267,26 +3108,7 @@ def sync(
             if not uuid:
                 continue
             # Check if this title has completed history in TW
-            all_uuids_result = subprocess.run(
-                ["task", f"project.is:{proj}", "export"],
-                capture_output=True,
-                text=True,
-            )
-            has_completed = False
-            legacy_prefixed = f"{proj}: {title}"
-            if all_uuids_result.returncode == 0:
-                try:
-                    for t in json.loads(all_uuids_result.stdout):
-                        t_desc = t.get("description", "")
-                        if (
-                            (t_desc == title or t_desc == legacy_prefixed)
-                            and t.get("status") == "completed"
-                        ):
-                            has_completed = True
-                            break
-                except json.JSONDecodeError:
-                    pass
-            if not has_completed:
+            if not find_tw_uuids(proj, title, status_filter="completed"):
                 continue
             click.echo()
             click.echo(f"  TW orphan: {desc}")
@@ -2308,14 +3130,9 @@ def sync(
     if purge_recurring:
         click.echo()
         click.echo("--- Scanning for TW recurring parents ---")
-        tw_cmd = ["task", "export"]
-        tw_result = subprocess.run(tw_cmd, capture_output=True, text=True)
+        all_tw = _snapshot.tw_records()
         purge_count = 0
-        if tw_result.returncode == 0:
-            try:
-                all_tw = json.loads(tw_result.stdout)
-            except json.JSONDecodeError:
-                all_tw = []
+        if all_tw is not None:
             recurring_parents = [t for t in all_tw if t.get("status") == "recurring"]
             # Filter by project if specified
             if project or projects:
@@ -2377,12 +3194,20 @@ def sync(
 @click.option("--project", default=None, help="Scope to a single project/list.")
 @click.option("--projects", default=None, help="Comma-separated project/list names.")
 @click.option("--verbose", is_flag=True, default=False, help="Show commands being run.")
-def verify(project, projects, verbose):
+@click.option(
+    "--jobs",
+    type=int,
+    default=4,
+    help="Number of Reminders lists to export in parallel (default: 4).",
+)
+def verify(project, projects, verbose, jobs):
     """Verify item counts and statuses match between Reminders and Taskwarrior."""
-    global _verbose
+    global _verbose, _jobs
     _verbose = verbose
+    _jobs = jobs
 
     project_list = parse_projects(projects) if projects else [project]
+    prefetch_projects(project_list)
     from collections import Counter
 
     total_tw = 0
@@ -2716,5 +3541,92 @@ def rem_list():
         click.echo(f"[{status}] [{list_name}] {title}  due: {due}")
 
 
+def synthetic_instances(count, rng):
+    """Build TW/Reminders instance lists for a daily recurring task."""
+    from datetime import datetime, timedelta
+
+    start = datetime(2020, 1, 1, 9, 0, 0)
+    tw_list, rem_list = [], []
+    for i in range(count):
+        due = start + timedelta(days=i)
+        completed = i < count - 1
+        end = due + timedelta(hours=rng.randint(0, 30))
+        tw_list.append(
+            {
+                "status": "completed" if completed else "pending",
+                "due": due.strftime("%Y%m%dT%H%M%SZ"),
+                "end": end.strftime("%Y%m%dT%H%M%SZ") if completed else "",
+                "annotations": [],
+            }
+        )
+        # Reminders drops the due date on some completed instances and
+        # occasionally lags a day behind
+        rem_due = due + timedelta(days=1 if rng.random() < 0.05 else 0)
+        rem_list.append(
+            {
+                "status": "completed" if completed else "pending",
+                "due": ""
+                if completed and rng.random() < 0.1
+                else rem_due.strftime("%Y-%m-%dT%H:%M:%S"),
+                "completionDate": end.strftime("%Y-%m-%dT%H:%M:%S")
+                if completed
+                else "",
+                "notes": "",
+            }
+        )
+    rng.shuffle(rem_list)
+    return tw_list, rem_list
+
+
+@cli.command(name="bench-match", hidden=True)
+@click.option("--instances", default=5000, help="Instances per key (default: 5000).")
+@click.option("--keys", default=3, help="Number of synthetic keys (default: 3).")
+@click.option("--seed", default=0, help="Random seed (default: 0).")
+@click.option(
+    "--compare",
+    is_flag=True,
+    default=False,
+    help="Also run the linear reference matcher and check the pairs are identical.",
+)
+def bench_match(instances, keys, seed, compare):
+    """Micro-benchmark match_instances on synthetic recurring keys."""
+    import random
+    import time
+
+    rng = random.Random(seed)
+    total_fast = total_linear = 0.0
+    for k in range(keys):
+        tw_list, rem_list = synthetic_instances(instances, rng)
+
+        started = time.perf_counter()
+        fast = match_instances(tw_list, rem_list)
+        fast_elapsed = time.perf_counter() - started
+        total_fast += fast_elapsed
+        line = f"key {k}: {len(fast[0])} pairs, indexed {fast_elapsed * 1000:.1f}ms"
+
+        if compare:
+            started = time.perf_counter()
+            linear = match_instances_linear(tw_list, rem_list)
+            linear_elapsed = time.perf_counter() - started
+            total_linear += linear_elapsed
+            line += f", linear {linear_elapsed * 1000:.1f}ms"
+            same = (
+                [(id(a), id(b)) for a, b in fast[0]]
+                == [(id(a), id(b)) for a, b in linear[0]]
+                and [id(a) for a in fast[1]] == [id(a) for a in linear[1]]
+                and [id(a) for a in fast[2]] == [id(a) for a in linear[2]]
+            )
+            if not same:
+                click.echo(line)
+                click.echo(f"Error: matchers disagree on key {k}", err=True)
+                raise SystemExit(1)
+        click.echo(line)
+
+    summary = f"Total: indexed {total_fast * 1000:.1f}ms"
+    if compare:
+        summary += f", linear {total_linear * 1000:.1f}ms (identical pairs)"
+    click.echo(summary)
+
+
 if __name__ == "__main__":
     cli(prog_name="taskmanager")